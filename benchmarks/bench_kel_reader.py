@@ -0,0 +1,109 @@
+"""
+Benchmark of a KELStateReader sync pass, witnesses queried one at a time versus concurrently.
+
+Each group AID is witnessed by a pool of stand-in witnesses that answer ksn queries after a random
+latency, and some of which never answer, so their probes run until the witness deadline.
+
+Usage:
+    python -m benchmarks.bench_kel_reader --habs 10 --witnesses 6 --dead 1 --timeout 0.5
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from hio.base import doing
+from hio.help import decking
+
+from wallet.core.syncing import KELStateReader, UpdateRegistry, WitnessStates
+
+
+class StandInReader(KELStateReader):
+    """KELStateReader whose witnesses are stand-ins answering after a latency or never"""
+
+    def __init__(self, habs, latency, dead, **kwa):
+        self.habs = habs
+        self.latency = latency
+        self.dead = dead
+        self.queried = 0
+        self.answered = 0
+        self.active = 0
+        self.peak = 0
+        app = SimpleNamespace(page=SimpleNamespace(run_task=lambda *args: None))
+        super(StandInReader, self).__init__(
+            app=app,
+            hby=None,
+            watch_reqs=decking.Deck(),
+            aid_updates=UpdateRegistry(),
+            wit_updates=UpdateRegistry(),
+            dup_evts=UpdateRegistry(),
+            witstates=WitnessStates(),
+            **kwa,
+        )
+
+    def watched_habs(self, aids=None):
+        return self.habs
+
+    def send_probe(self, probe, deadline):
+        probe.deadline = deadline
+        probe.answer = None if probe.wit in self.dead else time.monotonic() + random.uniform(*self.latency)
+        self.queried += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def poll_probe(self, probe, now):
+        if probe.answer is not None and now >= probe.answer:
+            self.answered += 1
+        elif now <= probe.deadline:
+            return False
+        self.active -= 1
+        return True
+
+    def process_states(self, states, hab):
+        return [], [], []
+
+
+def bench(limit, args):
+    random.seed(args.seed)
+    wits = [f'BWit{i}' for i in range(args.witnesses)]
+    habs = [SimpleNamespace(pre=f'EGroup{i:03}', kever=SimpleNamespace(wits=wits)) for i in range(args.habs)]
+    reader = StandInReader(
+        habs=habs,
+        latency=(args.latency / 2, args.latency * 1.5),
+        dead=set(wits[: args.dead]),
+        limit=limit,
+        timeout=args.timeout,
+    )
+    reader.watch_reqs.append(dict())
+
+    doist = doing.Doist(doers=[reader], tock=0.01, real=True)
+    doist.enter()
+    start = time.perf_counter()
+    doist.recur()  # starts the sync pass
+    while reader.syncing:
+        doist.recur()
+        time.sleep(doist.tock)
+    elapsed = time.perf_counter() - start
+    doist.exit()
+
+    return dict(limit=limit, queried=reader.queried, answered=reader.answered, peak=reader.peak, seconds=elapsed)
+
+
+def main(args):
+    print(f'{"limit":>6}{"queried":>9}{"answered":>10}{"peak":>6}{"pass s":>9}')
+    for limit in (1, args.limit):
+        res = bench(limit, args)
+        print(f'{res["limit"]:>6}{res["queried"]:>9}{res["answered"]:>10}{res["peak"]:>6}{res["seconds"]:>9.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark KELStateReader sync passes')
+    parser.add_argument('--habs', type=int, default=10, help='number of group AIDs')
+    parser.add_argument('--witnesses', type=int, default=6, help='witnesses per group AID')
+    parser.add_argument('--dead', type=int, default=1, help='witnesses that never answer')
+    parser.add_argument('--latency', type=float, default=0.05, help='mean seconds a witness takes to answer')
+    parser.add_argument('--timeout', type=float, default=0.5, help='seconds each witness has to answer')
+    parser.add_argument('--limit', type=int, default=16, help='concurrent witness queries')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    main(parser.parse_args())
@@ -0,0 +1,72 @@
+"""
+Benchmark of repeated Komer.get reads of HabitatRecords with and without the read through cache.
+
+A render of the identifiers page reads the same few records many times, so reads follow a skewed
+pattern over a hot set of keys with the occasional read of a cold one.
+
+Usage:
+    python -m benchmarks.bench_komer --records 1000 --reads 100000 --hot 50 --cache 256
+"""
+
+import argparse
+import random
+import time
+
+from keri.core import eventing  # noqa: F401 imports keri.db.basing without its circular import
+from keri.db import dbing
+from keri.db.basing import HabitatRecord
+
+from wallet.core.koming import Komer
+
+
+def record(i):
+    return HabitatRecord(
+        hid=f'EHab{i:040}',
+        mid=None,
+        smids=[f'EMember{j:036}' for j in range(3)],
+        rmids=[f'EMember{j:036}' for j in range(3)],
+        sid=None,
+        watchers=[f'BWatcher{j:035}' for j in range(2)],
+    )
+
+
+def bench(db, cache_size, args):
+    random.seed(args.seed)
+    habs = Komer(db=db, subkey='habs.', schema=HabitatRecord, cache_size=cache_size)
+    names = [f'alias{i}' for i in range(args.records)]
+    hot = names[: args.hot]
+
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        name = random.choice(hot) if random.random() < args.skew else random.choice(names)
+        habs.get(keys=name)
+    elapsed = time.perf_counter() - start
+
+    stats = habs.cacheStats() or dict(hits=0, misses=args.reads, evictions=0)
+    return dict(cache=cache_size, reads=args.reads, seconds=elapsed, rps=args.reads / elapsed, **stats)
+
+
+def main(args):
+    with dbing.openLMDB(name='bench', temp=True) as db:
+        habs = Komer(db=db, subkey='habs.', schema=HabitatRecord)
+        for i in range(args.records):
+            habs.put(keys=f'alias{i}', val=record(i))
+
+        print(f'{"cache":>7}{"reads":>9}{"seconds":>9}{"reads/s":>11}{"hits":>9}{"misses":>9}{"evicted":>9}')
+        for cache_size in (0, args.cache):
+            res = bench(db, cache_size, args)
+            print(
+                f'{res["cache"]:>7}{res["reads"]:>9}{res["seconds"]:>9.2f}{res["rps"]:>11.0f}'
+                f'{res["hits"]:>9}{res["misses"]:>9}{res["evictions"]:>9}'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Komer reads with and without the read through cache')
+    parser.add_argument('--records', type=int, default=1000, help='number of records in the sub database')
+    parser.add_argument('--reads', type=int, default=100000, help='number of reads')
+    parser.add_argument('--hot', type=int, default=50, help='number of frequently read records')
+    parser.add_argument('--skew', type=float, default=0.9, help='fraction of reads of the hot records')
+    parser.add_argument('--cache', type=int, default=256, help='maximum number of cached records')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    main(parser.parse_args())
@@ -0,0 +1,61 @@
+"""
+Benchmark of Komer records per second written, read and removed one transaction per record versus
+in chunked batches with put_many, pin_many, get_many and rem_many.
+
+Usage:
+    python -m benchmarks.bench_komer_batch --records 100000 --chunk 1000
+"""
+
+import argparse
+import time
+
+from keri.db import dbing
+
+from wallet.core.koming import Komer
+from wallet.core.tracking import WitnessStatsRecord
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def per_record(stats, items):
+    keyses = [keys for keys, _ in items]
+    return dict(
+        put=timed(lambda: [stats.put(keys=keys, val=val) for keys, val in items]),
+        pin=timed(lambda: [stats.pin(keys=keys, val=val) for keys, val in items]),
+        get=timed(lambda: [stats.get(keys=keys) for keys in keyses]),
+        rem=timed(lambda: [stats.rem(keys=keys) for keys in keyses]),
+    )
+
+
+def batched(stats, items, chunk):
+    keyses = [keys for keys, _ in items]
+    return dict(
+        put=timed(lambda: stats.put_many(items, chunk=chunk)),
+        pin=timed(lambda: stats.pin_many(items, chunk=chunk)),
+        get=timed(lambda: stats.get_many(keyses, chunk=chunk)),
+        rem=timed(lambda: stats.rem_many(keyses, chunk=chunk)),
+    )
+
+
+def main(args):
+    items = [
+        ((f'BWitness{i:036}',), WitnessStatsRecord(successes=i, failures=i % 7, last_error='timed out'))
+        for i in range(args.records)
+    ]
+    print(f'{"mode":<12}' + ''.join(f'{op + " rec/s":>14}' for op in ('put', 'pin', 'get', 'rem')))
+    for name in ('per-record', 'batched'):
+        with dbing.openLMDB(name='bench', temp=True) as db:
+            stats = Komer(db=db, subkey='wstats.', schema=WitnessStatsRecord)
+            times = per_record(stats, items) if name == 'per-record' else batched(stats, items, args.chunk)
+            print(f'{name:<12}' + ''.join(f'{args.records / secs:>14.0f}' for secs in times.values()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Komer batch APIs against per-record calls')
+    parser.add_argument('--records', type=int, default=100000, help='number of records')
+    parser.add_argument('--chunk', type=int, default=1000, help='records per transaction of the batch APIs')
+    main(parser.parse_args())
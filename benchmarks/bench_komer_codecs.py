@@ -0,0 +1,104 @@
+"""
+Microbenchmark of Komer record (de)serialization with keri's helping.datify and helping.dictify
+versus the codecs compiled once per schema, and the raw mode returning the decoded dict.
+
+Records are realistic HabitatRecords of group members and KeyStateRecords of 3 key, 5 witness
+identifiers, serialized as JSON, MGPK and CBOR.
+
+Usage:
+    python -m benchmarks.bench_komer_codecs --records 20000
+"""
+
+import argparse
+import json
+import time
+
+import cbor2
+import msgpack
+from keri.core import eventing  # noqa: F401 imports keri.db.basing without its circular import
+from keri.db.basing import HabitatRecord, KeyStateRecord, StateEERecord
+from keri.help import helping
+
+from wallet.core.koming import decoder, encoder
+
+LOADS = dict(
+    JSON=lambda raw: json.loads(raw),
+    MGPK=lambda raw: msgpack.loads(raw),
+    CBOR=lambda raw: cbor2.loads(raw),
+)
+DUMPS = dict(
+    JSON=lambda d: json.dumps(d, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+    MGPK=lambda d: msgpack.dumps(d),
+    CBOR=lambda d: cbor2.dumps(d),
+)
+
+
+def habitat(i):
+    return HabitatRecord(
+        hid=f'EGroup{i:038}',
+        mid=f'EMember{i:037}',
+        smids=[f'EMember{j:037}' for j in range(5)],
+        rmids=[f'EMember{j:037}' for j in range(5)],
+        watchers=[],
+    )
+
+
+def state(i):
+    wits = [f'BWitness{j:036}' for j in range(5)]
+    return KeyStateRecord(
+        vn=[1, 0],
+        i=f'EAid{i:040}',
+        s=hex(i % 50)[2:],
+        p=f'EPrior{i:038}',
+        d=f'EDigest{i:037}',
+        f=hex(i % 50)[2:],
+        dt='2026-10-17T12:00:00.000000+00:00',
+        et='rot',
+        kt='2',
+        k=[f'DKey{j:040}' for j in range(3)],
+        nt='2',
+        n=[f'ENext{j:039}' for j in range(3)],
+        bt='3',
+        b=wits,
+        c=[],
+        ee=StateEERecord(s=hex(i % 50)[2:], d=f'EDigest{i:037}', br=[], ba=wits),
+        di='',
+    )
+
+
+def timed(fn, vals):
+    start = time.perf_counter()
+    for val in vals:
+        fn(val)
+    return time.perf_counter() - start
+
+
+def main(args):
+    print(f'{"schema":<16}{"kind":<6}{"op":<8}{"datify/dictify/s":>18}{"compiled/s":>12}{"raw/s":>10}{"speedup":>9}')
+    for klas, make in ((HabitatRecord, habitat), (KeyStateRecord, state)):
+        vals = [make(i) for i in range(args.records)]
+        encode, decode = encoder(klas), decoder(klas)
+        for kind in ('JSON', 'MGPK', 'CBOR'):
+            loads, dumps = LOADS[kind], DUMPS[kind]
+            raws = [dumps(helping.dictify(val)) for val in vals]
+
+            base = timed(lambda val: dumps(helping.dictify(val)), vals)
+            fast = timed(lambda val: dumps(encode(val)), vals)
+            print(
+                f'{klas.__name__:<16}{kind:<6}{"encode":<8}{args.records / base:>18.0f}'
+                f'{args.records / fast:>12.0f}{"":>10}{base / fast:>8.1f}x'
+            )
+
+            base = timed(lambda raw: helping.datify(klas, loads(raw)), raws)
+            fast = timed(lambda raw: decode(loads(raw)), raws)
+            raw = timed(loads, raws)
+            print(
+                f'{klas.__name__:<16}{kind:<6}{"decode":<8}{args.records / base:>18.0f}'
+                f'{args.records / fast:>12.0f}{args.records / raw:>10.0f}{base / fast:>8.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Microbenchmark of Komer record serialization')
+    parser.add_argument('--records', type=int, default=20000, help='number of records per schema')
+    main(parser.parse_args())
@@ -0,0 +1,73 @@
+"""
+Benchmark of looking up contact-like records by alias and by type with a linear scan of the sub
+database, as Organizer.find does, versus a Komer secondary index, and of rebuilding the indexes.
+
+Usage:
+    python -m benchmarks.bench_komer_index --records 50000 --lookups 20
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+
+from keri.db import dbing
+
+from wallet.core.koming import Komer
+
+
+@dataclass
+class ContactRecord:
+    alias: str
+    type: str = 'controller'
+    oobi: str = ''
+
+
+def scan(contacts, field, value):
+    return [(keys, val) for keys, val in contacts.getItemIter() if getattr(val, field) == value]
+
+
+def main(args):
+    random.seed(args.seed)
+    with dbing.openLMDB(name='bench', temp=True) as db:
+        contacts = Komer(db=db, subkey='cons.', schema=ContactRecord, indexes=('alias', 'type'))
+        items = [
+            (
+                (f'EContact{i:036}',),
+                ContactRecord(
+                    alias=f'contact{i}',
+                    type='witness' if i % 100 == 0 else 'controller',
+                    oobi=f'http://host{i % 50}:5642/oobi/EContact{i:036}/controller',
+                ),
+            )
+            for i in range(args.records)
+        ]
+        start = time.perf_counter()
+        contacts.put_many(items)
+        print(f'loaded {args.records} records with 2 indexes in {time.perf_counter() - start:.2f}s')
+
+        aliases = [f'contact{random.randrange(args.records)}' for _ in range(args.lookups)]
+        print(f'{"lookup":<22}{"scan ms":>10}{"index ms":>10}{"speedup":>10}')
+        for name, field, values in (('alias', 'alias', aliases), ('type=witness', 'type', ['witness'] * 10)):
+            start = time.perf_counter()
+            scanned = [scan(contacts, field, value) for value in values]
+            linear = (time.perf_counter() - start) / len(values)
+
+            start = time.perf_counter()
+            found = [contacts.find(field, value) for value in values]
+            indexed = (time.perf_counter() - start) / len(values)
+
+            assert found == scanned
+            print(f'{name:<22}{linear * 1000:>10.2f}{indexed * 1000:>10.3f}{linear / indexed:>9.0f}x')
+
+        start = time.perf_counter()
+        count = contacts.reindex()
+        print(f'rebuilt indexes of {count} records in {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Komer secondary index lookups against scans')
+    parser.add_argument('--records', type=int, default=50000, help='number of contact records')
+    parser.add_argument('--lookups', type=int, default=20, help='number of alias lookups')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    main(parser.parse_args())
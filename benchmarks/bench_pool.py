@@ -0,0 +1,115 @@
+"""
+Benchmark of witness queries per second with a connection per messenger versus the ConnectionPool.
+
+A stand-in witness on localhost accepts CESR POSTs over HTTP/1.1 keep-alive and answers 204 after
+an optional latency. Batches of messengers, as created by the WitnessInquisitor for each query, send
+one KSN query each and are removed once answered.
+
+Usage:
+    python -m benchmarks.bench_pool --queries 500 --concurrency 8 --per-host 4
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hio.base import doing
+from keri.app import agenting
+from keri.core import eventing
+
+from wallet.core.pooling import ConnectionPool, PooledHTTPMessenger
+
+WIT = 'BStandInWitness'
+
+
+class StandInWitness(BaseHTTPRequestHandler):
+    """Answers every POST with 204 No Content on a connection kept alive"""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    connections = 0
+
+    def setup(self):
+        StandInWitness.connections += 1
+        super(StandInWitness, self).setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(latency):
+    StandInWitness.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInWitness)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench(pooled, args, url):
+    StandInWitness.connections = 0
+    pool = ConnectionPool(per_host=args.per_host) if pooled else None
+    root = doing.DoDoer(doers=[pool] if pooled else [], always=True)
+    doist = doing.Doist(doers=[root], tock=0.0, real=True)
+    qry = eventing.query(route='ksn', query=dict(i=WIT, src=WIT)).raw
+
+    doist.enter()
+    start = time.perf_counter()
+    sent = answered = 0
+    running = []
+    while answered < args.queries:
+        while sent < args.queries and len(running) < args.concurrency:
+            if pooled:
+                witer = PooledHTTPMessenger(hab=None, wit=WIT, url=url, pool=pool)
+            else:
+                witer = agenting.HTTPMessenger(hab=None, wit=WIT, url=url)
+            witer.msgs.append(bytearray(qry))
+            root.extend([witer])
+            running.append(witer)
+            sent += 1
+
+        doist.recur()
+        for witer in list(running):
+            if witer.sent:
+                root.remove([witer])
+                running.remove(witer)
+                answered += 1
+    elapsed = time.perf_counter() - start
+    doist.exit()
+
+    return dict(
+        name='pooled' if pooled else 'per-messenger',
+        answered=answered,
+        connections=StandInWitness.connections,
+        qps=answered / elapsed,
+        seconds=elapsed,
+    )
+
+
+def main(args):
+    server = serve(args.latency)
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+    print(f'{"client":<15}{"queries":>9}{"conns":>7}{"seconds":>9}{"q/s":>9}')
+    try:
+        for pooled in (False, True):
+            res = bench(pooled, args, url)
+            print(f'{res["name"]:<15}{res["answered"]:>9}{res["connections"]:>7}{res["seconds"]:>9.2f}{res["qps"]:>9.0f}')
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark witness queries with and without connection pooling')
+    parser.add_argument('--queries', type=int, default=500, help='number of KSN queries sent')
+    parser.add_argument('--concurrency', type=int, default=8, help='messengers running at once')
+    parser.add_argument('--per-host', type=int, default=4, help='pooled connections to the witness')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the witness takes to answer')
+    main(parser.parse_args())
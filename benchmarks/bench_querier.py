@@ -0,0 +1,161 @@
+"""
+Benchmark of key state query processing, one query doer per request versus the coalescing Querier.
+
+Queued query requests for a set of prefixes, with duplicates as when refreshing a large multisig
+group or contact list, are answered by stand-in witnesses that reply after a fixed latency. Runs on
+simulated Doist time, so only the scheduling of the queries is measured.
+
+Usage:
+    python -m benchmarks.bench_querier --queries 500 --prefixes 50 --witnesses 5
+"""
+
+import argparse
+import random
+import time
+
+from hio.base import doing
+from hio.help import decking
+
+from wallet.core.querying import Querier
+
+TOCK = 0.03125
+
+
+class StandInWitness:
+    """Counts the queries running against a witness"""
+
+    def __init__(self, pre):
+        self.pre = pre
+        self.active = 0
+        self.peak = 0
+        self.served = 0
+
+
+class StandInQuery(doing.Doer):
+    """Query answered by a stand-in witness latency seconds after it starts"""
+
+    def __init__(self, witness, latency, **kwa):
+        self.witness = witness
+        self.latency = latency
+        self.started = None
+        super(StandInQuery, self).__init__(**kwa)
+
+    def enter(self):
+        self.witness.active += 1
+        self.witness.peak = max(self.witness.peak, self.witness.active)
+
+    def recur(self, tyme):
+        if self.started is None:
+            self.started = tyme
+        if tyme - self.started < self.latency:
+            return False
+        self.witness.served += 1
+        return True
+
+    def exit(self):
+        self.witness.active -= 1
+
+
+class StandIn:
+    """Routes queries to stand-in witnesses, each prefix witnessed by a few of them"""
+
+    def __init__(self, witnesses, latency):
+        self.latency = latency
+        self.witnesses = {f'BWit{i}': StandInWitness(f'BWit{i}') for i in range(witnesses)}
+        self.wits = dict()
+        self.spawned = 0
+
+    def witnessed(self, pre):
+        if pre not in self.wits:
+            self.wits[pre] = random.sample(list(self.witnesses), k=min(3, len(self.witnesses)))
+        return self.wits[pre]
+
+    def spawn(self, msg, wits=None):
+        self.spawned += 1
+        wit = random.choice(wits or self.witnessed(msg['pre']))
+        return StandInQuery(witness=self.witnesses[wit], latency=self.latency)
+
+
+class PerRequestQuerier(doing.DoDoer):
+    """Previous Querier, one query doer per request and one request per cycle"""
+
+    def __init__(self, queries, standin):
+        self.queries = queries
+        self.standin = standin
+        super(PerRequestQuerier, self).__init__(always=True)
+
+    @property
+    def idle(self):
+        return not self.queries and not self.deeds
+
+    def recur(self, tyme, deeds=None):
+        if self.queries:
+            self.extend([self.standin.spawn(self.queries.popleft())])
+        return super(PerRequestQuerier, self).recur(tyme, deeds)
+
+
+class StandInQuerier(Querier):
+    def __init__(self, queries, standin, max_per_witness):
+        self.standin = standin
+        super(StandInQuerier, self).__init__(hby=None, queries=queries, kvy=None, max_per_witness=max_per_witness)
+
+    def witnesses(self, pre):
+        return self.standin.witnessed(pre)
+
+    def spawn(self, msg, wits=None):
+        return self.standin.spawn(msg, wits=wits)
+
+
+def bench(name, args):
+    random.seed(args.seed)
+    standin = StandIn(witnesses=args.witnesses, latency=args.latency)
+    queries = decking.Deck()
+    if name == 'per-request':
+        querier = PerRequestQuerier(queries=queries, standin=standin)
+    else:
+        querier = StandInQuerier(queries=queries, standin=standin, max_per_witness=args.max_per_witness)
+
+    pres = [f'EPre{i:04}' for i in range(args.prefixes)]
+    for _ in range(args.queries):
+        queries.append(dict(src='local', pre=random.choice(pres)))
+
+    doist = doing.Doist(doers=[querier], tock=TOCK, real=False, limit=3600.0)
+    doist.enter()
+    start = time.perf_counter()
+    cycles = 0
+    while not querier.idle:
+        doist.recur()
+        cycles += 1
+    elapsed = time.perf_counter() - start
+    doist.exit()
+
+    return dict(
+        name=name,
+        spawned=standin.spawned,
+        cycles=cycles,
+        tyme=doist.tyme,
+        peak=max(wit.peak for wit in standin.witnesses.values()),
+        served=sum(wit.served for wit in standin.witnesses.values()),
+        cpu=elapsed * 1000,
+    )
+
+
+def main(args):
+    print(f'{"querier":<14}{"doers":>8}{"served":>8}{"cycles":>8}{"sim s":>8}{"peak/wit":>10}{"cpu ms":>10}')
+    for name in ('per-request', 'coalescing'):
+        res = bench(name, args)
+        print(
+            f'{res["name"]:<14}{res["spawned"]:>8}{res["served"]:>8}{res["cycles"]:>8}{res["tyme"]:>8.2f}'
+            f'{res["peak"]:>10}{res["cpu"]:>10.1f}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark key state query processing')
+    parser.add_argument('--queries', type=int, default=500, help='number of queued query requests')
+    parser.add_argument('--prefixes', type=int, default=50, help='number of distinct prefixes queried')
+    parser.add_argument('--witnesses', type=int, default=5, help='number of stand-in witnesses')
+    parser.add_argument('--latency', type=float, default=0.25, help='seconds a stand-in witness takes to answer')
+    parser.add_argument('--max-per-witness', type=int, default=2, help='concurrent queries per witness')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    main(parser.parse_args())
@@ -0,0 +1,91 @@
+"""
+Benchmark of idle CPU use and wake-up latency for the FIXED and ADAPTIVE HioTask scheduling modes.
+
+Runs a synthetic agent made of a consumer Doer reading from a WakeDeck. Idle CPU is the process CPU
+time used while nothing is pushed to the deck. Wake-up latency is the time from a push, made from
+another thread as the UI would, until the consumer Doer pulls the element.
+
+Usage:
+    python -m benchmarks.bench_scheduler --idle 10 --wakes 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+from hio.base import doing
+
+from wallet.core.agenting import HioTask
+from wallet.core.configing import SchedulerModes
+from wallet.core.scheduling import WakeDeck, Waker
+
+
+class Consumer(doing.Doer):
+    def __init__(self, deck, **kwa):
+        self.deck = deck
+        self.latencies = []
+        super(Consumer, self).__init__(**kwa)
+
+    def recur(self, tyme):
+        while self.deck:
+            pushed = self.deck.popleft()
+            self.latencies.append(time.perf_counter() - pushed)
+        return False
+
+
+async def bench(mode, idle, wakes, interval):
+    waker = Waker()
+    deck = WakeDeck(waker=waker)
+    consumer = Consumer(deck=deck)
+    event = asyncio.Event()
+    doist = doing.Doist(doers=[consumer], tock=0.03125, real=True)
+    htask = HioTask(doist=doist, event=event, mode=mode, idler=lambda: not deck, waker=waker)
+    task = asyncio.create_task(htask.run())
+
+    await asyncio.sleep(0.5)  # let the loop settle into its idle state
+    cpu = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = (time.process_time() - cpu) / idle
+
+    def pusher():
+        for _ in range(wakes):
+            time.sleep(interval)
+            deck.push(time.perf_counter())
+
+    thread = threading.Thread(target=pusher)
+    thread.start()
+    while thread.is_alive() or deck:
+        await asyncio.sleep(0.1)
+
+    event.set()
+    await task
+
+    lats = sorted(consumer.latencies)
+    return dict(
+        mode=mode.value,
+        idle_cpu=idle_cpu,
+        cycles=htask.stats.cycles,
+        p50=statistics.median(lats) * 1000,
+        p99=lats[min(len(lats) - 1, int(len(lats) * 0.99))] * 1000,
+        max=lats[-1] * 1000,
+    )
+
+
+async def main(args):
+    print(f'{"mode":<10}{"idle cpu %":>12}{"cycles":>10}{"wake p50 ms":>14}{"wake p99 ms":>14}{"wake max ms":>14}')
+    for mode in (SchedulerModes.FIXED, SchedulerModes.ADAPTIVE):
+        res = await bench(mode, idle=args.idle, wakes=args.wakes, interval=args.interval)
+        print(
+            f'{res["mode"]:<10}{res["idle_cpu"] * 100:>12.2f}{res["cycles"]:>10}'
+            f'{res["p50"]:>14.2f}{res["p99"]:>14.2f}{res["max"]:>14.2f}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark HioTask scheduling modes')
+    parser.add_argument('--idle', type=float, default=10.0, help='seconds to measure idle CPU for')
+    parser.add_argument('--wakes', type=int, default=50, help='number of deck pushes to measure wake latency for')
+    parser.add_argument('--interval', type=float, default=0.5, help='seconds between deck pushes')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+"""
+Benchmark of UI frame stalls with the agent Doist on the UI loop (SHARED) or its own thread (THREAD).
+
+A frame task on the UI loop targets 60 frames per second and records how late each frame is. A
+synthetic agent doer blocks for a given time each cycle, half in CPU work like signature
+verification and event parsing, half in blocking calls like LMDB writes that release the GIL.
+
+Usage:
+    python -m benchmarks.bench_ui_stall --seconds 5 --work 0.02
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from hio.base import doing
+
+from wallet.core.agenting import AgentThread, HioTask, close_agent_task
+from wallet.core.bridging import AgentBridge
+
+FRAME = 1 / 60
+
+
+class Worker(doing.Doer):
+    def __init__(self, work, **kwa):
+        self.work = work
+        super(Worker, self).__init__(**kwa)
+
+    def recur(self, tyme):
+        end = time.perf_counter() + self.work / 2
+        while time.perf_counter() < end:  # CPU bound, holds the GIL
+            pass
+        time.sleep(self.work / 2)  # blocking I/O, releases the GIL
+        return False
+
+
+async def frames(seconds):
+    lates = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(FRAME)
+        lates.append(max(0.0, time.perf_counter() - start - FRAME))
+    return sorted(lates)
+
+
+async def bench(threaded, seconds, work):
+    bridge = AgentBridge()
+    doist = doing.Doist(doers=[bridge, Worker(work=work)], tock=0.03125, real=True)
+    htask = HioTask(doist=doist, event=asyncio.Event())
+
+    if threaded:
+        event = AgentThread(htask=htask, bridge=bridge)
+        task = event.start()
+    else:
+        event = htask.event
+        task = asyncio.create_task(htask.run())
+
+    lates = await frames(seconds)
+
+    rtts = []
+    for _ in range(20):  # round trip of a UI command through the bridge
+        start = time.perf_counter()
+        await bridge.run(time.perf_counter)
+        rtts.append(time.perf_counter() - start)
+
+    await close_agent_task(task, event)
+    return dict(
+        mode='thread' if threaded else 'shared',
+        frames=len(lates),
+        p50=statistics.median(lates) * 1000,
+        p99=lates[min(len(lates) - 1, int(len(lates) * 0.99))] * 1000,
+        fps=len(lates) / seconds,
+        rtt=statistics.median(rtts) * 1000,
+    )
+
+
+async def main(args):
+    print(f'{"mode":<8}{"frames":>8}{"late p50 ms":>14}{"late p99 ms":>14}{"fps":>8}{"bridge rtt ms":>16}')
+    for threaded in (False, True):
+        res = await bench(threaded, seconds=args.seconds, work=args.work)
+        print(f'{res["mode"]:<8}{res["frames"]:>8}{res["p50"]:>14.2f}{res["p99"]:>14.2f}{res["fps"]:>8.1f}{res["rtt"]:>16.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark UI frame stalls by agent execution mode')
+    parser.add_argument('--seconds', type=float, default=5.0, help='seconds to measure frames for')
+    parser.add_argument('--work', type=float, default=0.02, help='seconds of blocking agent work per Doist cycle')
+    asyncio.run(main(parser.parse_args()))
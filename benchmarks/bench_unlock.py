@@ -0,0 +1,71 @@
+"""
+Benchmark of the migration check at unlock of a keystore with many KEL events, a full Baser reopen
+as check_migration did versus the probe of an unstamped PartialBaser and the read of the schema stamp.
+
+Usage:
+    python -m benchmarks.bench_unlock --habs 20 --events 500 --checks 20
+"""
+
+import argparse
+import tempfile
+import time
+
+from keri.app import habbing
+from keri.core import signing
+from keri.db import basing
+
+from wallet.core.baser import STAMP, PartialBaser, completed, stamp
+
+
+def baser_check(path):
+    db = basing.Baser(name='bench', base='', temp=False, headDirPath=path, reopen=False)
+    db.reopen()
+    db.close()
+
+
+def partial_check(path, unstamp):
+    db = PartialBaser(name='bench', base='', temp=False, headDirPath=path, reopen=True)
+    if unstamp:
+        db.stamps.rem(keys=STAMP)
+    assert not db.needs_migration()
+    db.close()
+
+
+def timed(fn, checks):
+    start = time.perf_counter()
+    for _ in range(checks):
+        fn()
+    return (time.perf_counter() - start) / checks
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        salt = signing.Salter(raw=b'0123456789abcdef').qb64
+        hby = habbing.Habery(name='bench', base='', temp=False, headDirPath=path, salt=salt)
+        for i in range(args.habs):
+            hab = hby.makeHab(name=f'aid{i}', transferable=True)
+            for _ in range(args.events - 1):
+                hab.interact()
+        hby.close()
+        events = args.habs * args.events
+        print(f'created {args.habs} identifiers with {events} KEL events in {time.perf_counter() - start:.1f}s')
+
+        print(f'{"check":<26}{"ms":>10}{"speedup":>10}')
+        base = timed(lambda: baser_check(path), args.checks)
+        print(f'{"Baser reopen":<26}{base * 1000:>10.2f}{"":>10}')
+        for name, unstamp in (('unstamped probe', True), ('schema stamp', False)):
+            if not unstamp:  # as once a Habery opened it
+                db = PartialBaser(name='bench', base='', temp=False, headDirPath=path, reopen=True)
+                stamp(db, migrations=completed(db))
+                db.close()
+            secs = timed(lambda: partial_check(path, unstamp), args.checks)
+            print(f'{name:<26}{secs * 1000:>10.2f}{base / secs:>9.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the keystore migration check at unlock')
+    parser.add_argument('--habs', type=int, default=20, help='number of identifiers')
+    parser.add_argument('--events', type=int, default=500, help='number of KEL events per identifier')
+    parser.add_argument('--checks', type=int, default=20, help='number of checks timed')
+    main(parser.parse_args())
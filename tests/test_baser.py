@@ -0,0 +1,30 @@
+from keri.app import habbing
+from keri.core import signing
+
+from wallet.core.baser import STAMP, PartialBaser, SchemaStampRecord, completed, stamp
+
+
+def test_needs_migration_stamps_current_keystore(tmp_path):
+    hby = habbing.Habery(
+        name='test', base='', temp=False, headDirPath=str(tmp_path), salt=signing.Salter(raw=b'0123456789abcdef').qb64
+    )
+    hby.makeHab(name='aid', transferable=True)
+    hby.close()
+
+    db = PartialBaser(name='test', base='', temp=False, headDirPath=str(tmp_path), reopen=True)
+    try:
+        assert not db.stamped and db.current
+        assert not db.needs_migration()  # probed a sample, not stamped
+        assert not db.stamped
+        stamp(db, migrations=completed(db))  # as once a Habery opened it
+        assert db.stamped and not db.needs_migration()
+        assert db.stamps.get(keys=STAMP).migrations == []  # created at the library version, nothing to migrate
+
+        # stamped by another keri version and behind the last migration, probed again
+        db.stamps.pin(keys=STAMP, val=SchemaStampRecord(keri='0.6.7'))
+        db.setVer('0.6.7')
+        assert not db.stamped and not db.current
+        assert db.needs_migration()
+        assert not db.stamped
+    finally:
+        db.close()
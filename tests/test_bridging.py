@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+from hio.base import doing
+from hio.help import decking
+
+from wallet.core.agenting import AgentThread, HioTask, close_agent_task
+from wallet.core.bridging import AgentBridge, AgentStoppedError
+
+
+@pytest.mark.asyncio
+async def test_bridge_runs_inline_when_shared():
+    bridge = AgentBridge()
+    assert not bridge.threaded
+    assert await bridge.run(threading.get_ident) == threading.get_ident()
+
+    with pytest.raises(ValueError):
+        await bridge.run(int, 'not a number')
+
+
+@pytest.mark.asyncio
+async def test_bridge_runs_on_agent_thread():
+    bridge = AgentBridge()
+    doist = doing.Doist(doers=[bridge], tock=0.03125, real=True)
+    thread = AgentThread(htask=HioTask(doist=doist, event=asyncio.Event()), bridge=bridge)
+    task = thread.start()
+
+    assert bridge.threaded
+    assert await bridge.run(threading.get_ident) == thread.thread.ident
+
+    deck = decking.Deck()
+    bridge.push(deck, 'msg')
+    await asyncio.sleep(0.1)
+    assert deck.pull() == 'msg'
+
+    assert await close_agent_task(task, thread)
+    assert not thread.thread.is_alive()
+
+
+def test_bridge_fails_pending_commands_on_exit():
+    bridge = AgentBridge()
+    bridge.bind(ident=-1)  # some other thread
+    future = bridge.call(print, 'never runs')
+    bridge.exit()
+    with pytest.raises(AgentStoppedError):
+        future.result(timeout=1.0)
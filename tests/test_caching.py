@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+
+from wallet.core.agenting import ExchangeCloner
+from wallet.core.caching import LRUCache
+
+
+def test_lru_cache_bounds():
+    cache = LRUCache(maxsize=3, maxbytes=10, sizer=len)
+    cache['a'] = 'aaaa'
+    cache['b'] = 'bbbb'
+    assert cache.get('a') == 'aaaa'  # a is now most recently used
+    cache['c'] = 'cc'  # 10 bytes, at the limit
+    assert len(cache) == 3 and cache.nbytes == 10
+
+    cache['d'] = 'd'  # over maxsize, evicts b
+    assert 'b' not in cache and 'a' in cache
+    cache['e'] = 'eeeeeeee'  # over maxbytes, evicts a and c
+    assert 'a' not in cache and 'c' not in cache and 'd' in cache and 'e' in cache
+    assert len(cache) == 2 and cache.nbytes == 9
+    assert cache.get('b') is None
+
+    cache['f'] = 'f'
+    assert cache.get('d') == 'd'  # e is now least recently used
+    cache['g'] = 'g'  # over maxbytes, evicts e only
+    assert 'e' not in cache and all(key in cache for key in 'dfg')
+
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 1 and stats['evictions'] == 4
+    with pytest.raises(KeyError):
+        cache['missing']
+
+    with pytest.raises(ValueError):
+        LRUCache(maxbytes=10)
+
+
+@pytest.mark.asyncio
+async def test_cloner_returns_cached_clone():
+    cloner = ExchangeCloner(hby=None)
+    serder = SimpleNamespace(size=100)
+    cloner.cloned['ESaid'] = serder
+
+    op = cloner.clone('ESaid')
+    assert op.done() and await op is serder
+    assert not cloner.notes
+
+    first = cloner.clone('EOther')
+    second = cloner.clone('EOther')
+    assert list(cloner.notes) == ['EOther']  # one clone for both requests
+    cloner.cloned['EOther'] = other = SimpleNamespace(size=100)
+    cloner.recur(tyme=0.0)
+    assert await first is other and await second is other
@@ -0,0 +1,49 @@
+from hio.help import decking
+
+from wallet.core.agenting import ExchangeSender
+
+
+class Exchanger:
+    def __init__(self):
+        self.cues = decking.Deck()
+        self.saved = set()
+        self.checks = 0
+
+    def complete(self, said):
+        self.checks += 1
+        return said in self.saved
+
+
+class LocalSender(ExchangeSender):
+    def __init__(self, exc, exchanges, **kwa):
+        self.sent = []
+        super(LocalSender, self).__init__(hby=None, postman=None, exc=exc, exchanges=exchanges, **kwa)
+
+    def send(self, pending):
+        self.sent.append((pending.said, pending.rec))
+
+
+def test_exchange_sender_waits_for_saved_cue():
+    exc = Exchanger()
+    exchanges = decking.Deck()
+    sender = LocalSender(exc=exc, exchanges=exchanges, expiry=10.0, recheck=5.0)
+
+    exchanges.append(dict(said='ESaid', src='local', pre='EGroup', rec=['EOne'], topic='multisig'))
+    exchanges.append(dict(said='ESaid', src='local', pre='EGroup', rec=['ETwo'], topic='multisig'))
+    exchanges.append(dict(said='EStuck', src='local', pre='EGroup', rec=['EOne'], topic='multisig'))
+    sender.recur(tyme=0.0)
+    assert exc.checks == 2 and sender.metrics(tyme=0.0)['pending'] == 2
+
+    for tyme in (1.0, 2.0, 3.0):  # not rechecked without a cue
+        sender.recur(tyme=tyme)
+    assert exc.checks == 2
+
+    exc.saved.add('ESaid')
+    exc.cues.append(dict(kin='saved', said='ESaid'))
+    sender.recur(tyme=4.0)
+    assert sender.sent == [('ESaid', ['EOne', 'ETwo'])]
+    assert sender.metrics(tyme=4.0)['oldest'] == 4.0
+
+    sender.recur(tyme=11.0)
+    assert sender.pending == {}
+    assert sender.stats == dict(queued=2, coalesced=1, sent=1, expired=1)
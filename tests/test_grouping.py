@@ -0,0 +1,27 @@
+from keri import kering
+from keri.app import habbing
+from keri.core import coring
+
+from wallet.core.grouping import MultisigCounselor
+from wallet.core.operating import Operations
+
+
+def test_counselor_completes_expected_multisig_operations():
+    with habbing.openHby(name='test', temp=True) as hby:
+        counselor = MultisigCounselor(hby=hby, operations=Operations())
+        prefixer = coring.Prefixer(qb64=hby.makeHab(name='group').pre)
+        saider = coring.Saider(qb64=prefixer.qb64)
+        done = counselor.expect(prefixer, coring.Seqner(sn=0), saider, name='inception')
+        bad = counselor.expect(prefixer, coring.Seqner(sn=1), saider, name='rotation')
+
+        counselor.processEscrows()
+        assert not done.done() and not bad.done()
+
+        # completed in the escrow pass that marks the event complete
+        hby.db.cgms.put(keys=(prefixer.qb64, coring.Seqner(sn=0).qb64), val=saider)
+        other = coring.Saider(qb64=hby.makeHab(name='other').pre)
+        hby.db.cgms.put(keys=(prefixer.qb64, coring.Seqner(sn=1).qb64), val=other)
+        counselor.processEscrows()
+        assert done.result(timeout=0) is True
+        assert isinstance(bad.future.exception(timeout=0), kering.ValidationError)
+        assert not counselor.expected
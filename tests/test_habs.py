@@ -0,0 +1,35 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from keri.db import dbing
+
+from wallet.core.agenting import AgentThread, close_agent_task
+from wallet.core.baser import stamped
+from wallet.core.configing import ExecutionModes, SchedulerModes
+from wallet.core.habs import open_hby
+
+
+class Page:
+    def run_task(self, fn, *args):
+        pass
+
+    def update(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_open_hby_runs_agent_on_thread_when_configured(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbing.LMDBer, 'HeadDirPath', str(tmp_path))
+    config = SimpleNamespace(execution=ExecutionModes.THREAD, scheduler=SchedulerModes.ADAPTIVE, profile_path=None)
+    app = SimpleNamespace(page=Page(), snack=print, notes=[], config=config)
+
+    agent, task, thread = open_hby(name='test', base='', bran=None, config_file='', config_dir='', app=app)
+    try:
+        assert isinstance(thread, AgentThread) and agent.bridge.threaded
+        assert stamped(agent.hby.db)  # opened, so the next unlock skips the probe
+        assert await agent.bridge.run(threading.get_ident) == thread.thread.ident
+    finally:
+        assert await close_agent_task(task, thread)
+        agent.hby.close()
+        agent.rgy.close()
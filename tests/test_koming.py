@@ -0,0 +1,254 @@
+import threading
+from dataclasses import dataclass, field
+
+import pytest
+from hio.base import doing
+from keri.app import habbing
+from keri.core import coring
+from keri.db import dbing
+from keri.help import helping
+
+from wallet.core.koming import Komer, LazyRecord, decoder, encoder, entries
+from wallet.tasks.compacting import Compactor
+
+
+@dataclass
+class Record:
+    name: str
+    count: int = 0
+    tags: list = field(default_factory=list)
+
+
+def test_komer_read_through_cache():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        plain = Komer(db=db, subkey='recs.', schema=Record)
+        cached = Komer(db=db, subkey='recs.', schema=Record, cache_size=2)
+        assert plain.cacheStats() is None
+
+        for i in range(3):
+            cached.put(keys=('a', str(i)), val=Record(name=f'r{i}', count=i))
+
+        first = cached.get(keys=('a', '0'))
+        assert cached.get(keys=('a', '0')) is first  # memoized instance
+        assert cached.get(keys='missing') is None
+        stats = cached.cacheStats()
+        assert stats['hits'] == 1 and stats['misses'] == 2 and stats['entries'] == 1
+
+        cached.pin(keys=('a', '0'), val=Record(name='r0', count=10))  # invalidates
+        assert cached.get(keys=('a', '0')).count == 10
+
+        cached.get(keys=('a', '1'))
+        cached.get(keys=('a', '2'))  # over cache_size, evicts a.0
+        assert cached.cacheStats()['evictions'] == 1 and len(cached.cache) == 2
+
+        cached.rem(keys=('a', '1'))
+        assert cached.get(keys=('a', '1')) is None
+
+        assert [keys for keys, _ in cached.getItemIter(keys=('a', ''))] == [('a', '0'), ('a', '2')]
+        assert cached.trim(keys=('a', ''))
+        assert cached.get(keys=('a', '2')) is None and plain.cntAll() == 0
+
+
+def test_komer_uncaches_after_commit():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        recs = Komer(db=db, subkey='recs.', schema=Record, cache_size=8)
+        recs.put(keys='a', val=Record(name='old'))
+        write = recs._write
+
+        def racing(txn, key, val, raw, overwrite):  # another thread reads, and caches, before the commit
+            result = write(txn, key, val, raw, overwrite)
+            reader = threading.Thread(target=recs.get, args=('a',))
+            reader.start()
+            reader.join()
+            return result
+
+        recs._write = racing
+        recs.pin(keys='a', val=Record(name='new'))
+        assert recs.get(keys='a').name == 'new'
+        recs.pin_many([('a', Record(name='newer'))])
+        assert recs.get(keys='a').name == 'newer'
+
+
+def test_komer_does_not_cache_value_read_before_commit():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        recs = Komer(db=db, subkey='recs.', schema=Record, cache_size=8)
+        recs.put(keys='a', val=Record(name='old'))
+        deserialize = recs.deserializer
+        writer = threading.Thread(target=recs.pin, kwargs=dict(keys='a', val=Record(name='new')))
+
+        def racing(raw):  # the old value was read, a writer commits and invalidates before it is cached
+            recs.deserializer = deserialize
+            writer.start()
+            while bytes(db.getVal(db=recs.sdb, key=b'a')) == bytes(raw):
+                pass
+            return deserialize(raw)
+
+        recs.deserializer = racing
+        assert recs.get(keys='a').name == 'old'
+        writer.join()
+        assert recs.get(keys='a').name == 'new'
+
+
+def test_komer_batches_in_chunked_transactions():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        recs = Komer(db=db, subkey='recs.', schema=Record, cache_size=8)
+        recs.put(keys=('b', '1'), val=Record(name='old'))
+        assert recs.get(keys=('b', '1')).name == 'old'  # cached
+
+        items = [(('b', str(i)), Record(name=f'r{i}', count=i)) for i in range(5)]
+        assert recs.put_many(items, chunk=2) == [True, False, True, True, True]
+        assert recs.pin_many(items[:2], chunk=2) == [True, True]
+        assert recs.get(keys=('b', '1')).name == 'r1'  # pin_many invalidated the cached record
+
+        vals = recs.get_many([('b', '0'), ('b', '9'), ('b', '1')], chunk=2)
+        assert [val.name if val else None for val in vals] == ['r0', None, 'r1']
+        assert recs.cntAll() == 5
+
+        assert recs.rem_many([('b', '0'), ('b', '9'), ('b', '4')], chunk=2) == [True, False, True]
+        assert recs.get(keys=('b', '0')) is None and recs.cntAll() == 3
+
+
+def test_compiled_codecs_match_datify_and_dictify():
+    with habbing.openHby(name='test', temp=True) as hby:
+        hab = hby.makeHab(name='test', isith='1', icount=1)
+        state = hby.db.states.get(keys=hab.pre)
+        record = next(hby.db.habs.getItemIter())[1]
+
+    for val in (state, record, Record(name='r', count=2)):
+        klas = type(val)
+        assert encoder(klas)(val) == helping.dictify(val)
+        assert decoder(klas)(helping.dictify(val)) == helping.datify(klas, helping.dictify(val)) == val
+    assert encoder(type(state)) is encoder(type(state))  # compiled once per schema
+    assert decoder(Record)(dict(name='r', other=1)) == dict(name='r', other=1)  # does not fit, as with datify
+
+    with dbing.openLMDB(name='test', temp=True) as db:
+        for kind in (coring.Kinds.json, coring.Kinds.mgpk, coring.Kinds.cbor):
+            states = Komer(db=db, subkey=f'{kind.lower()}.', schema=type(state), kind=kind)
+            states.pin(keys=state.i, val=state)
+            assert states.get(keys=state.i) == state
+            assert states.get(keys=state.i, raw=True) == helping.dictify(state)
+            assert [val['ee']['s'] for _, val in states.getItemIter(raw=True)] == [state.ee.s]
+
+
+def test_komer_range_scans_page_keys_and_lazy_values():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        recs = Komer(db=db, subkey='recs.', schema=Record)
+        recs.put_many([((top, f'{i:02}'), Record(name=f'{top}{i}', count=i)) for top in ('a', 'b') for i in range(7)])
+        recs.put(keys=('ab', '00'), val=Record(name='ab'))
+        assert recs.cntAll() == entries(recs) == 15
+
+        pages, after = [], None
+        while True:
+            items, after = recs.getPage(keys=('a', ''), after=after, limit=3)
+            pages.append([val.name for _, val in items])
+            if after is None:
+                break
+        assert pages == [['a0', 'a1', 'a2'], ['a3', 'a4', 'a5'], ['a6']]
+
+        assert list(recs.getKeyIter(keys=('b', ''), after=('b', '04'))) == [('b', '05'), ('b', '06')]
+        assert [val['count'] for val in recs.getValIter(keys=('b', ''), limit=2, raw=True)] == [0, 1]
+        assert list(recs.getItemIter(keys='ab', after=('a', '03'))) == [(('ab', '00'), Record(name='ab'))]
+
+        for keys, lazy in recs.getLazyItemIter(keys=('b', ''), limit=2):
+            assert isinstance(lazy, LazyRecord) and isinstance(lazy.buf, memoryview)
+            assert lazy.val is lazy.val and lazy.val.name == f'b{int(keys[1])}'
+            assert lazy.raw == dict(name=lazy.val.name, count=lazy.val.count, tags=[])
+
+
+def test_komer_secondary_indexes():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        recs = Komer(db=db, subkey='recs.', schema=Record, indexes=('name', 'tags'))
+        recs.put(keys='a', val=Record(name='alice', tags=['witness', 'local']))
+        recs.put_many([('b', Record(name='bob')), ('c', Record(name='alice', count=3, tags=['witness']))])
+        assert recs.findKeys('name', 'alice') == [('a',), ('c',)]
+        assert [val.count for _, val in recs.find('tags', 'witness')] == [0, 3]
+        assert not recs.put(keys='c', val=Record(name='carol'))  # not overwritten, index unchanged
+        assert recs.findKeys('name', 'carol') == []
+
+        recs.pin(keys='a', val=Record(name='ann'))  # moves a from alice to ann
+        assert recs.findKeys('name', 'alice') == [('c',)] and recs.findKeys('name', 'ann') == [('a',)]
+        assert recs.findKeys('tags', 'local') == []
+
+        recs.rem(keys='c')
+        assert recs.findKeys('name', 'alice') == [] and recs.findKeys('tags', 'witness') == []
+
+        plain = Komer(db=db, subkey='recs.', schema=Record)  # writes without maintaining the indexes
+        plain.pin(keys='d', val=Record(name='dave'))
+        assert recs.findKeys('name', 'dave') == []
+        assert recs.reindex(chunk=1) == 3
+        assert recs.findKeys('name', 'dave') == [('d',)] and recs.findKeys('name', 'ann') == [('a',)]
+
+        assert recs.trim()
+        assert recs.findKeys('name', 'dave') == [] and recs.cntAll() == 0
+
+
+def test_komer_indexes_repeated_keys_in_one_transaction():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        recs = Komer(db=db, subkey='recs.', schema=Record, indexes=('name',))
+        recs.pin_many([('a', Record(name='aa')), ('a', Record(name='bb')), ('a', Record(name='cc'))])
+        assert recs.findKeys('name', 'aa') == [] and recs.findKeys('name', 'bb') == []
+        assert recs.findKeys('name', 'cc') == [('a',)]
+        assert [val.name for _, val in recs.find('name', 'cc')] == ['cc']
+
+        key = recs._tokey('b')
+        with db.env.begin(write=True, buffers=True) as txn:  # put then pin the same key
+            for name, overwrite in (('dd', False), ('ee', True), ('ff', True)):
+                val = Record(name=name)
+                assert recs._write(txn, key, val, recs.serializer(val), overwrite=overwrite)
+        assert recs.findKeys('name', 'dd') == [] and recs.findKeys('name', 'ee') == []
+        assert recs.findKeys('name', 'ff') == [('b',)]
+
+
+@dataclass
+class Renamed:
+    alias: str
+    count: int = 0
+    tags: list = field(default_factory=list)
+    score: int = 0
+
+
+def test_komer_upgrades_versioned_records_on_read_and_compacts():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        old = Komer(db=db, subkey='recs.', schema=Record)
+        old.put_many([(f'r{i}', Record(name=f'name{i}', count=i)) for i in range(5)])
+
+        def rename(d):
+            return dict(alias=d.pop('name'), **d)
+
+        recs = Komer(db=db, subkey='recs.', schema=Renamed, version=2, upgraders={0: rename})
+        with pytest.raises(ValueError, match='from version 1'):  # no 1 to 2 upgrader registered yet
+            recs.get(keys='r1')
+
+        @recs.upgrader(1)
+        def score(d):
+            return dict(d, score=d['count'] * 10)
+
+        assert recs.get(keys='r3') == Renamed(alias='name3', count=3, score=30)
+        assert recs.get(keys='r3', raw=True) == dict(alias='name3', count=3, tags=[], score=30)
+        recs.pin(keys='r4', val=Renamed(alias='four', count=4))
+        assert old.loader(db.getVal(db=old.sdb, key=b'r4'))['_v'] == 2
+        assert old.loader(db.getVal(db=old.sdb, key=b'r0')).get('_v') is None  # still as written
+
+        compactor = Compactor(komers=[old, recs], chunk=2, tock=0.0)
+        doing.Doist(doers=[compactor], tock=0.0, limit=1.0).do()
+        assert compactor.counts[recs] == 4 and not compactor.komers
+        assert all(old.loader(raw)['_v'] == 2 for _, raw in recs.getRangeIter())
+        assert [val.score for _, val in recs.getItemIter()] == [0, 10, 20, 30, 0]
+        assert recs.compact() == (0, None)
+
+
+def test_compactor_skips_records_failing_to_upgrade():
+    with dbing.openLMDB(name='test', temp=True) as db:
+        old = Komer(db=db, subkey='recs.', schema=Record)
+        old.put_many([(f'r{i}', Record(name=f'name{i}', count=i)) for i in range(5)])
+
+        def rename(d):
+            if d['count'] == 1:
+                raise ValueError('bad record')
+            return dict(alias=d.pop('name'), **d)
+
+        recs = Komer(db=db, subkey='recs.', schema=Renamed, version=1, upgraders={0: rename})
+        compactor = Compactor(komers=[recs], chunk=2, tock=0.0)
+        doing.Doist(doers=[compactor], tock=0.0, limit=1.0).do()
+        assert compactor.counts[recs] == 4 and not compactor.komers  # r1 skipped, the chunks after it compacted
+        assert [old.loader(raw).get('_v') for _, raw in recs.getRangeIter()] == [1, None, 1, 1, 1]
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+from hio.base import doing
+from keri.app import habbing
+from keri.core import coring, signing
+from keri.db import dbing, subing
+from keri.db.basing import KeyStateRecord
+
+from wallet.core import koming
+from wallet.core.baser import CHECKPOINT, PartialBaser, checkpoints
+from wallet.tasks.migrating import CHUNKED, Migrator, migrate_keystore, open_baser
+
+
+def old_keystore():
+    """Creates a keystore and reverts it to before the add_key_and_reg_state_schemas migration"""
+    salt = signing.Salter(raw=b'0123456789abcdef').qb64
+    hby = habbing.Habery(name='test', base='', temp=False, salt=salt)
+    verfers = []
+    for i in range(7):
+        hab = hby.makeHab(name=f'aid{i}', transferable=True)
+        for _ in range(4):
+            hab.interact()
+        verfers.append(hab.kever.verfers[0].qb64)
+    hby.close()
+
+    db = open_baser('test', '', False)
+    states = koming.Komer(db=db, subkey='stts.', schema=dict)
+    for keys, sad in list(states.getItemIter()):
+        del sad['vn']
+        db.setVal(db=states.sdb, key='.'.join(keys).encode('utf-8'), val=json.dumps(sad).encode('utf-8'))
+    subing.CatCesrIoSetSuber(db=db, subkey='pubs.', klas=(coring.Prefixer, coring.Seqner)).trim()
+    db.migs.trim()
+    db.version = '0.6.8'
+    db.close()
+    return verfers
+
+
+def test_migrator_resumes_from_checkpoint(tmp_path, monkeypatch):
+    # LMDBer.exists ignores headDirPath, so relocate the default instead to keep the keystore version
+    monkeypatch.setattr(dbing.LMDBer, 'HeadDirPath', str(tmp_path))
+    verfers = old_keystore()
+
+    db = open_baser('test', '', False)
+    migrator = Migrator(db=db, chunk=2)
+    seen = []
+    migrator.subscribe(seen.append)
+    doist = doing.Doist(doers=[migrator], tock=0.0)
+    doist.enter()
+    for _ in range(3):  # interrupted while converting the key states
+        doist.recur()
+    doist.exit()
+    assert checkpoints(db).get(keys=CHECKPOINT).step == 'states'
+    assert seen[-1]['migration'] == CHUNKED and seen[-1]['done'] == 6 and not seen[-1]['finished']
+    db.close()
+
+    db = open_baser('test', '', False)
+    migrator = Migrator(db=db, chunk=2)
+    doing.Doist(doers=[migrator], tock=0.0).do()
+    progress = migrator.progress()
+    assert progress['resumed'] and progress['finished'] and progress['error'] is None
+    assert progress['done'] == progress['total']
+    assert checkpoints(db).get(keys=CHECKPOINT) is None
+    assert db.current and db.migs.get(keys=(CHUNKED,)) is not None
+    assert all(isinstance(ksr, KeyStateRecord) for _, ksr in db.states.getItemIter())
+    pubs = subing.CatCesrIoSetSuber(db=db, subkey='pubs.', klas=(coring.Prefixer, coring.Seqner))
+    assert all(pubs.get(keys=(verfer,)) for verfer in verfers)
+    db.close()
+
+    db = PartialBaser(name='test', base='', temp=False, reopen=True)
+    assert db.stamped and not db.needs_migration()
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_migration_interrupted_before_first_checkpoint_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbing.LMDBer, 'HeadDirPath', str(tmp_path))
+    old_keystore()
+
+    db = open_baser('test', '', False)
+    migrator = Migrator(db=db, chunk=2)
+    migrator.enter()
+    migrator.convert_states('')  # first chunk written, wallet closed before recur checkpoints it
+    db.close()
+
+    db = open_baser('test', '', False)
+    assert checkpoints(db).get(keys=CHECKPOINT).step == 'states'  # pinned by enter
+    db.close()
+
+    threads = []
+    progress = await migrate_keystore('test', '', None, chunk=2, subscriber=lambda _: threads.append(threading.get_ident()))
+    assert progress['resumed'] and progress['finished'] and progress['error'] is None
+    assert threads and threading.get_ident() not in threads  # migrated off the event loop thread
+
+    db = open_baser('test', '', False)
+    assert all(isinstance(ksr, KeyStateRecord) for _, ksr in db.states.getItemIter())
+    db.close()
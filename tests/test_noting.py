@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from keri.app import habbing, notifying
+
+from wallet.core.agenting import Noter, NoticeSignaler
+
+
+class Page:
+    def __init__(self):
+        self.tasks = []
+
+    def run_task(self, handler, *args):
+        self.tasks.append(handler.__name__)
+
+
+def test_noter_applies_feed_incrementally():
+    with habbing.openHby(name='test', temp=True) as hby:
+        signaler = NoticeSignaler()
+        notifier = notifying.Notifier(hby=hby, signaler=signaler)
+        notifier.add(attrs=dict(r='/multisig/icp'))
+
+        app = SimpleNamespace(page=Page(), notes=[])
+        noter = Noter(app=app, hby=hby, notifier=notifier, feed=signaler.feed)
+        noter.enter()
+        assert noter.unread == 1 and len(app.notes) == 1
+        assert app.page.tasks == ['show_unread']
+
+        noter.update()  # nothing changed, no UI updates
+        assert app.page.tasks == ['show_unread']
+
+        notifier.add(attrs=dict(r='/multisig/rot'))
+        noter.update()
+        assert noter.unread == 2
+        assert [note.attrs['r'] for note in app.notes] == ['/multisig/rot', '/multisig/icp']
+        assert app.page.tasks == ['show_unread', 'show_new_notifications']
+
+        for note in list(app.notes):
+            assert noter.mar(note.rid)
+        assert noter.unread == 0
+        assert app.page.tasks[-1] == 'show_read'
+
+        for note in list(app.notes):
+            noter.rem(note.rid)
+        assert app.notes == [] and noter.unread == 0
+        assert app.page.tasks[-1] == 'show_no_notifications'
+        assert len(signaler.signals) == 1  # signals still collapse for other consumers
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from hio.help import decking
+
+from wallet.core.bridging import AgentStoppedError
+from wallet.core.operating import Operations, OperationTimeoutError
+
+
+@pytest.mark.asyncio
+async def test_operations():
+    ops = Operations()
+    cues = decking.Deck()
+    ops.listen(cues, keyer=lambda cue: ('resubmit', cue['pre']))
+
+    receipted = ops.expect(('receipts', 'EPre', 0))
+    resubmitted = ops.expect(('resubmit', 'EPre'))
+    state = dict(resolved=None)
+    resolved = ops.watch(lambda: state['resolved'], interval=0.0)
+    late = ops.expect(('never',), timeout=0.0)
+    assert ops.pending == 4
+
+    ops.recur(tyme=0.0)
+    assert not receipted.done() and not resubmitted.done() and not resolved.done()
+    with pytest.raises(OperationTimeoutError):
+        await late
+
+    assert ops.complete(('receipts', 'EPre', 0), 'serder') == 1
+    assert await receipted == 'serder'
+
+    cues.push(dict(pre='EPre'))
+    assert not ops.idle
+    ops.recur(tyme=0.0)
+    assert await resubmitted == dict(pre='EPre')
+
+    state['resolved'] = 'oobi'
+    ops.recur(tyme=0.0)
+    assert await asyncio.wait_for(resolved, 1.0) == 'oobi'
+    assert ops.pending == 0
+
+    stopped = ops.watch(lambda: None)
+    ops.exit()
+    with pytest.raises(AgentStoppedError):
+        await stopped
@@ -0,0 +1,71 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hio.base import doing
+from hio.core import http
+
+from wallet.core.pooling import ConnectionPool, PooledClient, PooledHTTPMessenger
+
+
+class Witness(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        Witness.connections += 1
+        super(Witness, self).setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path == '/stall':
+            time.sleep(0.5)
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_pool_reuses_keep_alive_connections():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Witness)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+
+    pool = ConnectionPool(per_host=2, timeout=0.2)
+    doist = doing.Doist(doers=[pool], tock=0.0, real=True)
+    doist.enter()
+    try:
+        clients = [pool.client(url) for _ in range(5)]
+        for client in clients:
+            for _ in range(3):
+                client.request(method='POST', body=b'{}')
+        deadline = time.monotonic() + 5.0
+        while not pool.idle and time.monotonic() < deadline:
+            doist.recur()
+
+        assert [len(client.responses) for client in clients] == [3] * 5
+        assert all(client.respond().status == 204 for client in clients)
+        assert Witness.connections == 2 and len(pool.connections[clients[0].key]) == 2
+        assert pool.stats['requests'] == 15 and pool.stats['opened'] == 2 and pool.stats['reused'] == 13
+
+        stalled = pool.client(url + 'stall')
+        stalled.request(method='POST', body=b'{}')
+        deadline = time.monotonic() + 5.0
+        while not pool.idle and time.monotonic() < deadline:
+            doist.recur()
+        assert stalled.respond().errored and pool.stats['timeouts'] == 1
+        assert len(pool.connections[stalled.key]) == 1  # the stalled connection was closed
+    finally:
+        doist.exit()
+        server.shutdown()
+
+
+def test_pooled_messenger_sends_over_the_pool():
+    pool = ConnectionPool()
+    messenger = PooledHTTPMessenger(hab=None, wit='BWit', url='http://127.0.0.1:5631/', pool=pool)
+    assert isinstance(messenger.client, PooledClient) and messenger.client.eid == 'BWit'
+    assert not any(isinstance(doer, http.clienting.ClientDoer) for doer in messenger.doers)
+    assert len(messenger.doers) == 2 and messenger.posted == 0 and not messenger.msgs
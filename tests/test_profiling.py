@@ -0,0 +1,65 @@
+import json
+import threading
+
+from hio.base import doing
+
+from wallet.core.profiling import DoerProfiler, DoerStats
+
+
+class Parent(doing.DoDoer):
+    def __init__(self, **kwa):
+        super(Parent, self).__init__(doers=[doing.doify(self.childDo)], always=True, **kwa)
+
+    def childDo(self, tymth=None, tock=0.0, **opts):
+        while True:
+            yield tock
+
+    def recur(self, tyme, deeds=None):
+        if len(self.deeds) < 2:
+            self.extend([Extended()])  # dynamically extended doers are profiled too
+        return super(Parent, self).recur(tyme, deeds)
+
+
+class Extended(doing.Doer):
+    def recur(self, tyme):
+        return False
+
+
+def test_doer_profiler(tmp_path):
+    profiler = DoerProfiler(path=str(tmp_path / 'profile.json')).install()
+    try:
+        doist = doing.Doist(doers=[Parent()], tock=0.03125, real=False, limit=1.0)
+        doist.do()
+    finally:
+        profiler.uninstall()
+
+    assert not profiler.installed
+    stats = {stat['path']: stat for stat in profiler.snapshot()}
+    assert set(stats) == {'Doist', 'Doist/Parent', 'Doist/Parent/childDo', 'Doist/Parent/Extended'}
+    assert stats['Doist']['count'] == 32
+    assert stats['Doist/Parent/childDo']['count'] == 32
+    assert stats['Doist/Parent']['p50_ms'] <= stats['Doist/Parent']['p99_ms'] <= stats['Doist/Parent']['max_ms']
+
+    profiler.dump()
+    with open(tmp_path / 'profile.json') as f:
+        dumped = json.load(f)
+    assert [stat['path'] for stat in dumped['doers']] == [stat['path'] for stat in profiler.snapshot()]
+
+
+def test_doer_stats_summary_while_recording():
+    stats = DoerStats('Doist/Busy', samples=64)
+    done = threading.Event()
+
+    def record():
+        while not done.is_set():
+            stats.record(0.001)
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    try:
+        for _ in range(2000):  # sorting a deque mutated by another thread would raise RuntimeError
+            stats.summary()
+    finally:
+        done.set()
+        thread.join()
+    assert stats.summary()['count'] == stats.count
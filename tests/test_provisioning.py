@@ -0,0 +1,68 @@
+from hio.base import doing
+from hio.help import decking
+from keri.app import habbing
+from keri.core import signing
+
+from wallet.core.operating import Operations
+from wallet.tasks.provisioning import Provisioner, load_specs
+
+
+class StandInWitnesser(doing.Doer):
+    """Receipts one queued inception per cycle, failing those of the given aliases"""
+
+    def __init__(self, hby, witners, operations, fail=()):
+        self.hby = hby
+        self.witners = witners
+        self.operations = operations
+        self.fail = fail
+        self.queued = 0
+        super(StandInWitnesser, self).__init__()
+
+    def recur(self, tyme):
+        if self.witners:
+            serder = self.witners.popleft()['serder']
+            self.queued += 1
+            if self.hby.habByPre(serder.pre).name in self.fail:
+                self.operations.fail(('receipts', serder.pre, 0), ValueError('no receipts'))
+            else:
+                self.operations.complete(('receipts', serder.pre, 0), serder)
+        return False
+
+
+def run(hby, specs, fail=()):
+    ops = Operations()
+    witners = decking.Deck()
+    witnesser = StandInWitnesser(hby=hby, witners=witners, operations=ops, fail=fail)
+    provisioner = Provisioner(hby=hby, specs=specs, witners=witners, operations=ops, batch=2, window=3)
+    doist = doing.Doist(doers=[ops, witnesser, provisioner], tock=0.0, limit=5.0)
+    doist.enter()
+    while not provisioner.finished and doist.tyme < 5.0:
+        doist.recur()
+    doist.exit()
+    return provisioner.progress(), witnesser
+
+
+def test_provisioner_creates_receipts_and_resumes(tmp_path):
+    wits = [signing.Signer(transferable=False).verfer.qb64 for _ in range(3)]
+    spec = tmp_path / 'aids.csv'
+    rows = ['alias,algo,icount,isith,ncount,nsith,pool,toad']
+    rows += [f'aid{i},randy,2,1,2,1,main,2' for i in range(5)]
+    rows += ['local,salty,1,1,1,1,,']
+    spec.write_text('\n'.join(rows) + '\n')
+
+    specs = load_specs(spec, pools=dict(main=wits))
+    assert [s.alias for s in specs] == ['aid0', 'aid1', 'aid2', 'aid3', 'aid4', 'local']
+    assert specs[0].wits == wits and specs[0].isith == 1 and specs[0].toad == 2 and specs[5].wits == []
+
+    with habbing.openHby(name='test', temp=True) as hby:
+        progress, witnesser = run(hby, specs, fail=('aid3',))
+        assert progress['created'] == 6 and progress['receipted'] == 4 and progress['failed'] == 1
+        assert progress['finished'] == 6 and progress['inflight'] == 0
+        assert progress['failures'] == [('aid3', 'no receipts')]
+        assert witnesser.queued == 5
+        assert len(hby.habByName('aid0').kever.verfers) == 2
+
+        # existing identifiers are not created again, unreceipted witnessed ones are receipted again
+        progress, witnesser = run(hby, specs)
+        assert progress['created'] == 0 and progress['resumed'] == 5 and progress['skipped'] == 1
+        assert progress['receipted'] == 5 and witnesser.queued == 5
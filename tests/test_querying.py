@@ -0,0 +1,61 @@
+import pytest
+from hio.base import doing
+from hio.help import decking
+
+from wallet.core.operating import Operations
+from wallet.core.querying import Querier, query_key
+
+
+class Answer(doing.Doer):
+    def __init__(self, **kwa):
+        self.answered = False
+        super(Answer, self).__init__(**kwa)
+
+    def recur(self, tyme):
+        return self.answered
+
+
+class LocalQuerier(Querier):
+    def __init__(self, queries, operations):
+        self.answers = []
+        super(LocalQuerier, self).__init__(hby=None, queries=queries, kvy=None, operations=operations, max_per_witness=1)
+
+    def witnesses(self, pre):
+        return ['BWit']
+
+    def spawn(self, msg, wits=None):
+        self.answers.append(Answer())
+        return self.answers[-1]
+
+
+@pytest.mark.asyncio
+async def test_querier_coalesces_and_caps_per_witness():
+    queries = decking.Deck()
+    ops = Operations()
+    querier = LocalQuerier(queries=queries, operations=ops)
+    doist = doing.Doist(doers=[querier], tock=0.03125, real=False)
+    doist.enter()
+
+    first = ops.expect(('query', *query_key(dict(src='local', pre='EPre'))))
+    for _ in range(3):
+        queries.append(dict(src='local', pre='EPre'))
+    queries.append(dict(src='local', pre='EPre', sn='2'))
+    doist.recur()
+
+    assert not queries
+    assert querier.stats['coalesced'] == 2
+    assert len(querier.answers) == 1  # second query waits for the witness
+    assert querier.load['BWit'] == 1
+
+    querier.answers[0].answered = True
+    doist.recur()
+    doist.recur()
+    assert await first == dict(src='local', pre='EPre')
+    assert len(querier.answers) == 2
+
+    querier.answers[1].answered = True
+    doist.recur()
+    doist.recur()
+    assert querier.idle
+    assert querier.stats['completed'] == 2
+    doist.exit()
@@ -0,0 +1,163 @@
+from types import SimpleNamespace
+
+from hio.base import doing
+from hio.help import decking
+from keri.db import dbing
+
+from wallet.core.agenting import Witnesser
+from wallet.core.operating import Operations
+from wallet.core.tracking import WitnessTracker
+
+
+class Receiptor:
+    """
+    Stand-in receiptor whose witnesses take a few cycles to catch up and receipt. Like keri's, receipt
+    catches up the added witnesses of a rotation one after another, those in .caught excepted as
+    CaughtUpReceiptor does.
+    """
+
+    def __init__(self, wits, adds=None, down=(), silent=()):
+        self.hby = SimpleNamespace(kevers=dict(), db=SimpleNamespace(getWigs=lambda key: []))
+        self.wits = wits
+        self.adds = adds if adds is not None else dict()  # AID to witnesses added by its rotation
+        self.down = down  # witnesses failing to catch up
+        self.silent = silent  # witnesses returning no receipt
+        self.caught = set()
+        self.catching = 0
+        self.peak = 0
+        self.catchups = []
+        self.receipted = []
+        self.events = []  # receipting started and finished, in order
+
+    def catchup(self, pre, wit):
+        if (pre, wit) in self.caught:
+            return
+        self.catchups.append((pre, wit))
+        self.catching += 1
+        self.peak = max(self.peak, self.catching)
+        for _ in range(3):
+            yield 0.0
+        self.catching -= 1
+        if wit in self.down:
+            raise ConnectionError(f'{wit} unreachable')
+
+    def receipt(self, pre, sn):
+        self.events.append(('start', pre, sn))
+        for wit in self.adds.get(pre, []):
+            yield from self.catchup(pre, wit)
+        for _ in range(2):
+            yield 0.0
+        self.receipted.append((pre, sn))
+        self.events.append(('end', pre, sn))
+        return [wit for wit in self.wits if wit not in self.silent]
+
+
+def rotation(pre, adds, sn=1):
+    return SimpleNamespace(pre=pre, sn=sn, preb=pre.encode(), saidb=b'ESaid', ked=dict(t='rot', ba=adds))
+
+
+def test_witnesser_receipts_many_aids_at_once():
+    pres = [f'EAid{i}' for i in range(3)]
+    receiptor = Receiptor(wits=['BWit0', 'BWit1', 'BWit2'], adds={pre: ['BWit1', 'BWit2'] for pre in pres})
+    ops = Operations()
+    app = SimpleNamespace(page=SimpleNamespace(run_task=lambda *args: None))
+    witnesser = Witnesser(app=app, receiptor=receiptor, witners=decking.Deck(), operations=ops, limit=8)
+    progress = []
+    witnesser.subscribe(lambda prog: progress.append((prog['pre'], prog['state'], len(prog['caught']))))
+
+    receipted = [ops.expect(('receipts', pre, 1)) for pre in pres]
+    for pre in pres:
+        witnesser.witners.append(dict(serder=rotation(pre, adds=['BWit1', 'BWit2'])))
+
+    doist = doing.Doist(doers=[witnesser], tock=0.0, limit=1.0)
+    doist.enter()
+    while not witnesser.idle and doist.tyme < 1.0:
+        doist.recur()
+    doist.exit()
+
+    assert receiptor.peak == 6  # all added witnesses of all AIDs caught up at once
+    assert sorted(receiptor.catchups) == sorted((pre, wit) for pre in pres for wit in ('BWit1', 'BWit2'))  # once each
+    assert not receiptor.caught
+    assert sorted(receiptor.receipted) == [(pre, 1) for pre in pres]
+    assert all(op.done() for op in receipted) and witnesser.stats == dict(completed=3, failed=0)
+    assert [state for pre, state, _ in progress if pre == 'EAid0'] == [
+        'queued',
+        'catchup',
+        'catchup',
+        'catchup',
+        'receipting',
+        'done',
+    ]
+    assert ('EAid0', 'catchup', 2) in progress
+
+
+def test_witnesser_fails_job_when_catchup_fails():
+    receiptor = Receiptor(wits=['BWit0', 'BWit1'], adds={'EAid': ['BWit1', 'BDown']}, down={'BDown'})
+    ops = Operations()
+    app = SimpleNamespace(page=SimpleNamespace(run_task=lambda *args: None))
+    witnesser = Witnesser(app=app, receiptor=receiptor, witners=decking.Deck(), operations=ops)
+    receipted = ops.expect(('receipts', 'EAid', 1))
+    witnesser.witners.append(dict(serder=rotation('EAid', adds=['BWit1', 'BDown'])))
+
+    doist = doing.Doist(doers=[witnesser], tock=0.0, limit=1.0)
+    doist.enter()
+    while not witnesser.idle and doist.tyme < 1.0:
+        doist.recur()
+    doist.exit()
+
+    assert witnesser.idle and not witnesser.deeds  # the Doist kept running and no catch-up is left behind
+    assert isinstance(receipted.future.exception(timeout=0), ConnectionError)
+    assert witnesser.stats == dict(completed=0, failed=1) and not receiptor.receipted
+    assert not receiptor.caught
+
+
+def test_witnesser_receipts_events_of_an_aid_in_order():
+    receiptor = Receiptor(wits=['BWit0', 'BWit1'], adds={'EAid': ['BWit1']})
+    ops = Operations()
+    app = SimpleNamespace(page=SimpleNamespace(run_task=lambda *args: None))
+    witnesser = Witnesser(app=app, receiptor=receiptor, witners=decking.Deck(), operations=ops, limit=8)
+    witnesser.witners.append(dict(serder=rotation('EAid', adds=['BWit1'], sn=1)))
+    witnesser.witners.append(dict(serder=rotation('EAid', adds=['BWit1'], sn=2)))
+    witnesser.witners.append(dict(serder=rotation('EOther', adds=[])))
+
+    doist = doing.Doist(doers=[witnesser], tock=0.0, limit=1.0)
+    doist.enter()
+    doist.recur()
+    assert [(job.pre, job.sn) for job in witnesser.running] == [('EAid', 1), ('EOther', 1)]
+    assert list(witnesser.waiting) == [('EAid', 2)]  # held until sn 1 is receipted
+    while not witnesser.idle and doist.tyme < 1.0:
+        doist.recur()
+    doist.exit()
+
+    assert [(event, sn) for event, pre, sn in receiptor.events if pre == 'EAid'] == [
+        ('start', 1),
+        ('end', 1),
+        ('start', 2),
+        ('end', 2),
+    ]
+    assert witnesser.stats == dict(completed=3, failed=0)
+
+
+def test_witnesser_records_witness_health():
+    receiptor = Receiptor(
+        wits=['BWit0', 'BWit1', 'BWit2'], adds={'EAid': ['BWit2'], 'EDown': ['BDown']}, down={'BDown'}, silent={'BWit1'}
+    )
+    receiptor.hby.kevers.update({pre: SimpleNamespace(wits=receiptor.wits) for pre in ('EAid', 'EDown')})
+    ops = Operations()
+    app = SimpleNamespace(page=SimpleNamespace(run_task=lambda *args: None))
+    with dbing.openLMDB(name='receipting', temp=True) as db:
+        tracker = WitnessTracker(db=db)
+        witnesser = Witnesser(app=app, receiptor=receiptor, witners=decking.Deck(), operations=ops, tracker=tracker)
+        witnesser.witners.append(dict(serder=rotation('EAid', adds=['BWit2'])))
+        witnesser.witners.append(dict(serder=rotation('EDown', adds=['BDown'])))
+
+        doist = doing.Doist(doers=[witnesser], tock=0.0, limit=1.0)
+        doist.enter()
+        while not witnesser.idle and doist.tyme < 1.0:
+            doist.recur()
+        doist.exit()
+
+        assert tracker.get('BWit0').successes == 1 and tracker.get('BWit0').failures == 0
+        assert tracker.get('BWit1').failures == 1 and tracker.get('BWit1').last_error == 'no receipt'
+        assert tracker.get('BWit2').successes == 2  # caught up, then receipted
+        assert tracker.get('BDown').failures == 1 and tracker.get('BDown').last_error == 'BDown unreachable'
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+from hio.base import doing
+
+from wallet.core.agenting import HioTask
+from wallet.core.configing import SchedulerModes
+from wallet.core.scheduling import IdleBackoff, WakeDeck, Waker, inflight
+
+
+def test_idle_backoff():
+    backoff = IdleBackoff(tock=0.125, max_tock=1.0)
+    assert [backoff.next() for _ in range(6)] == [0.125, 0.25, 0.5, 1.0, 1.0, 1.0]
+    backoff.reset()
+    assert backoff.next() == 0.125
+
+
+def test_inflight():
+    class Messenger(doing.Doer):
+        idle = True
+
+    messenger = Messenger()
+    dodoer = doing.DoDoer(doers=[])
+    dodoer.deeds.append((None, 0.0, messenger))
+    assert not inflight(dodoer)
+
+    messenger.idle = False
+    assert inflight(dodoer)
+
+
+@pytest.mark.asyncio
+async def test_wake_deck_wakes_from_thread():
+    waker = Waker()
+    deck = WakeDeck(waker=waker)
+    waker.bind()
+
+    assert await waker.wait(0.01) is False
+    threading.Timer(0.05, deck.push, args=('work',)).start()
+    assert await waker.wait(5.0) is True
+    assert deck.pull() == 'work'
+
+    deck.push(None)  # Deck.push ignores None so there is nothing to wake up for
+    assert await waker.wait(0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_adaptive_hio_task():
+    waker = Waker()
+    deck = WakeDeck(waker=waker)
+    pulled = []
+
+    @doing.doize()
+    def consume(tymth=None, tock=0.0, **opts):
+        while True:
+            while deck:
+                pulled.append(deck.pull())
+            yield tock
+
+    event = asyncio.Event()
+    doist = doing.Doist(doers=[consume], tock=0.03125, real=True)
+    htask = HioTask(doist=doist, event=event, mode=SchedulerModes.ADAPTIVE, idler=lambda: not deck, waker=waker)
+    task = asyncio.create_task(htask.run())
+
+    await asyncio.sleep(1.0)
+    assert htask.stats.idle_cycles > 0
+    assert htask.backoff.idles > 0
+
+    deck.push('work')
+    await asyncio.sleep(0.1)
+    assert pulled == ['work']
+    assert htask.stats.wakes >= 1
+    assert doist.tyme >= 1.0  # tyme keeps up with real time while sleeping
+
+    event.set()
+    await asyncio.wait_for(task, 5.0)
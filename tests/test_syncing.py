@@ -0,0 +1,255 @@
+from types import SimpleNamespace
+
+import pytest
+from hio.base import doing
+from hio.help import decking
+from keri import kering
+from keri.app import habbing
+from keri.core import coring, eventing, routing
+
+from wallet.core.operating import Operations, OperationTimeoutError
+from wallet.core.syncing import (
+    AidKelUpdate,
+    KELStateReader,
+    KELStateUpdater,
+    UpdateRegistry,
+    WatchSchedule,
+    WitnessKevery,
+    WitnessStates,
+)
+
+
+class LocalReader(KELStateReader):
+    def __init__(self, habs, **kwa):
+        self.habs = habs
+        self.sent = []
+        self.active = 0
+        self.peak = 0
+        self.processed = []
+        app = SimpleNamespace(page=SimpleNamespace(run_task=lambda *args: None))
+        super(LocalReader, self).__init__(
+            app=app,
+            hby=None,
+            watch_reqs=decking.Deck(),
+            aid_updates=UpdateRegistry(),
+            wit_updates=UpdateRegistry(),
+            dup_evts=UpdateRegistry(),
+            witstates=WitnessStates(),
+            **kwa,
+        )
+
+    def watched_habs(self, aids=None):
+        return self.habs
+
+    def send_probe(self, probe, deadline):
+        probe.deadline = deadline
+        self.sent.append(probe)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def poll_probe(self, probe, now):
+        if probe.wit == 'BDead' and now <= probe.deadline:
+            return False
+        if probe.wit != 'BDead':
+            probe.state = probe.wit
+        self.active -= 1
+        return True
+
+    def process_states(self, states, hab):
+        self.processed.append((hab.pre, sorted(states)))
+        return [], [], []
+
+
+def test_reader_fans_out_witness_queries():
+    wits = ['BOne', 'BTwo', 'BDead']
+    habs = [SimpleNamespace(pre=pre, kever=SimpleNamespace(wits=wits)) for pre in ('EOne', 'ETwo')]
+    reader = LocalReader(habs=habs, limit=4, timeout=0.0)
+    doist = doing.Doist(doers=[reader], tock=0.03125, real=False)
+    doist.enter()
+
+    reader.watch_reqs.append(dict())
+    doist.recur()
+    assert reader.syncing
+    reader.watch_reqs.append(dict())  # arrives mid pass, runs after it
+    while reader.syncing:
+        doist.recur()
+
+    assert len(reader.sent) == 6 and reader.peak == 4
+    assert reader.processed == [('EOne', ['BOne', 'BTwo']), ('ETwo', ['BOne', 'BTwo'])]
+    assert reader.resync
+    doist.exit()
+
+
+def test_witness_kevery_records_side_table():
+    with habbing.openHby(name='test', temp=True) as hby:
+        hab = hby.makeHab(name='test')
+        witstates = WitnessStates()
+        kvy = WitnessKevery(witstates=witstates, db=hby.db, lax=True, local=False)
+
+        ksr = hab.kever.state()
+        saider = coring.Saider(qb64=ksr.d)
+        since = witstates.generation
+        kvy.updateKeyState(aid='BWit', ksr=ksr, saider=saider, dater=coring.Dater(dts=ksr.dt))
+        assert witstates.fresh(hab.pre, 'BWit', since=since).ksr == ksr
+        assert hby.db.knas.get(keys=(hab.pre, 'BWit')).qb64 == saider.qb64
+
+        hby.db.kdts.rem(keys=(saider.qb64,))
+        since = witstates.generation
+        kvy.updateKeyState(aid='BWit', ksr=ksr, saider=saider, dater=coring.Dater(dts=ksr.dt))
+        assert witstates.fresh(hab.pre, 'BWit', since=since) is not None
+        assert hby.db.kdts.get(keys=(saider.qb64,)) is None  # unchanged state is not rewritten
+        assert witstates.fresh(hab.pre, 'BWit', since=witstates.generation) is None
+
+
+def stale_notice(hby):
+    hab = hby.makeHab(name='test')
+    wit = hby.makeHab(name='wit', transferable=False)
+    stale = hab.kever.state()
+    hab.interact()
+    serder = eventing.reply(route=f'/ksn/{hab.pre}', data=stale._asdict())
+    return hab, wit, stale, serder
+
+
+def test_witness_kevery_records_stale_notice_of_lagging_witness():
+    with habbing.openHby(name='test', temp=True) as hby:
+        hab, wit, stale, serder = stale_notice(hby)
+        witstates = WitnessStates()
+        kvy = WitnessKevery(witstates=witstates, db=hby.db, lax=True, local=False, rvy=routing.Revery(db=hby.db))
+
+        cigars = wit.sign(ser=serder.raw, indexed=False)
+        with pytest.raises(kering.ValidationError, match='stale'):
+            kvy.processReplyKeyStateNotice(
+                serder=serder, saider=coring.Saider(qb64=serder.said), route='/ksn', cigars=cigars, aid=wit.pre
+            )
+        assert witstates.fresh(hab.pre, wit.pre, since=0).ksr == stale  # answered the query, the witness is behind
+
+
+def test_witness_kevery_ignores_unverified_stale_notice():
+    with habbing.openHby(name='test', temp=True) as hby:
+        hab, wit, stale, serder = stale_notice(hby)
+        other = hby.makeHab(name='other', transferable=False)
+        witstates = WitnessStates()
+        kvy = WitnessKevery(witstates=witstates, db=hby.db, lax=True, local=False, rvy=routing.Revery(db=hby.db))
+
+        for cigars in (None, other.sign(ser=serder.raw, indexed=False)):  # unsigned, signed by another key
+            with pytest.raises(kering.ValidationError, match='stale'):
+                kvy.processReplyKeyStateNotice(
+                    serder=serder, saider=coring.Saider(qb64=serder.said), route='/ksn', cigars=cigars, aid=wit.pre
+                )
+        assert witstates.get(hab.pre, wit.pre) is None
+        assert witstates.generation == 0
+
+
+def test_watch_schedule_backs_off_in_sync_aids():
+    schedule = WatchSchedule(tock=10.0, max_tock=40.0, jitter=0.0)
+    schedule.track(['EOne', 'ETwo'], tyme=0.0)
+    assert schedule.due(0.0) == ['EOne', 'ETwo']
+    assert schedule.due(1.0) == []  # checking
+
+    schedule.checked('EOne', in_sync=True, tyme=1.0)
+    schedule.checked('ETwo', in_sync=False, tyme=1.0)
+    assert schedule.entries['EOne'].due == 21.0 and schedule.entries['ETwo'].due == 11.0
+
+    for tyme in (21.0, 61.0, 101.0):
+        assert schedule.due(tyme) == ['EOne', 'ETwo']
+        schedule.checked('EOne', in_sync=True, tyme=tyme)
+        schedule.checked('ETwo', in_sync=False, tyme=tyme)
+    assert schedule.entries['EOne'].interval == 40.0 and schedule.entries['ETwo'].interval == 10.0
+    assert schedule.due(102.0) == []
+
+    schedule.trigger(102.0, aid='EOne')
+    assert 'EOne' in schedule.due(102.0)
+    schedule.track(['EOne'], tyme=102.0)
+    assert list(schedule.entries) == ['EOne']
+
+
+def test_update_registry():
+    registry = UpdateRegistry()
+    changed = []
+    registry.subscribe(changed.append)
+
+    one = AidKelUpdate(aid='EGroup', sn=2, said='EOne', wit_pre='BOne', duplicitous=False)
+    two = AidKelUpdate(aid='EGroup', sn=2, said='EOne', wit_pre='BTwo', duplicitous=False)
+    assert registry.put(one) and registry.put(two)  # a second witness reporting the same AID is kept
+    assert not registry.put(one)
+    assert registry.first('EGroup') == one and len(registry) == 2 and 'EGroup' in registry
+
+    newer = AidKelUpdate(aid='EGroup', sn=2, said='ENewer', wit_pre='BOne', duplicitous=False)
+    assert registry.put(newer)
+    assert registry.get('EGroup', 'BOne', 2) == newer
+
+    assert registry.replace('EGroup', [two])
+    assert registry.forAid('EGroup') == [two]
+    assert not registry.replace('EGroup', [two])
+
+    assert registry.discard('EGroup') and not registry
+    assert changed == ['EGroup'] * 5
+
+
+class LocalUpdater(KELStateUpdater):
+    """KELStateUpdater whose witnesses deliver the missing events at once, or never when stalled"""
+
+    def __init__(self, habs, stalled, **kwa):
+        self.habs = habs
+        self.stalled = stalled
+        self.requests = []
+        app = SimpleNamespace(agent=SimpleNamespace(aid_updates=UpdateRegistry()))
+        hby = SimpleNamespace(habByPre=lambda pre: self.habs.get(pre))
+        super(LocalUpdater, self).__init__(app=app, hby=hby, update_reqs=decking.Deck(), witstates=WitnessStates(), **kwa)
+
+    def request(self, catchup, now):
+        kever = self.habs[catchup.aid].kever
+        self.requests.append((catchup.aid, catchup.wit, kever.sn + 1))
+        catchup.deadline = now + self.timeout
+        if catchup.wit not in self.stalled:
+            kever.sn = catchup.sn
+            kever.serder.said = catchup.said
+
+
+def test_updater_catches_up_in_parallel_with_failover():
+    habs = {
+        f'EGroup{i}': SimpleNamespace(pre=f'EGroup{i}', kever=SimpleNamespace(sn=2, serder=SimpleNamespace(said='EOld')))
+        for i in range(3)
+    }
+    ops = Operations()
+    updater = LocalUpdater(habs=habs, stalled={'BWit0'}, operations=ops, limit=2, timeout=0.0)
+    for wit in ('BWit0', 'BWit1'):
+        updater.app.agent.aid_updates.put(AidKelUpdate(aid='EGroup0', sn=5, said='ENew', wit_pre=wit, duplicitous=False))
+    ops0 = [ops.expect(('kel_update', aid)) for aid in ('EGroup0', 'EGroup1', 'EGroup2')]
+
+    updater.update_reqs.extend(
+        [
+            AidKelUpdate(aid='EGroup0', sn=5, said='ENew', wit_pre='BWit0', duplicitous=False),
+            AidKelUpdate(aid='EGroup1', sn=3, said='ENew', wit_pre='BWit2', duplicitous=False),
+            AidKelUpdate(aid='EGroup2', sn=4, said='ENew', wit_pre='BWit0', duplicitous=False),
+        ]
+    )
+    for _ in range(4):
+        updater.recur(tyme=0.0)
+    ops.recur(tyme=0.0)
+
+    assert updater.idle
+    assert [req[0] for req in updater.requests[:2]] == ['EGroup0', 'EGroup1']  # started in arrival order
+    assert len([req for req in updater.requests if req[1] == 'BWit0']) == 2
+    assert ('EGroup0', 'BWit1', 3) in updater.requests  # only the missing events, from the next witness
+    assert habs['EGroup0'].kever.sn == 5 and habs['EGroup1'].kever.sn == 3 and habs['EGroup2'].kever.sn == 2
+    assert ops0[0].done() and ops0[1].done()
+    assert isinstance(ops0[2].future.exception(), OperationTimeoutError)
+    assert updater.stats == dict(completed=2, failed=1, retries=1)
+    assert len(updater.durations) == 2
+    assert not updater.app.agent.aid_updates
+
+
+def test_updater_fails_catch_up_of_removed_aid():
+    ops = Operations()
+    app = SimpleNamespace(agent=SimpleNamespace(aid_updates=UpdateRegistry()))
+    hby = SimpleNamespace(habByPre=lambda pre: None)  # AID deleted after its update was queued
+    updater = KELStateUpdater(app=app, hby=hby, update_reqs=decking.Deck(), witstates=WitnessStates(), operations=ops)
+    op = ops.expect(('kel_update', 'EGone'))
+    updater.update_reqs.append(AidKelUpdate(aid='EGone', sn=3, said='ENew', wit_pre='BWit0', duplicitous=False))
+
+    updater.recur(tyme=0.0)
+    ops.recur(tyme=0.0)
+
+    assert updater.idle and updater.stats['failed'] == 1
+    assert isinstance(op.future.exception(), ValueError)
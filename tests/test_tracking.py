@@ -0,0 +1,39 @@
+from keri.db import dbing
+
+from wallet.core.tracking import WitnessTracker, witness_of
+
+
+def test_witness_tracker_ranks_and_skips_dead_witnesses():
+    with dbing.openLMDB(name='tracking') as db:
+        tracker = WitnessTracker(db=db, dead_after=3, retry_after=60.0)
+        for rtt in (0.02, 0.04, 0.3):
+            tracker.success('BFast', rtt)
+        tracker.success('BSlow', 2.0)
+        tracker.failure('BSlow', 'HTTP 503 Service Unavailable')
+        for _ in range(3):
+            tracker.failure('BDead', 'request timed out')
+
+        fast = tracker.get('BFast')
+        assert fast.successes == 3 and fast.rate == 1.0
+        assert fast.percentile(50) == 0.05 and fast.percentile(100) == 0.5
+        assert tracker.get('BSlow').rate == 0.5 and tracker.get('BSlow').last_error == 'HTTP 503 Service Unavailable'
+
+        assert tracker.dead('BDead') and not tracker.dead('BSlow')
+        assert tracker.rank(['BDead', 'BSlow', 'BFast']) == ['BFast', 'BSlow', 'BDead']
+        assert tracker.alive(['BDead', 'BSlow']) == ['BSlow']
+
+        oobis = [f'http://127.0.0.1:5642/oobi/EAid/witness/{wit}' for wit in ('BDead', 'BFast')]
+        assert witness_of(oobis[1]) == 'BFast' and witness_of('http://127.0.0.1/oobi/EAid/controller') is None
+        assert tracker.choose(oobis) == oobis[1]
+
+        tracker.success('BDead', 0.1)  # one success revives a witness
+        assert not tracker.dead('BDead')
+
+        assert WitnessTracker(db=db).get('BFast').successes == 0  # in memory until flushed
+        assert tracker.flush() == 3 and not tracker.dirty
+        reloaded = WitnessTracker(db=db)
+        assert reloaded.get('BFast').hist == fast.hist and reloaded.get('BDead').failures == 3
+
+        tracker.failure('BSlow', 'request timed out')
+        tracker.exit()  # flushed when the agent stops
+        assert WitnessTracker(db=db).get('BSlow').failures == 2
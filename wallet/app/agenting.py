@@ -9,6 +9,7 @@ from keri import kering
 from keri.app import configing, directing, habbing
 from keri.core import signing
 
+from wallet import walleting
 from wallet.app.colouring import Colouring
 from wallet.core.configing import DEFAULT_PASSCODE, DEFAULT_USERNAME, Environments, WalletConfig
 from wallet.core.habs import check_passcode, format_bran, keystore_exists, open_hby
@@ -162,6 +163,8 @@ class AgentConnection(ft.AlertDialog):
             can_reveal_password=True,
             text_style=ft.TextStyle(font_family='monospace'),
         )
+        self.migration_bar = ft.ProgressBar(value=0, visible=False)
+        self.migration_text = ft.Text(value='', visible=False)
         self.title = ft.Text(f'Open {self.username}')
         column = ft.Column(
             [
@@ -198,8 +201,18 @@ class AgentConnection(ft.AlertDialog):
         name = self.username
         base = self.app.base
         bran = format_bran(self.passcode.value)
+        for action in self.actions:
+            action.disabled = True
+        self.migration_bar.visible = True
+        self.migration_text.visible = True
+        self.update()
         try:
-            await migrating.migrate_keystore(name=name, base=base, bran=bran)
+            await migrating.migrate_keystore(
+                name=name,
+                base=base,
+                bran=bran,
+                subscriber=lambda progress: self.page.run_task(self.show_migration_progress, progress),
+            )
         except Exception as ex:
             logger.exception(ex)
             self.app.snack(f'Database migration failed for {name}. Error: {str(ex)}')
@@ -210,6 +223,15 @@ class AgentConnection(ft.AlertDialog):
         self.page.close(self)
         self.app.snack(f'Connected to {name}')
 
+    async def show_migration_progress(self, progress):
+        """Run on the event loop after every chunk of the keystore migrated on the migration thread"""
+        total = progress['total']
+        self.migration_bar.value = progress['done'] / total if total else 1.0
+        eta = f', about {progress["eta"]:.0f}s left' if progress['eta'] is not None else ''
+        resumed = 'Resumed, ' if progress['resumed'] else ''
+        self.migration_text.value = f'{resumed}{progress["done"]} of {total} records migrated{eta}'
+        self.update()
+
     async def close_connect(self, _):
         """
         Closes the connection and updates the page asynchronously.
@@ -295,12 +317,16 @@ class AgentConnection(ft.AlertDialog):
             await self.agent_connect(name, base, bran)
             self.page.close(self)
             self.app.snack(f'Connected to {name}')
-        except kering.DatabaseError:
+        except (kering.DatabaseError, walleting.OldKeystoreError):
             logger.error('Old keystore detected, migration needed')
             self.app.snack(f'Keystore migration needed for {name}. Migrating...')
             # Then connect if a migration is not needed
             self.title = ft.Text(f'Migrate {name}')
-            self.content = ft.Text('Datastore migration needed.')
+            self.content = ft.Column(
+                [ft.Text('Datastore migration needed.'), self.migration_bar, self.migration_text],
+                height=100,
+                width=300,
+            )
             self.actions = [
                 ft.ElevatedButton(
                     'Confirm',
@@ -7,7 +7,6 @@ from pathlib import Path
 import flet as ft
 from flet.core.icons import Icons
 from flet.core.page import Page
-from hio.help import decking
 from keri.app import connecting
 from keri.app.keeping import Algos
 from keri.core import coring
@@ -52,9 +51,6 @@ class WalletApp(ft.Stack):
         self.agent_shutdown_event = asyncio.Event()  # Will be set by the AgentDrawer
         self.wit_pools = self.load_witness_pools(config)
 
-        # AgentEvents
-        self.agent_events = decking.Deck()
-
         self.base = ''
         self.temp = False
         self.tier = Tiers.low
@@ -212,6 +208,12 @@ class WalletApp(ft.Stack):
             self.page.update()
 
     async def refreshContacts(self):
+        contacts = await self.agent.bridge.run(self.load_contacts)
+        await self.layout.contacts.set_contacts(contacts)
+        self.layout.contacts.update()
+
+    def load_contacts(self):
+        """Reads contacts with their challenges and well knowns, run on the agent thread"""
         org = connecting.Organizer(hby=self.agent.hby)
         contacts = []
         for c in org.list():
@@ -236,8 +238,7 @@ class WalletApp(ft.Stack):
 
             contacts.append(c)
 
-        await self.layout.contacts.set_contacts(contacts)
-        self.layout.contacts.update()
+        return contacts
 
     def reload(self):
         if self.agent is not None:
@@ -292,7 +292,7 @@ class ViewContactPanel(ContactBase):
 
                 if self.phrase.value == ' '.join(exn.ked['a']['words']):
                     found = True
-                    self.app.hby.db.chas.add(keys=(sig,), val=saider)
+                    await self.app.agent.bridge.run(self.app.hby.db.chas.add, keys=(sig,), val=saider)
                     break
 
             if found:
@@ -344,10 +344,18 @@ class ViewContactPanel(ContactBase):
 
         senderHab = hab.mhab if isinstance(hab, GroupHab) else hab
 
-        self.app.agent.postman.send(src=senderHab.pre, dest=self.contact['id'], topic='challenge', serder=exn, attachment=ims)
+        self.app.agent.bridge.call(
+            self.app.agent.postman.send,
+            src=senderHab.pre,
+            dest=self.contact['id'],
+            topic='challenge',
+            serder=exn,
+            attachment=ims,
+        )
 
-        while not self.app.agent.postman.cues:
-            await asyncio.sleep(1.0)
+        await self.app.agent.operations.watch(
+            lambda: self.app.agent.postman.sent(said=exn.said), name=f'challenge response to {self.contact["id"]}'
+        )
 
         self.verify_challenge_text.value = ''
         self.app.page.update()
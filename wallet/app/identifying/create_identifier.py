@@ -12,6 +12,7 @@ from keri.app import connecting
 from keri.core import coring, signing
 
 from wallet.app.identifying.identifier import IdentifierBase
+from wallet.app.identifying.import_identifiers import ImportIdentifiersDialog
 from wallet.core.configing import Environments
 from wallet.logs import log_errors
 
@@ -432,21 +433,21 @@ class CreateIdentifierPanel(IdentifierBase):
             kwargs['delpre'] = self.delegatorDropdown.value
 
         if self.keyType == 'group':
-            hab = self.app.hby.makeGroupHab(name=self.alias.value, **kwargs)
+            hab = await self.app.agent.bridge.run(self.app.hby.makeGroupHab, name=self.alias.value, **kwargs)
             serder, _, _ = hab.getOwnEvent(allowPartiallySigned=True)
 
-            self.app.agent.groups.push(dict(serder=serder))
+            self.app.agent.bridge.push(self.app.agent.groups, dict(serder=serder))
             self.app.snack(f'Creating {hab.pre}, waiting for multisig collaboration...')
         else:
-            hab = self.app.hby.makeHab(name=self.alias.value, **kwargs)
+            hab = await self.app.agent.bridge.run(self.app.hby.makeHab, name=self.alias.value, **kwargs)
             serder, _, _ = hab.getOwnEvent(sn=0)
 
             if delpre:
-                self.app.agent.anchors.push(dict(sn=0))
+                self.app.agent.bridge.push(self.app.agent.anchors, dict(sn=0))
                 self.app.snack(f'Creating {hab.pre}, waiting for delegation approval...')
 
             elif len(kwargs['wits']) > 0:
-                self.app.agent.witners.push(dict(serder=serder))
+                self.app.agent.bridge.push(self.app.agent.witners, dict(serder=serder))
                 self.app.snack(f'Creating {hab.pre}, waiting for witness receipts...')
 
             else:
@@ -475,6 +476,11 @@ class CreateIdentifierPanel(IdentifierBase):
     def loadMembers(app):
         return [ft.dropdown.Option(key=idx, text=f'{m["alias"]}') for idx, m in enumerate(app.members)]
 
+    async def importAids(self, _):
+        dialog = ImportIdentifiersDialog(self.app)
+        self.page.dialog = dialog
+        await dialog.open_import()
+
     async def cancel(self, _):
         self.reset()
         self.app.page.route = '/identifiers'
@@ -675,6 +681,10 @@ class CreateIdentifierPanel(IdentifierBase):
                                 'Cancel',
                                 on_click=self.cancel,
                             ),
+                            ft.OutlinedButton(
+                                'Import...',
+                                on_click=self.importAids,
+                            ),
                         ]
                     ),
                 ],
@@ -29,12 +29,29 @@ class Identifiers(IdentifierBase):
         self.page: ft.Page = app.page
         self.list = ft.Column([], spacing=0, expand=True)
         self.kel_update_dialog = None
+        self.rows = dict()  # AID to the Container holding its tile
 
         super().__init__(app, ft.Container(content=self.list, padding=ft.padding.only(bottom=125)))
 
     def did_mount(self):
+        self.app.agent.aid_updates.subscribe(self.on_aid_update)
         self.page.run_task(self.refresh_identifiers)
 
+    def will_unmount(self):
+        self.app.agent.aid_updates.unsubscribe(self.on_aid_update)
+
+    def on_aid_update(self, aid):
+        """Called on the agent thread when the KEL updates for aid change"""
+        if aid in self.rows:
+            self.page.run_task(self.refresh_identifier, aid)
+
+    async def refresh_identifier(self, aid):
+        """Re-renders only the row of aid"""
+        if (row := self.rows.get(aid)) is None or (hab := self.app.agent.hby.habByPre(aid)) is None:
+            return
+        row.content = self.tile(hab)
+        row.update()
+
     @staticmethod
     def get_habs(agent):
         """Get the Hab instances an agent has."""
@@ -68,10 +85,8 @@ class Identifiers(IdentifierBase):
         self.app.page.update()
 
     def check_aid_updates(self, pre):
-        for update in self.app.agent.aid_updates:
-            if update.aid == pre:
-                return True, update
-        return False, None
+        update = self.app.agent.aid_updates.first(pre)
+        return update is not None, update
 
     @log_errors
     async def kel_update(self, e):
@@ -109,80 +124,79 @@ class Identifiers(IdentifierBase):
                 )
             )
         else:
+            self.rows = dict()
             for hab in habs:
-                needs_update, aid_update = self.check_aid_updates(hab.pre)
-                tip = 'Identifier'
-
-                if isinstance(hab, habbing.GroupHab):
-                    icon = Icons.DATASET_LINKED_OUTLINED
-                elif isinstance(hab, habbing.Hab):  # GroupHab does not have .algo prop
-                    icon = Icons.LINK_OUTLINED
-                else:
-                    logger.error('Unknown hab type: %s', type(hab))
-                    raise ValueError(f'Unknown hab type: {type(hab)}')
-
-                # Bug in FLET that doesn't set `data` in constructor
-                view = ft.PopupMenuItem(text='View', icon=ft.Icons.PAGEVIEW, on_click=self.view_identifier)
-                view.data = hab
-                rotate = ft.PopupMenuItem(
-                    text='Rotate',
-                    icon=ft.Icons.ROTATE_RIGHT,
-                    on_click=self.rotate_identifier,
-                )
-                rotate.data = hab
-                delete = ft.PopupMenuItem(
-                    text='Delete',
-                    icon=ft.Icons.DELETE_FOREVER,
-                    on_click=self.delete_identifier,
-                )
-                delete.data = hab
-
-                title_row = ft.Row(
-                    [
-                        ft.Text(
-                            hab.pre,
-                            font_family='monospace',
-                        ),
-                    ]
-                )
-                if needs_update:
-                    title_row.controls.append(ft.Icon(ft.Icons.WARNING_AMBER_ROUNDED, tooltip='AID needs to be caught up.'))
-                    # self.kel_update_dialog = KELUpdateConfirmDialog(self.app, self.app.page, hab, aid_update)
-                    title_row.controls.append(
-                        ft.OutlinedButton(text='Update Log', data=(hab, aid_update), on_click=self.kel_update)
-                    )
-                tile = ft.ListTile(
-                    leading=ft.Icon(
-                        icon,
-                        tooltip=tip,
-                    ),
-                    title=ft.Text(
-                        value=hab.name,
-                        color=colouring.Colouring.get(colouring.Colouring.ON_SURFACE),
-                    ),
-                    subtitle=title_row,
-                    trailing=ft.PopupMenuButton(
-                        tooltip=None,
-                        icon=ft.Icons.MORE_VERT,
-                        items=[
-                            view,
-                            rotate,
-                            delete,
-                        ],
-                    ),
-                    on_click=self.view_identifier,
-                    data=hab,
-                    shape=ft.StadiumBorder(),
-                )
-                self.list.controls.append(
-                    ft.Container(
-                        content=tile,
-                    )
-                )
+                self.rows[hab.pre] = ft.Container(content=self.tile(hab))
+                self.list.controls.append(self.rows[hab.pre])
                 self.list.controls.append(ft.Divider(opacity=0.1))
 
         self.update()
 
+    def tile(self, hab):
+        """Returns the list tile for hab, flagging it when its KEL needs to be caught up"""
+        needs_update, aid_update = self.check_aid_updates(hab.pre)
+        tip = 'Identifier'
+
+        if isinstance(hab, habbing.GroupHab):
+            icon = Icons.DATASET_LINKED_OUTLINED
+        elif isinstance(hab, habbing.Hab):  # GroupHab does not have .algo prop
+            icon = Icons.LINK_OUTLINED
+        else:
+            logger.error('Unknown hab type: %s', type(hab))
+            raise ValueError(f'Unknown hab type: {type(hab)}')
+
+        # Bug in FLET that doesn't set `data` in constructor
+        view = ft.PopupMenuItem(text='View', icon=ft.Icons.PAGEVIEW, on_click=self.view_identifier)
+        view.data = hab
+        rotate = ft.PopupMenuItem(
+            text='Rotate',
+            icon=ft.Icons.ROTATE_RIGHT,
+            on_click=self.rotate_identifier,
+        )
+        rotate.data = hab
+        delete = ft.PopupMenuItem(
+            text='Delete',
+            icon=ft.Icons.DELETE_FOREVER,
+            on_click=self.delete_identifier,
+        )
+        delete.data = hab
+
+        title_row = ft.Row(
+            [
+                ft.Text(
+                    hab.pre,
+                    font_family='monospace',
+                ),
+            ]
+        )
+        if needs_update:
+            title_row.controls.append(ft.Icon(ft.Icons.WARNING_AMBER_ROUNDED, tooltip='AID needs to be caught up.'))
+            # self.kel_update_dialog = KELUpdateConfirmDialog(self.app, self.app.page, hab, aid_update)
+            title_row.controls.append(ft.OutlinedButton(text='Update Log', data=(hab, aid_update), on_click=self.kel_update))
+        return ft.ListTile(
+            leading=ft.Icon(
+                icon,
+                tooltip=tip,
+            ),
+            title=ft.Text(
+                value=hab.name,
+                color=colouring.Colouring.get(colouring.Colouring.ON_SURFACE),
+            ),
+            subtitle=title_row,
+            trailing=ft.PopupMenuButton(
+                tooltip=None,
+                icon=ft.Icons.MORE_VERT,
+                items=[
+                    view,
+                    rotate,
+                    delete,
+                ],
+            ),
+            on_click=self.view_identifier,
+            data=hab,
+            shape=ft.StadiumBorder(),
+        )
+
     async def view_identifier(self, e):
         """
         View the identifier details.
@@ -222,6 +236,6 @@ class Identifiers(IdentifierBase):
             None
         """
         hab = e.control.data
-        self.app.hby.deleteHab(hab.name)
+        await self.app.agent.bridge.run(self.app.hby.deleteHab, hab.name)
 
         self.card.content.update()  # type: ignore
@@ -0,0 +1,101 @@
+"""
+import_identifiers.py - Dialog for provisioning identifiers in bulk from a spec file
+"""
+
+import logging
+
+import flet as ft
+
+from wallet.logs import log_errors
+from wallet.tasks.provisioning import Provisioner, load_specs
+
+logger = logging.getLogger('wallet')
+
+
+class ImportIdentifiersDialog(ft.AlertDialog):
+    """
+    Presents a dialog to provision the identifiers of a CSV or JSON spec file and shows the
+    provisioning progress until every identifier is created and receipted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.provisioner = None
+        self.path = ft.TextField(
+            label='Spec File',
+            hint_text='Path of a CSV or JSON identifier spec file',
+        )
+        self.progress_bar = ft.ProgressBar(value=0, visible=False)
+        self.progress_text = ft.Text(value='', visible=False)
+        self.error_text = ft.Text(value='', visible=False)
+        self.import_button = ft.ElevatedButton(text='Import', on_click=self.start_import)
+        super(ImportIdentifiersDialog, self).__init__(
+            modal=True,
+            title=ft.Text('Import Identifiers'),
+            content=ft.Column(
+                controls=[ft.Divider(), self.path, self.progress_bar, self.progress_text, self.error_text],
+                height=240,
+                width=400,
+            ),
+            actions=[
+                ft.OutlinedButton(text='Close', on_click=self.close_import),
+                self.import_button,
+            ],
+        )
+
+    async def open_import(self):
+        self.open = True
+        self.app.page.update()
+
+    async def close_import(self, _):
+        """Closes the dialog, provisioning started continues on the agent"""
+        if self.provisioner is not None:
+            self.provisioner.unsubscribe(self.on_progress)
+        self.open = False
+        self.page.update()
+
+    @log_errors
+    async def start_import(self, _):
+        """Loads the spec file and hands its identifiers to a Provisioner on the agent"""
+        self.error_text.visible = False
+        try:
+            specs = load_specs(self.path.value, pools=self.app.wit_pools)
+        except (OSError, ValueError) as ex:
+            self.error_text.value = f'Invalid spec file: {ex}'
+            self.error_text.visible = True
+            self.page.update()
+            return
+
+        agent = self.app.agent
+        self.provisioner = Provisioner(hby=agent.hby, specs=specs, witners=agent.witners, operations=agent.operations)
+        self.provisioner.subscribe(self.on_progress)
+        await agent.bridge.run(agent.extend, [self.provisioner])
+        logger.info(f'Provisioning {len(specs)} identifiers from {self.path.value}')
+
+        self.import_button.disabled = True
+        self.progress_bar.visible = True
+        self.progress_text.visible = True
+        self.progress_text.value = f'Provisioning {len(specs)} identifiers...'
+        self.page.update()
+
+    def on_progress(self, progress):
+        """Called on the agent thread whenever the provisioning progress changes"""
+        self.app.page.run_task(self.show_progress, progress)
+
+    async def show_progress(self, progress):
+        total = progress['total']
+        self.progress_bar.value = progress['finished'] / total if total else 1.0
+        self.progress_text.value = (
+            f'{progress["finished"]} of {total} done, {progress["inflight"]} awaiting receipts, '
+            f'{progress["failed"]} failed ({progress["rate"]:.1f}/s)'
+        )
+        if progress['failures']:
+            self.error_text.value = '\n'.join(f'{alias}: {error}' for alias, error in progress['failures'][-3:])
+            self.error_text.visible = True
+
+        if progress['finished'] == total:
+            self.import_button.disabled = False
+            self.app.snack(f'Provisioned {total - progress["failed"]} of {total} identifiers.')
+            if self.app.layout.active_view == self.app.layout.identifiers:
+                await self.app.layout.identifiers.refresh_identifiers()
+        self.page.update()
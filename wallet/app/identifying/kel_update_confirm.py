@@ -1,12 +1,11 @@
 import asyncio
-import datetime
 import logging
 
 import flet as ft
-from keri.help import helping
 
 from wallet.app.identifying.identifier import IdentifierBase
-from wallet.core.agent_events import AgentEventTypes
+from wallet.core.bridging import AgentStoppedError
+from wallet.core.operating import OperationTimeoutError
 
 logger = logging.getLogger('wallet')
 
@@ -49,23 +48,19 @@ class KELUpdateConfirmDialog(ft.AlertDialog):
     def will_unmount(self):
         print('Unmounting dialog')
 
-    async def finish_confirm(self, event_type, timeout=15):
-        """Event handler for KEL_UPDATE_COMPLETE"""
-        start_time = helping.nowUTC()
-        timeout_delta = datetime.timedelta(seconds=timeout)
-        while True:
-            now = helping.nowUTC()
-            if now > start_time + timeout_delta:
-                logger.info('KEL update timed out')
-                self.app.snack('Update request timed out', duration=3000)
-                await self.close_confirm(None)
-            for event in self.app.agent_events:
-                if event['event_type'] == event_type:
-                    self.app.agent_events.remove(event)
-                    self.app.snack('Update Log complete', duration=3000)
-                    logger.info('KEL update complete')
-                    await self.close_confirm(None)
-            await asyncio.sleep(0.5)
+    async def finish_confirm(self, op):
+        """Waits for the KEL update operation and closes the dialog"""
+        try:
+            duration = await op
+            logger.info(f'KEL update complete in {duration:.1f}s')
+            self.app.snack('Update Log complete', duration=3000)
+        except OperationTimeoutError:
+            logger.info('KEL update timed out')
+            self.app.snack('Update request timed out', duration=3000)
+        except (ValueError, AgentStoppedError) as ex:
+            logger.error(f'KEL update failed: {ex}')
+            self.app.snack(f'Update request failed: {ex}', duration=3000)
+        await self.close_confirm(None)
 
     async def open_confirm(self, hab, aid_update):
         """
@@ -89,7 +84,8 @@ class KELUpdateConfirmDialog(ft.AlertDialog):
         Closes dialog
         """
         self.open = False
-        self.close_task.cancel()
+        if self.close_task is not None and self.close_task is not asyncio.current_task():
+            self.close_task.cancel()
         self.app.page.run_task(self.update_identifier_page)
         self.page.update()
 
@@ -141,9 +137,12 @@ class KELUpdateConfirmDialog(ft.AlertDialog):
         )
         self.app.snack(update_message, duration=3000)
         logger.info(update_message)
-        self.app.agent.update_reqs.push(self.aid_update)
+        op = self.app.agent.operations.expect(
+            ('kel_update', self.aid_update.aid), timeout=120.0, name=f'KEL update {self.aid_update.aid}'
+        )
+        self.app.agent.bridge.push(self.app.agent.update_reqs, self.aid_update)
         self.update_progress_ring.visible = True
-        self.close_task = asyncio.create_task(self.finish_confirm(AgentEventTypes.KEL_UPDATE_COMPLETE.value, timeout=30))
+        self.close_task = asyncio.create_task(self.finish_confirm(op))
 
 
 class KELUpdateConfirmPanel(IdentifierBase):
@@ -226,5 +225,5 @@ class KELUpdateConfirmPanel(IdentifierBase):
             e (flet.ControlEvent): The button control triggering this update
         """
         logger.info(f'Updating AID {self.hab.name} {self.aid_update.aid}')
-        self.app.agent.update_reqs.push(self.aid_update)
+        self.app.agent.bridge.push(self.app.agent.update_reqs, self.aid_update)
         self.app.page.route = '/identifiers'
@@ -421,7 +421,9 @@ class RotateGroupIdentifierPanel(IdentifierBase):
         logger.info(f'Rotating multisig identifier from {self.name}...')
         await self.show_progress_ring()
 
-        self.app.agent.groups.push(dict(serder=serdering.SerderKERI(raw=rot), rot=rot, smids=smids, rmids=rmids))
+        self.app.agent.bridge.push(
+            self.app.agent.groups, dict(serder=serdering.SerderKERI(raw=rot), rot=rot, smids=smids, rmids=rmids)
+        )
         self.app.snack(f'Rotating multisig identifier{self.group_hab.pre}, waiting for multisig collaboration...')
 
     @log_errors
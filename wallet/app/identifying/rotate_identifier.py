@@ -86,7 +86,8 @@ class RotateIdentifierPanel(IdentifierBase):
         ]
 
     async def rotateee(self, _):
-        self.hab.rotate(
+        await self.app.agent.bridge.run(
+            self.hab.rotate,
             isith=self.isith.value,
             nsith=self.nsith.value,
             ncount=int(self.ncount.value),
@@ -94,11 +95,11 @@ class RotateIdentifierPanel(IdentifierBase):
         )
 
         if self.hab.delpre:
-            self.app.agent.anchors.push(dict(sn=self.hab.kever.sner.num))
+            self.app.agent.bridge.push(self.app.agent.anchors, dict(sn=self.hab.kever.sner.num))
             self.app.snack(f'Rotating {self.hab.pre}, waiting for delegation approval...')
 
         elif len(self.hab.kever.wits) > 0:
-            self.app.agent.witners.push(dict(serder=self.hab.kever.serder))
+            self.app.agent.bridge.push(self.app.agent.witners, dict(serder=self.hab.kever.serder))
             self.app.snack(f'Rotating {self.hab.pre}, waiting for witness receipts...')
 
         self.app.page.route = f'/identifiers/{self.hab.pre}/view'
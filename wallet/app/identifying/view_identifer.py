@@ -2,11 +2,9 @@
 view_identifier.py - View Identifier Panel
 """
 
-import asyncio
 import base64
 import io
 import logging
-import random
 from urllib.parse import urljoin, urlparse
 
 import flet as ft
@@ -19,6 +17,8 @@ from keri.db import dbing
 
 from wallet.app.identifying.identifier import IdentifierBase
 from wallet.app.oobing.oobi_resolver_service import OOBIResolverService
+from wallet.core.bridging import AgentStoppedError
+from wallet.core.operating import OperationTimeoutError
 from wallet.logs import log_errors
 
 logger = logging.getLogger('wallet')
@@ -42,6 +42,7 @@ class ViewIdentifierPanel(IdentifierBase):
                 ],
             )
             self.show_key_state_update = True
+            self.app.agent.watch(hab.pre)  # refresh the key state shown for the group
         elif isinstance(hab, habbing.Hab):  # GroupHab does not have .algo prop
             if hab.algo == Algos.salty:
                 self.typePanel = ft.Row(
@@ -102,9 +103,10 @@ class ViewIdentifierPanel(IdentifierBase):
             height=16,
             stroke_width=2,
         )
+        self.receipting_text = ft.Text('Waiting for receipts...')
         self.submit_refresh_row = ft.Row(
             [
-                ft.Text('Waiting for receipts...'),
+                self.receipting_text,
                 self.submit_progress,
             ],
             visible=False,
@@ -145,7 +147,7 @@ class ViewIdentifierPanel(IdentifierBase):
         if len(oobis) == 0:
             return 0
 
-        oobi = random.choice(oobis)
+        oobi = self.app.agent.tracker.choose(oobis)  # witness OOBI of the fastest, healthiest witness
         img = qrcode.make(oobi)
         f = io.BytesIO()
         img.save(f)
@@ -209,19 +211,46 @@ class ViewIdentifierPanel(IdentifierBase):
             await OOBIResolverService(self.app).resolve_oobi(pre=pre, oobi=contact['oobi'], force=True)
             self.app.snack(f"Resolved {contact['alias']}'s key state for AID {pre}")
 
+    def did_mount(self):
+        self.app.agent.witnesser.subscribe(self.on_receipting)
+
+    def will_unmount(self):
+        self.app.agent.witnesser.unsubscribe(self.on_receipting)
+
+    def on_receipting(self, progress):
+        """Called on the agent thread when the receipting progress of an event changes"""
+        if progress['pre'] == self.hab.pre:
+            self.page.run_task(self.show_receipting, progress)
+
+    async def show_receipting(self, progress):
+        """Shows the per witness receipting progress of the latest event"""
+        state = progress['state']
+        if state == 'queued':
+            self.receipting_text.value = 'Waiting to be receipted...'
+        elif state == 'catchup':
+            self.receipting_text.value = f'Catching up new witnesses, {len(progress["caught"])} of {len(progress["adds"])}...'
+        elif state == 'receipting':
+            self.receipting_text.value = f'Receipted by {len(progress["receipted"])} of {len(progress["wits"])} witnesses...'
+        self.submit_refresh_row.visible = state not in ('done', 'failed')
+        self.resubmit_button.visible = state == 'failed'
+        self.page.update()
+
     async def resubmit(self, _):
-        self.app.agent.witness_resubmit(self.hab.pre)
+        op = self.app.agent.operations.expect(
+            ('resubmit', self.hab.pre), timeout=120.0, name=f'witness resubmit {self.hab.pre}'
+        )
+        self.app.agent.bridge.call(self.app.agent.witness_resubmit, self.hab.pre)
         self.app.snack(f'Resubmitting {self.hab.pre} for witness receipts.')
         self.resubmit_button.visible = False
         self.submit_refresh_row.visible = True
         self.page.update()
 
-        updated = False
-        while not updated:
-            updated = len(self.hab.kever.wits) == len(
-                self.hab.db.getWigs(dbing.dgKey(self.hab.kever.serder.preb, self.hab.kever.serder.saidb))
-            )
-            await asyncio.sleep(1)
+        try:
+            await op
+            updated = True
+        except (OperationTimeoutError, AgentStoppedError) as ex:
+            logger.error(f'Witness resubmit for {self.hab.pre} failed: {ex}')
+            updated = False
 
         if updated:
             self.submit_refresh_row.visible = False
@@ -1,10 +1,11 @@
-import asyncio
-import datetime
 import logging
+import time
 
 from keri.db import basing
 from keri.help import helping
 
+from wallet.core.operating import OperationTimeoutError
+from wallet.core.tracking import witness_of
 from wallet.logs import log_errors
 
 logger = logging.getLogger('wallet')
@@ -21,6 +22,7 @@ class OOBIResolverService:
         """
         self.app = app
         self.org = app.agent.org
+        self.bridge = app.agent.bridge
         super().__init__()
 
     @log_errors
@@ -55,21 +57,30 @@ class OOBIResolverService:
             return False
 
         if force:
-            self.app.hby.db.roobi.rem(keys=(oobi,))
+            await self.bridge.run(self.app.hby.db.roobi.rem, keys=(oobi,))
 
-        start_time = helping.nowUTC()
-        timeout_delta = datetime.timedelta(seconds=15)
+        wit = witness_of(oobi)
+        start = time.monotonic()
         try:
-            self.app.hby.db.oobis.put(keys=(oobi,), val=obr)
-            while not self.app.hby.db.roobi.get(keys=(oobi,)):
-                if helping.nowUTC() > start_time + timeout_delta:
-                    logger.info('OOBI resolve timeout')
-                    return False
-                await asyncio.sleep(1)
+            resolved = self.app.agent.operations.watch(
+                lambda: self.app.hby.db.roobi.get(keys=(oobi,)), timeout=15.0, name=f'OOBI resolution {oobi}'
+            )
+            await self.bridge.run(self.app.hby.db.oobis.put, keys=(oobi,), val=obr)
+            await resolved
+        except OperationTimeoutError:
+            logger.info('OOBI resolve timeout')
+            if wit is not None:
+                await self.bridge.run(self.app.agent.tracker.failure, wit, 'OOBI resolution timed out')
+            return False
         except Exception as e:
             logger.error(f'OOBI Resolution failed for alias {alias} and OOBI {oobi}: {e}')
+            if wit is not None:
+                await self.bridge.run(self.app.agent.tracker.failure, wit, f'OOBI resolution failed: {e}')
             return False
 
+        if wit is not None:
+            await self.bridge.run(self.app.agent.tracker.success, wit, time.monotonic() - start)
+
         if not pre:  # prefix will not be provided if alias is used, so after resolution look up prefix from contacts
             cts = self.org.find('alias', alias)
             if len(cts) > 1:
@@ -77,6 +88,6 @@ class OOBIResolverService:
                 return False
             pre = cts[0]['id']
         contact['last-refresh'] = helping.nowIso8601()
-        self.org.update(pre, contact)
+        await self.bridge.run(self.org.update, pre, contact)
         logger.info(f'OOBI resolved: {alias} {oobi}')
         return True
@@ -24,7 +24,7 @@ class AddWitness(WitnessBase):
 
         roobi = self.app.hby.db.roobi.get(keys=(result,))
         org = connecting.Organizer(hby=self.app.agent.hby)
-        org.update(roobi.cid, {'type': 'witness'})
+        await self.app.agent.bridge.run(org.update, roobi.cid, {'type': 'witness'})
 
         self.app.page.route = '/witnesses'
         self.app.page.update()
@@ -10,6 +10,7 @@ from flet.core import padding
 from keri.app import connecting
 
 from wallet.app.witnessing.witness import WitnessBase
+from wallet.core.tracking import RTT_BOUNDS
 
 logger = logging.getLogger('wallet')
 
@@ -116,6 +117,8 @@ class ViewWitness(WitnessBase):
                         )
                     ),
                     ft.Divider(),
+                    self.health(),
+                    ft.Divider(),
                     ft.Text('Witness for:', size=14),
                     ft.Divider(),
                     ft.Row(
@@ -134,6 +137,30 @@ class ViewWitness(WitnessBase):
             padding=padding.only(left=10, top=15, bottom=100),
         )
 
+    def health(self):
+        """Returns the round trip times, success rate and last error recorded for the witness"""
+        record = self.app.agent.tracker.get(self.pre)
+
+        def seconds(value):
+            if value is None:
+                return '-'
+            return f'> {RTT_BOUNDS[-1]:g} s' if value == float('inf') else f'≤ {value * 1000:g} ms'
+
+        rate = f'{record.rate:.0%}' if record.rate is not None else '-'
+        rows = [
+            ('Success rate:', f'{rate} of {record.successes + record.failures} interactions'),
+            ('Median RTT:', seconds(record.percentile(50))),
+            ('p95 RTT:', seconds(record.percentile(95))),
+            ('Last success:', record.last_success or '-'),
+            ('Last error:', f'{record.last_error} ({record.last_failure})' if record.last_error else '-'),
+        ]
+        if self.app.agent.tracker.dead(self.pre):
+            rows.append(('Status:', f'Down, {record.streak} failures in a row'))
+
+        return ft.Column(
+            [ft.Row([ft.Text(label, weight=ft.FontWeight.BOLD, size=14), ft.Text(value, size=14)]) for label, value in rows]
+        )
+
     async def close(self, e):
         self.cancelled = True
         self.app.page.route = '/witnesses'
@@ -1,5 +0,0 @@
-from enum import Enum
-
-
-class AgentEventTypes(Enum):
-    KEL_UPDATE_COMPLETE = 'kel_update_complete'
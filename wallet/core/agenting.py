@@ -4,6 +4,10 @@ Agenting module for the Wallet application
 
 import asyncio
 import logging
+import threading
+import time
+from collections import deque
+from concurrent import futures
 
 import flet as ft
 from hio.base import doing, tyming
@@ -19,18 +23,35 @@ from keri.app import (
     indirecting,
     notifying,
     oobiing,
-    querying,
     signaling,
     storing,
 )
-from keri.core import coring, eventing, routing
+from keri.core import coring, routing
+from keri.core.indexing import Siger
+from keri.db import dbing
 from keri.peer import exchanging
 from keri.vc import protocoling
 from keri.vdr import credentialing, verifying
 from keri.vdr.eventing import Tevery
 
-from wallet.core.grouping import GroupRequester
-from wallet.core.syncing import KELStateReader, KELStateUpdater
+from wallet.core.bridging import AgentBridge
+from wallet.core.caching import LRUCache
+from wallet.core.configing import ExecutionModes, SchedulerModes
+from wallet.core.grouping import GroupRequester, MultisigCounselor
+from wallet.core.operating import Operation, Operations, OperationTimeoutError
+from wallet.core.pooling import ConnectionPool
+from wallet.core.profiling import DoerProfiler
+from wallet.core.querying import Querier, query_key
+from wallet.core.scheduling import IdleBackoff, IdleStats, WakeDeck, Waker, inflight
+from wallet.core.syncing import (
+    KELStateReader,
+    KELStateUpdater,
+    UpdateRegistry,
+    WatchSchedule,
+    WitnessKevery,
+    WitnessStates,
+)
+from wallet.core.tracking import WitnessTracker
 from wallet.logs import log_errors
 
 logger = logging.getLogger('wallet')
@@ -47,34 +68,47 @@ class Agent(doing.DoDoer):
         self.rgy = rgy
 
         self.swain = delegating.Anchorer(hby=hby)
-        self.counselor = grouping.Counselor(hby=hby, swain=self.swain)
         self.org = connecting.Organizer(hby=hby)
 
         oobiery = oobiing.Oobiery(hby=hby)
 
-        self.cues = decking.Deck()
-        self.groups = decking.Deck()
-        self.anchors = decking.Deck()
-        self.witners = decking.Deck()
-        self.queries = decking.Deck()
-        self.exchanges = decking.Deck()
+        self.waker = Waker()  # wakes up an idle HioTask when work is pushed onto any deck
+        self.profiler = None  # DoerProfiler when profiling is enabled, see runController
+        self.bridge = AgentBridge(waker=self.waker)  # UI commands run on the agent thread through the bridge
+        self.operations = Operations()  # awaitable operations completed by the agent
+        self.counselor = MultisigCounselor(hby=hby, operations=self.operations, swain=self.swain)
+        self.tracker = WitnessTracker(db=hby.db)  # witness round trip times, success rates and errors
+        self.pool = ConnectionPool(tracker=self.tracker, install=True)  # keep-alive HTTP connections to witnesses
+        self.cues = WakeDeck(waker=self.waker)
+        self.groups = WakeDeck(waker=self.waker)
+        self.anchors = WakeDeck(waker=self.waker)
+        self.witners = WakeDeck(waker=self.waker)
+        self.queries = WakeDeck(waker=self.waker)
+        self.exchanges = WakeDeck(waker=self.waker)
         self.joining = {}
 
-        self.aid_updates = decking.Deck()  # For catching multisig group AIDs up to latest KEL state
-        self.wit_updates = decking.Deck()  # For catching witnesses up to latest KEL state
-        self.dup_evts = decking.Deck()  # For showing detected duplicity
-        self.watch_reqs = decking.Deck()  # for requesting the KEL reader to watch all prefixes
-        self.update_reqs = decking.Deck()  # for requesting the KEL updater perform an update
-
-        receiptor = agenting.Receiptor(hby=hby)
-        self.postman = forwarding.Poster(hby=hby)
-        self.witPub = agenting.WitnessPublisher(hby=self.hby)
-        self.witDoer = agenting.WitnessReceiptor(hby=self.hby)
-        self.submitDoer = agenting.WitnessReceiptor(hby=self.hby, force=True, tock=5.0)
+        self.aid_updates = UpdateRegistry()  # For catching multisig group AIDs up to latest KEL state
+        self.wit_updates = UpdateRegistry()  # For catching witnesses up to latest KEL state
+        self.dup_evts = UpdateRegistry()  # For showing detected duplicity
+        self.watch_reqs = WakeDeck(waker=self.waker)  # for requesting the KEL reader to watch all prefixes
+        self.watched = WakeDeck(waker=self.waker)  # KEL reader results for rescheduling watched AIDs
+        self.watch_triggers = WakeDeck(waker=self.waker)  # for checking an AID, or all, immediately
+        self.update_reqs = WakeDeck(waker=self.waker)  # for requesting the KEL updater perform an update
+
+        receiptor = CaughtUpReceiptor(hby=hby)
+        self.postman = forwarding.Poster(hby=hby, evts=WakeDeck(waker=self.waker))
+        self.witPub = agenting.WitnessPublisher(hby=self.hby, msgs=WakeDeck(waker=self.waker))
+        self.witDoer = agenting.WitnessReceiptor(hby=self.hby, msgs=WakeDeck(waker=self.waker))
+        self.submitDoer = agenting.WitnessReceiptor(hby=self.hby, msgs=WakeDeck(waker=self.waker), force=True, tock=5.0)
+        self.operations.listen(self.submitDoer.cues, keyer=lambda cue: ('resubmit', cue['pre']))
 
         self.rep = storing.Respondant(hby=hby, cues=self.cues, mbx=storing.Mailboxer(name=self.hby.name, temp=self.hby.temp))
 
         doers = [
+            self.bridge,
+            self.operations,
+            self.tracker,
+            self.pool,
             habbing.HaberyDoer(habery=hby),
             receiptor,
             self.postman,
@@ -87,7 +121,7 @@ class Agent(doing.DoDoer):
             *oobiery.doers,
         ]
 
-        signaler = signaling.Signaler()
+        signaler = NoticeSignaler(feed=WakeDeck(waker=self.waker))
         self.notifier = notifying.Notifier(hby=hby, signaler=signaler)
         self.mux = grouping.Multiplexor(hby=hby, notifier=self.notifier)
 
@@ -101,13 +135,14 @@ class Agent(doing.DoDoer):
         challengeHandler = challenging.ChallengeHandler(db=hby.db, signaler=signaler)
 
         handlers = [challengeHandler]
-        self.exc = exchanging.Exchanger(hby=hby, handlers=handlers)
+        self.exc = exchanging.Exchanger(hby=hby, handlers=handlers, cues=WakeDeck(waker=self.waker))
 
         grouping.loadHandlers(exc=self.exc, mux=self.mux)
         protocoling.loadHandlers(hby=self.hby, exc=self.exc, notifier=self.notifier)
 
         self.rvy = routing.Revery(db=hby.db, cues=self.cues)
-        self.kvy = eventing.Kevery(db=hby.db, lax=True, local=False, rvy=self.rvy, cues=self.cues)
+        self.witstates = WitnessStates()  # key state notices received from witnesses
+        self.kvy = WitnessKevery(witstates=self.witstates, db=hby.db, lax=True, local=False, rvy=self.rvy, cues=self.cues)
         self.kvy.registerReplyRoutes(router=self.rvy.rtr)
 
         self.tvy = Tevery(reger=self.verifier.reger, db=hby.db, local=False, cues=self.cues)
@@ -123,8 +158,8 @@ class Agent(doing.DoDoer):
             verifier=self.verifier,
         )
 
-        self.cloner = ExchangeCloner(hby=hby)
-        self.noter = Noter(app=app, hby=hby, notifier=self.notifier, tock=3.0)
+        self.cloner = ExchangeCloner(hby=hby, notes=WakeDeck(waker=self.waker))
+        self.noter = Noter(app=app, hby=hby, notifier=self.notifier, feed=signaler.feed, triggers=self.watch_triggers)
         self.kelStateReader = KELStateReader(
             app=app,
             hby=hby,
@@ -132,79 +167,402 @@ class Agent(doing.DoDoer):
             aid_updates=self.aid_updates,
             wit_updates=self.wit_updates,
             dup_evts=self.dup_evts,
+            witstates=self.witstates,
+            watched=self.watched,
+            tracker=self.tracker,
+        )
+
+        self.kelStateUpdater = KELStateUpdater(
+            app=app,
+            hby=hby,
+            update_reqs=self.update_reqs,
+            witstates=self.witstates,
+            operations=self.operations,
+            tracker=self.tracker,
+        )
+        self.witnesser = Witnesser(
+            app=app, receiptor=receiptor, witners=self.witners, operations=self.operations, tracker=self.tracker
         )
 
-        self.kelStateUpdater = KELStateUpdater(app=app, hby=hby, update_reqs=self.update_reqs)
+        # Decks checked for queued work when deciding if the Agent is idle
+        self.work_decks = [
+            self.cues,
+            self.groups,
+            self.anchors,
+            self.witners,
+            self.queries,
+            self.exchanges,
+            self.exc.cues,
+            self.watch_reqs,
+            self.watched,
+            self.watch_triggers,
+            self.update_reqs,
+            self.cloner.notes,
+            self.noter.feed,
+            self.postman.evts,
+            self.witPub.msgs,
+            self.witDoer.msgs,
+            self.submitDoer.msgs,
+        ]
         doers.extend(
             [
                 self.mbx,
-                Querier(hby=hby, kvy=self.kvy, queries=self.queries),
-                Witnesser(app=app, receiptor=receiptor, witners=self.witners),
+                Querier(hby=hby, kvy=self.kvy, queries=self.queries, operations=self.operations),
+                self.witnesser,
                 Delegator(hby=self.hby, swain=self.swain, anchors=self.anchors),
-                ExchangeSender(hby=hby, exc=self.exc, postman=self.postman, exchanges=self.exchanges),
-                GroupRequester(app=app, hby=hby, counselor=self.counselor, groups=self.groups, postman=self.postman),
+                ExchangeSender(
+                    hby=hby, exc=self.exc, postman=self.postman, exchanges=self.exchanges, operations=self.operations
+                ),
+                GroupRequester(
+                    app=app,
+                    hby=hby,
+                    counselor=self.counselor,
+                    groups=self.groups,
+                    postman=self.postman,
+                    operations=self.operations,
+                ),
                 self.cloner,
                 self.noter,
+                signaler,
                 self.kelStateReader,
                 self.kelStateUpdater,
-                KELWatchScheduler(self.watch_reqs),
+                KELWatchScheduler(hby=hby, watch_reqs=self.watch_reqs, watched=self.watched, triggers=self.watch_triggers),
             ]
         )
-        self.watch_reqs.append(dict())
 
         super(Agent, self).__init__(doers=doers, always=True)
 
+    @property
+    def idle(self):
+        """True when no deck has queued work and no running doer reports work in progress, such as network I/O"""
+        if any(self.work_decks):
+            return False
+
+        return not any(inflight(doer) for _, _, doer in self.deeds)
+
     def witness_resubmit(self, pre):
+        """Resubmits the latest event of pre to its witnesses, the ('resubmit', pre) operation completes when done"""
         self.submitDoer.msgs.append(dict(pre=pre))
 
+    def watch(self, aid=None):
+        """Checks the KEL state of aid, or of every watched AID, against its witnesses as soon as possible"""
+        self.bridge.push(self.watch_triggers, dict(aid=aid) if aid is not None else dict())
+
+    def query(self, msg, timeout=None):
+        """Queues a key state query request, see make_query, and returns the Operation completed when it finishes"""
+        op = self.operations.expect(('query', *query_key(msg)), timeout=timeout)
+        self.queries.append(msg)
+        return op
+
 
 class KELWatchScheduler(doing.Doer):
-    """Schedules a KEL watch request every self.tock seconds, defaults to 5"""
+    """
+    Schedules KEL watch requests for each watched AID on its own WatchSchedule interval, starting at
+    7.5 seconds and backing off while the AID stays in sync with its witnesses.
+
+    Triggers, dict(aid=pre) or dict() for every AID, make AIDs due immediately, for example when a
+    multisig notification arrives or the user opens an identifier.
+    """
 
-    def __init__(self, watch_reqs, tock=7.5, **kwa):
+    def __init__(self, hby, watch_reqs, watched, triggers, schedule=None, tock=1.0, **kwa):
+        self.hby = hby
         self.watch_reqs = watch_reqs
-        self.tock = tock
-        super(KELWatchScheduler, self).__init__(tock=self.tock, **kwa)
+        self.watched = watched
+        self.triggers = triggers
+        self.schedule = schedule if schedule is not None else WatchSchedule()
+        super(KELWatchScheduler, self).__init__(tock=tock, **kwa)
+
+    @property
+    def idle(self):
+        return not self.triggers and not self.watched
 
     def recur(self, tyme):
-        self.watch_reqs.append(dict())  # Schedule a watch request
+        self.schedule.track(self.aids(), tyme)
+
+        while self.watched:
+            res = self.watched.popleft()
+            self.schedule.checked(res['aid'], in_sync=res['in_sync'], tyme=tyme)
+
+        while self.triggers:
+            self.schedule.trigger(tyme, aid=self.triggers.popleft().get('aid'))
+
+        if aids := self.schedule.due(tyme):
+            self.watch_reqs.append(dict(aids=aids))  # Schedule a watch request
 
+        return False
+
+    def aids(self):
+        """Returns the AIDs to watch, group AIDs with witnesses"""
+        return [hab.pre for hab in self.hby.habs.values() if isinstance(hab, habbing.GroupHab) and hab.kever.wits]
 
-class Witnesser(doing.Doer):
-    def __init__(self, app, receiptor, witners):
+
+class CaughtUpReceiptor(agenting.Receiptor):
+    """
+    keri Receiptor whose receipt skips catching up the witnesses added by a rotation when the caller
+    already caught them up, as the Witnesser does for all of them in parallel. keri catches them up
+    one after another.
+    """
+
+    def __init__(self, hby, **kwa):
+        self.caught = set()  # (pre, wit) of the added witnesses already caught up to the KEL of pre
+        super(CaughtUpReceiptor, self).__init__(hby=hby, **kwa)
+
+    def catchup(self, pre, wit):
+        if (pre, wit) in self.caught:
+            return
+        yield from super(CaughtUpReceiptor, self).catchup(pre, wit)
+
+
+class ReceiptJob:
+    """
+    Receipting of one event by the witnesses of its AID.
+
+    Attributes:
+        serder (SerderKERI): event to receipt
+        pre (str): AID of the event
+        sn (int): sequence number of the event
+        wits (list): witnesses of the AID as of the event
+        adds (list): witnesses added by the event that are caught up to the KEL first
+        caught (set): added witnesses caught up so far
+        receipted (set): witnesses whose receipts were received so far
+        state (str): queued, catchup, receipting, done or failed
+        error (Exception): error the job failed with, if any
+        started (float): monotonic time the job started
+        sent (float): monotonic time the event was sent to the witnesses for receipts
+        doer (Doer): running job
+        catchups (list): running catch-up doers of the added witnesses
+    """
+
+    def __init__(self, serder, wits, adds):
+        self.serder = serder
+        self.pre = serder.pre
+        self.sn = serder.sn
+        self.wits = wits
+        self.adds = adds
+        self.caught = set()
+        self.receipted = set()
+        self.state = 'queued'
+        self.error = None
+        self.started = None
+        self.sent = None
+        self.doer = None
+        self.catchups = []
+
+    @property
+    def key(self):
+        return self.pre, self.sn
+
+    def progress(self):
+        """Returns a snapshot of the job for subscribers"""
+        return dict(
+            pre=self.pre,
+            sn=self.sn,
+            state=self.state,
+            wits=list(self.wits),
+            adds=list(self.adds),
+            caught=sorted(self.caught),
+            receipted=sorted(self.receipted),
+            error=str(self.error) if self.error is not None else None,
+        )
+
+
+class Witnesser(doing.DoDoer):
+    """
+    Receipts events pushed to witners with their witnesses, up to .limit events at once and one at a
+    time per AID, in arrival order, so witnesses receive the events of an AID in order. Witnesses
+    newly added by a rotation are all caught up to the KEL in parallel before receipting starts, so
+    the receiptor, a CaughtUpReceiptor, does not catch them up again.
+    Subscribers are called with the progress of each event, per witness, whenever it changes, and
+    the ('receipts', pre, sn) operation completes once the event is receipted. The tracker, if any,
+    records the time each witness took to receipt or catch up, or its failure to.
+    """
+
+    def __init__(self, app, receiptor, witners, operations, tracker=None, limit=8):
         self.app = app
         self.receiptor = receiptor
         self.witners = witners
-        self.cues = decking.Deck()
-        asyncio.create_task(self.processCues())
+        self.operations = operations
+        self.tracker = tracker
+        self.limit = limit
+        self.jobs = dict()  # (pre, sn) to queued or running ReceiptJob
+        self.waiting = deque()  # keys of queued jobs in arrival order
+        self.subscribers = []
+        self.stats = dict(completed=0, failed=0)
 
-        super(Witnesser, self).__init__()
+        super(Witnesser, self).__init__(always=True)
 
-    def recur(self, tyme=None):
-        while True:
-            if self.witners:
-                msg = self.witners.popleft()
-                serder = msg['serder']
+    @property
+    def idle(self):
+        return not self.witners and not self.jobs
 
-                # If we are a rotation event, may need to catch new witnesses up to current key state
-                if serder.ked['t'] in (coring.Ilks.rot, coring.Ilks.drt):
-                    adds = serder.ked['ba']
-                    for wit in adds:
-                        yield from self.receiptor.catchup(serder.pre, wit)
+    @property
+    def running(self):
+        return [job for job in self.jobs.values() if job.doer is not None]
 
-                yield from self.receiptor.receipt(serder.pre, serder.sn)
-                self.cues.push(msg)
+    def recur(self, tyme, deeds=None):
+        while self.witners:
+            self.enqueue(self.witners.popleft()['serder'])
+
+        for job in self.running:
+            if job.state in ('done', 'failed'):
+                self.finish(job)
+            elif job.state == 'receipting':
+                self.observe(job)
+
+        busy = {job.pre for job in self.running}
+        held = []
+        while self.waiting and len(self.running) < self.limit:
+            job = self.jobs[self.waiting.popleft()]
+            if job.pre in busy:
+                held.append(job.key)  # runs once the earlier event of its AID is receipted
+                continue
+            busy.add(job.pre)
+            self.start(job)
+        self.waiting.extendleft(reversed(held))
+
+        return super(Witnesser, self).recur(tyme, deeds)
+
+    def enqueue(self, serder):
+        if (serder.pre, serder.sn) in self.jobs:
+            logger.info(f'Receipting of {serder.pre} event {serder.sn} already queued')
+            return
+
+        adds = serder.ked['ba'] if serder.ked['t'] in (coring.Ilks.rot, coring.Ilks.drt) else []
+        kever = self.receiptor.hby.kevers.get(serder.pre)
+        job = ReceiptJob(serder=serder, wits=list(kever.wits) if kever is not None else [], adds=list(adds))
+        self.jobs[job.key] = job
+        self.waiting.append(job.key)
+        self.notify(job)
+
+    def start(self, job):
+        job.started = time.monotonic()
+        job.doer = doing.doify(self.receiptDo, job=job)
+        self.extend([job.doer])
+
+    def receiptDo(self, tymth=None, tock=0.0, job=None):
+        """Catches up the witnesses added by the event in parallel, then receipts the event"""
+        self.wind(tymth)
+        _ = yield tock
 
-            yield self.tock
+        try:
+            if job.adds:
+                job.state = 'catchup'
+                self.notify(job)
+                job.catchups = [doing.doify(self.catchupDo, job=job, wit=wit) for wit in job.adds]
+                self.extend(job.catchups)
+                while any(doer.done is None for doer in job.catchups):
+                    yield tock
+                self.remove(job.catchups)
+                if job.state == 'failed':
+                    return True
+
+            job.state = 'receipting'
+            job.sent = time.monotonic()
+            self.notify(job)
+            rcts = yield from self.receiptor.receipt(job.pre, job.sn)
+            self.observe(job)
+            self.track(job, rcts or [], 'no receipt')
+            job.state = 'done'
+        except Exception as ex:
+            logger.exception(f'Receipting {job.pre} event {job.sn} failed: {ex}')
+            if job.state == 'receipting':
+                self.track(job, [], ex)
+            job.error = ex
+            job.state = 'failed'
+        finally:
+            self.receiptor.caught -= {(job.pre, wit) for wit in job.adds}
 
-    async def processCues(self):
-        while True:
-            if self.cues:
-                cue = self.cues.popleft()
-                serder = cue['serder']
-                self.app.snack(f'Witness receipts received for {serder.pre}.')
+        return True
+
+    def catchupDo(self, tymth=None, tock=0.0, job=None, wit=None):
+        self.wind(tymth)
+        _ = yield tock
+
+        sent = time.monotonic()
+        try:
+            yield from self.receiptor.catchup(job.pre, wit)
+        except Exception as ex:
+            logger.exception(f'Catching up witness {wit} to {job.pre} failed: {ex}')
+            if self.tracker is not None:
+                self.tracker.failure(wit, ex)
+            job.error = ex
+            job.state = 'failed'
+            return True
+
+        if self.tracker is not None:
+            self.tracker.success(wit, time.monotonic() - sent)
+        self.receiptor.caught.add((job.pre, wit))
+        job.caught.add(wit)
+        self.notify(job)
+        return True
 
-            await asyncio.sleep(1.0)
+    def observe(self, job):
+        """Updates the witnesses whose receipts are stored for the event of job, notifies on change"""
+        wigs = self.receiptor.hby.db.getWigs(dbing.dgKey(job.serder.preb, job.serder.saidb))
+        sigers = [Siger(qb64b=bytes(wig)) for wig in wigs]
+        receipted = {job.wits[siger.index] for siger in sigers if siger.index < len(job.wits)}
+        if receipted != job.receipted:
+            if self.tracker is not None and job.sent is not None:
+                for wit in receipted - job.receipted:
+                    self.tracker.success(wit, time.monotonic() - job.sent)
+            job.receipted = receipted
+            self.notify(job)
+
+    def track(self, job, rcts, error):
+        """
+        Records with the tracker the witnesses of job not seen receipting by observe, a success for
+        those in rcts, the witnesses that returned a receipt, and a failure with error for the others.
+        """
+        if self.tracker is None:
+            return
+        rtt = time.monotonic() - job.sent
+        for wit in job.wits:
+            if wit in job.receipted:
+                continue  # recorded by observe
+            if wit in rcts:
+                self.tracker.success(wit, rtt)
+            else:
+                self.tracker.failure(wit, error)
+
+    def finish(self, job):
+        del self.jobs[job.key]
+        self.remove([job.doer, *job.catchups])
+        duration = time.monotonic() - job.started
+        self.notify(job)
+        if job.state == 'failed':
+            self.stats['failed'] += 1
+            self.operations.fail(('receipts', job.pre, job.sn), job.error)
+            if self.app is not None:
+                self.app.page.run_task(self.show_failed, job.pre, str(job.error))
+            return
+
+        logger.info(f'Receipted {job.pre} event {job.sn} by {len(job.receipted)} witnesses in {duration:.1f}s')
+        self.stats['completed'] += 1
+        self.operations.complete(('receipts', job.pre, job.sn), job.serder)
+        if self.app is not None:  # None when receipting headless, see provisioning.provision
+            self.app.page.run_task(self.show_receipted, job.pre)
+
+    def subscribe(self, fn):
+        """Calls fn(progress) on the agent thread whenever the receipting progress of an event changes"""
+        self.subscribers.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self.subscribers:
+            self.subscribers.remove(fn)
+
+    def notify(self, job):
+        progress = job.progress()
+        for fn in list(self.subscribers):
+            try:
+                fn(progress)
+            except Exception:
+                logger.exception(f'Receipting subscriber failed for {job.pre}')
+
+    async def show_receipted(self, pre):
+        self.app.snack(f'Witness receipts received for {pre}.')
+
+    async def show_failed(self, pre, error):
+        self.app.snack(f'Witness receipting failed for {pre}: {error}')
 
 
 class Delegator(doing.Doer):
@@ -227,66 +585,212 @@ class Delegator(doing.Doer):
         return False
 
 
+class PendingExchange:
+    """
+    An exchange message waiting for the signatures of the other group members before it is sent.
+
+    Attributes:
+        said (str): SAID of the exchange message
+        msg (dict): send request with 'src', 'pre', 'rec' and 'topic'
+        rec (list): recipients, merged across duplicate send requests
+        queued (float): tyme the first send request was received
+        checked (float): tyme completion was last checked
+    """
+
+    def __init__(self, said, msg, tyme):
+        self.said = said
+        self.msg = msg
+        self.rec = list(msg['rec'])
+        self.queued = tyme
+        self.checked = tyme
+
+
 class ExchangeSender(doing.Doer):
-    def __init__(self, hby, postman, exc, exchanges):
+    """
+    Sends exchange messages to their recipients once the Exchanger has saved them fully signed.
+
+    Exchanges waiting for signatures are held in .pending keyed by SAID and only checked again
+    when the Exchanger cues that it saved that SAID, or every .recheck seconds for exchanges saved
+    without a cue. Pending exchanges expire after .expiry seconds. Completes the ('exchange', said)
+    operation when sent and fails it when expired.
+    """
+
+    def __init__(self, hby, postman, exc, exchanges, operations=None, expiry=600.0, recheck=5.0):
         self.hby = hby
         self.postman = postman
         self.exc = exc
         self.exchanges = exchanges
+        self.operations = operations
+        self.expiry = expiry
+        self.recheck = recheck
+        self.pending = dict()  # SAID to PendingExchange
+        self.stats = dict(queued=0, coalesced=0, sent=0, expired=0)
         super(ExchangeSender, self).__init__()
 
+    @property
+    def idle(self):
+        return not self.exchanges and not self.exc.cues
+
+    def metrics(self, tyme=None):
+        """Returns the number of pending exchanges and the oldest and mean of their ages in seconds"""
+        tyme = tyme if tyme is not None else self.tyme
+        ages = [tyme - pending.queued for pending in self.pending.values()]
+        return dict(
+            self.stats,
+            pending=len(ages),
+            oldest=max(ages, default=0.0),
+            mean=sum(ages) / len(ages) if ages else 0.0,
+        )
+
     def recur(self, tyme):
-        if self.exchanges:
+        ready = []
+        while self.exchanges:
             msg = self.exchanges.popleft()
             said = msg['said']
-            if not self.exc.complete(said=said):
-                self.exchanges.append(msg)
-                return False
+            if (pending := self.pending.get(said)) is not None:
+                pending.rec.extend(recp for recp in msg['rec'] if recp not in pending.rec)
+                self.stats['coalesced'] += 1
+                continue
+
+            self.pending[said] = PendingExchange(said=said, msg=msg, tyme=tyme)
+            self.stats['queued'] += 1
+            if self.exc.complete(said=said):
+                ready.append(said)
+
+        while self.exc.cues:
+            cue = self.exc.cues.popleft()
+            if cue['kin'] == 'saved' and cue['said'] in self.pending:
+                ready.append(cue['said'])
+
+        for said, pending in self.pending.items():
+            if said not in ready and tyme - pending.checked >= self.recheck:
+                pending.checked = tyme
+                if self.exc.complete(said=said):
+                    ready.append(said)
+
+        for said in dict.fromkeys(ready):
+            self.send(self.pending.pop(said))
+            self.stats['sent'] += 1
+
+        for said in [said for said, pending in self.pending.items() if tyme - pending.queued > self.expiry]:
+            self.pending.pop(said)
+            self.stats['expired'] += 1
+            logger.info(f'Exchange {said} expired waiting for signatures after {self.expiry}s')
+            if self.operations is not None:
+                self.operations.fail(('exchange', said), OperationTimeoutError(f'Exchange {said} expired'))
+
+        return False
 
-            serder, pathed = exchanging.cloneMessage(self.hby, said)
+    def send(self, pending):
+        """Sends a completed exchange to all of its recipients if this member is the lead"""
+        said = pending.said
+        src = pending.msg['src']
+        pre = pending.msg['pre']
+        topic = pending.msg['topic']
+        serder, _ = exchanging.cloneMessage(self.hby, said)
+        hab = self.hby.habs[pre]
+        if self.exc.lead(hab, said=said):
+            atc = exchanging.serializeMessage(self.hby, said)
+            del atc[: serder.size]
+            for recp in pending.rec:
+                self.postman.send(src=src, dest=recp, topic=topic, serder=serder, attachment=atc)
 
-            src = msg['src']
-            pre = msg['pre']
-            rec = msg['rec']
-            topic = msg['topic']
-            hab = self.hby.habs[pre]
-            if self.exc.lead(hab, said=said):
-                atc = exchanging.serializeMessage(self.hby, said)
-                del atc[: serder.size]
-                for recp in rec:
-                    self.postman.send(src=src, dest=recp, topic=topic, serder=serder, attachment=atc)
+        if self.operations is not None:
+            self.operations.complete(('exchange', said), serder)
 
 
 class ExchangeCloner(doing.Doer):
-    def __init__(self, hby):
+    """
+    Clones exchange messages by SAID for the notification views, caching the cloned messages.
+
+    .clone() may be called from the UI thread. A cached message resolves immediately, otherwise the
+    SAID is queued and cloned on the agent thread.
+    """
+
+    def __init__(self, hby, notes=None, maxsize=128, maxbytes=4 * 1024 * 1024):
         self.hby = hby
-        self.notes = decking.Deck()
-        self.cloned = dict()
+        self.notes = notes if notes is not None else decking.Deck()
+        self.cloned = LRUCache(maxsize=maxsize, maxbytes=maxbytes, sizer=lambda serder: serder.size)
+        self.waiting = dict()  # SAID to Operations waiting on its clone
+        self.lock = threading.Lock()
 
         super().__init__()
 
     def recur(self, tyme):
-        if self.notes:
+        while self.notes:
             said = self.notes.popleft()
-
-            serder, _ = exchanging.cloneMessage(self.hby, said)
-
-            self.cloned[said] = serder
+            with self.lock:
+                ops = self.waiting.pop(said, [])
+
+            try:
+                if said in self.cloned:  # cloned since this SAID was queued
+                    serder = self.cloned[said]
+                else:
+                    serder, _ = exchanging.cloneMessage(self.hby, said)
+                    self.cloned[said] = serder
+            except Exception as ex:
+                logger.error(f'Unable to clone exchange message {said}: {ex}')
+                for op in ops:
+                    op.fail(ex)
+                continue
+
+            for op in ops:
+                op.resolve(serder)
 
         return False
 
     def clone(self, said):
-        self.notes.append(said)
+        """Returns an Operation resolved with the cloned exchange message Serder for said"""
+        op = Operation(name=f'clone {said}')
+        if (serder := self.cloned.get(said)) is not None:
+            op.resolve(serder)
+            return op
+
+        with self.lock:
+            queued = said in self.waiting
+            self.waiting.setdefault(said, []).append(op)
+        if not queued:
+            self.notes.append(said)
+        return op
+
+
+class NoticeSignaler(signaling.Signaler):
+    """
+    Signaler that also keeps every notification change on a feed deck.
+
+    The Notifier pushes /notification signals with a collapse key so only the latest one survives
+    on .signals. The feed keeps each (action, Notice) change in order so the Noter can apply them
+    incrementally instead of reloading every note.
+    """
+
+    def __init__(self, feed=None, **kwa):
+        self.feed = feed if feed is not None else decking.Deck()
+        super(NoticeSignaler, self).__init__(**kwa)
+
+    def push(self, attrs, topic, ckey=None, dt=None):
+        if topic == '/notification':
+            self.feed.append((attrs['action'], notifying.Notice(pad=attrs['note'])))
+        super(NoticeSignaler, self).push(attrs=attrs, topic=topic, ckey=ckey, dt=dt)
 
 
 class Noter(doing.Doer):
-    def __init__(self, app, hby, notifier, **kwa):
+    """
+    Keeps the notification feed and the notifications button in sync with the Notifier.
+
+    All notes are loaded once on enter, after that only the changes pushed to the feed by the
+    NoticeSignaler are applied. .app.notes is replaced with a new list, newest first, on each change
+    and the UI is only updated when the unread state of the notifications changes.
+    """
+
+    def __init__(self, app, hby, notifier, feed, triggers=None, **kwa):
         self.app = app
         self.hby = hby
         self.notifier = notifier
-        self.start = 0
-        self.count = 0
-        self.notes = []
+        self.feed = feed
+        self.triggers = triggers  # KEL watch triggers, pushed on multisig notifications
+        self.notes = dict()  # rid to Notice, in datetime order
+        self.unread = 0
+        self.state = None  # last state shown on the notifications button
 
         super(Noter, self).__init__(**kwa)
 
@@ -306,7 +810,10 @@ class Noter(doing.Doer):
         self.app.page.update()
 
     def enter(self):
-        self.count = self.notifier.getNoteCnt()
+        self.feed.clear()  # changes already included in the full load
+        self.notes = {note.rid: note for note in self.notifier.getNotes(start=0, end=-1)}
+        self.unread = sum(1 for note in self.notes.values() if not note.read)
+        self.publish()
         return super().enter()
 
     def recur(self, tyme):
@@ -316,22 +823,61 @@ class Noter(doing.Doer):
         return False
 
     def update(self):
-        if self.notifier.getNoteCnt() > self.count:
+        """Applies the notification changes pushed since the last update"""
+        if not self.feed:
+            return
+
+        added = 0
+        while self.feed:
+            action, note = self.feed.popleft()
+            prior = self.notes.get(note.rid)
+            if prior is not None and not prior.read:
+                self.unread -= 1
+
+            if action == 'rem':
+                self.notes.pop(note.rid, None)
+                continue
+
+            self.notes[note.rid] = note  # a marked note keeps its place, a new one goes to the end
+            if not note.read:
+                self.unread += 1
+            if prior is None:
+                added += 1
+                if self.triggers is not None and note.attrs.get('r', '').startswith('/multisig'):
+                    self.triggers.append(dict())  # group key state may have changed, check it now
+
+        if added:
             self.app.page.run_task(self.show_new_notifications)
-            self.count = self.notifier.getNoteCnt()
-
-        self.notes = self.notifier.getNotes(start=self.start, end=self.count)
-        self.app.notes = self.notes
-
-        unread_notes = [note for note in self.notes if note.read is False]
-        read_notes = [note for note in self.notes if note.read is True]
+        self.publish()
+
+    def publish(self):
+        """Hands the UI a new list of notes and updates the notifications button if its state changed"""
+        self.app.notes = list(reversed(self.notes.values()))
+
+        state = 'unread' if self.unread else 'read' if self.notes else 'none'
+        if state == self.state:
+            return
+
+        self.state = state
+        match state:
+            case 'unread':
+                self.app.page.run_task(self.show_unread)
+            case 'read':
+                self.app.page.run_task(self.show_read)
+            case _:
+                self.app.page.run_task(self.show_no_notifications)
+
+    def mar(self, rid):
+        """Marks the note read and applies the change immediately, returns True if the note changed"""
+        marked = self.notifier.mar(rid)
+        self.update()
+        return marked
 
-        if unread_notes:
-            self.app.page.run_task(self.show_unread)
-        elif read_notes:
-            self.app.page.run_task(self.show_read)
-        else:
-            self.app.page.run_task(self.show_no_notifications)
+    def rem(self, rid):
+        """Removes the note and applies the change immediately"""
+        removed = self.notifier.rem(rid=rid)
+        self.update()
+        return removed
 
 
 def make_query(local_hab_alias: str, destination_prefix: str) -> dict:
@@ -341,49 +887,37 @@ def make_query(local_hab_alias: str, destination_prefix: str) -> dict:
     return {'src': local_hab_alias, 'pre': destination_prefix}
 
 
-class Querier(doing.DoDoer):
-    def __init__(self, hby, queries, kvy):
-        self.hby = hby
-        self.queries = queries
-        self.kvy = kvy
-
-        super(Querier, self).__init__(always=True)
-
-    def recur(self, tyme, deeds=None):
-        """Processes query requests submitting any on the cue"""
-        if self.queries:
-            msg = self.queries.popleft()
-            src = msg['src']
-            pre = msg['pre']
-            logger.info(f'Querying from {src} for key state from {pre}...')
-
-            hab = self.hby.habByName(src)
-
-            if 'sn' in msg:
-                seqNoDo = querying.SeqNoQuerier(hby=self.hby, hab=hab, pre=pre, sn=msg['sn'])
-                self.extend([seqNoDo])
-            elif 'anchor' in msg:
-                pass
-            else:
-                qryDo = querying.QueryDoer(hby=self.hby, hab=hab, pre=pre, kvy=self.kvy)
-                self.extend([qryDo])
-
-        return super(Querier, self).recur(tyme, deeds)
-
-
-def runController(app, hby, rgy, expire=0.0):
+def runController(
+    app, hby, rgy, expire=0.0, execution=ExecutionModes.SHARED, scheduler=SchedulerModes.FIXED, profile_path=None
+):
     """
     Runs an Agent with a Doist as a HioTask
     Returns an Agent, the task for the running Agent, and the shutdown event for the task
+
+    In THREAD execution mode the Doist runs on a dedicated AgentThread, the returned task is an
+    asyncio future for the thread and the AgentThread itself is the shutdown event. UI code then
+    talks to the Agent through agent.bridge.
+
+    When profile_path is set a DoerProfiler records recur timing for each doer, readable live from
+    agent.profiler.snapshot() and written to profile_path when the HioTask shuts down.
     """
     agent = Agent(app=app, hby=hby, rgy=rgy)
     doers = [agent]
 
     event = asyncio.Event()
 
+    if profile_path is not None:
+        agent.profiler = DoerProfiler(path=profile_path).install()
+
     tock = 0.03125
     doist = doing.Doist(doers=doers, limit=expire, tock=tock, real=True)
-    htask = HioTask(doist=doist, event=event)
+    htask = HioTask(
+        doist=doist, event=event, mode=scheduler, idler=lambda: agent.idle, waker=agent.waker, profiler=agent.profiler
+    )
+
+    if execution == ExecutionModes.THREAD:
+        thread = AgentThread(htask=htask, bridge=agent.bridge)
+        return agent, thread.start(), thread
 
     try:
         agent_task = asyncio.create_task(htask.run())
@@ -397,23 +931,56 @@ def runController(app, hby, rgy, expire=0.0):
 async def run_hio_task(doers, expire=0.0):
     logger.info(f'Running HioTask with {len(doers)} doers')
     doist = doing.Doist(doers=doers, limit=expire, tock=0.03125, real=True)
-    htask = HioTask(doist=doist)
+    htask = HioTask(doist=doist, event=asyncio.Event())
 
     await htask.run()
     logger.info('HioTask complete')
 
 
 class HioTask:
-    def __init__(self, doist, event):
+    def __init__(self, doist, event, mode=SchedulerModes.FIXED, idler=None, waker=None, max_tock=1.0, profiler=None):
         """
         A task that allows scheduling a HIO Doist to run KERIpy Doers as an AsyncIO task.
 
         Parameters:
             doist (doing.Doist): the Doist to run
             event (asyncio.Event): shutdown event signal triggering Doist.exit()
+            mode (SchedulerModes): FIXED runs the Doist every tock, ADAPTIVE backs off while idle
+            idler (Callable[[], bool]): returns True when the doers have no work, used in ADAPTIVE mode
+            waker (Waker): woken up when work arrives to end an idle backoff early, used in ADAPTIVE mode
+            max_tock (float): longest time in seconds to sleep between idle Doist cycles in ADAPTIVE mode
+            profiler (DoerProfiler): installed profiler to log, dump, and uninstall on shutdown
         """
         self.doist = doist
         self.event = event
+        self.mode = mode
+        self.idler = idler
+        self.waker = waker if waker is not None else Waker()
+        self.backoff = IdleBackoff(tock=doist.tock, max_tock=max_tock)
+        self.stats = IdleStats()
+        self.profiler = profiler
+
+    @property
+    def adaptive(self):
+        return self.mode == SchedulerModes.ADAPTIVE and self.idler is not None and self.doist.real
+
+    async def idle_wait(self):
+        """
+        Sleeps while the doers are idle with an exponentially increasing interval until woken up.
+        The Doist tyme is advanced by the time slept so doer tocks stay aligned with real time.
+        """
+        self.stats.idle_cycles += 1
+        start = time.monotonic()
+        woken = await self.waker.wait(self.backoff.next())
+        slept = time.monotonic() - start
+
+        self.stats.slept += slept
+        if woken:
+            self.stats.wakes += 1
+            self.backoff.reset()
+
+        self.doist.tick(slept)  # no tyme lost while sleeping
+        self.doist.timer.start()  # begin a fresh tock interval rather than catching up
 
     @log_errors
     async def run(self, limit=None, tyme=None):
@@ -425,6 +992,10 @@ class HioTask:
         if tyme is not None:  # re-initialize starting tyme
             self.doist.tyme = tyme
 
+        if self.adaptive:
+            self.waker.bind()
+            logger.info('HioTask running in adaptive scheduling mode')
+
         try:  # always clean up resources upon exception
             self.doist.enter()  # runs enter context on each doer
 
@@ -436,12 +1007,19 @@ class HioTask:
                     break
                 try:
                     self.doist.recur()  # increments .tyme runs recur context
+                    self.stats.cycles += 1
 
                     if self.doist.real:  # wait for real time to expire
                         while not self.doist.timer.expired:
                             await asyncio.sleep(max(0.0, self.doist.timer.remaining))
                         self.doist.timer.restart()  # no time lost
 
+                        if self.adaptive:
+                            if self.idler():
+                                await self.idle_wait()
+                            else:
+                                self.backoff.reset()
+
                     if not self.doist.deeds:  # no deeds
                         self.doist.done = True
                         break  # break out of forever loop
@@ -465,11 +1043,88 @@ class HioTask:
             raise ex
         finally:  # finally clause always runs regardless of exception or not.
             self.doist.exit()  # force close remaining deeds throws GeneratorExit
+            if self.adaptive:
+                logger.info(f'HioTask scheduling {self.stats}')
+            if self.profiler is not None:
+                self.profiler.uninstall()
+                self.profiler.log()
+                try:
+                    self.profiler.dump()
+                except OSError as ex:
+                    logger.error(f'Unable to write doer profile: {ex}')
             logger.info('HioTask closed')
 
 
+class AgentThread:
+    """
+    Runs a HioTask on a dedicated thread with its own asyncio event loop so LMDB writes, signing,
+    and event parsing in the Agent's doers do not stall the Flet UI loop.
+
+    Acts as the shutdown event for the HioTask, calling .set() from any thread stops it.
+    """
+
+    def __init__(self, htask, bridge=None, name='agent'):
+        """
+        Parameters:
+            htask (HioTask): the HioTask to run
+            bridge (AgentBridge): bridge to bind to the agent thread so UI commands are queued to it
+            name (str): name of the thread
+        """
+        self.htask = htask
+        self.bridge = bridge
+        self.loop = None
+        self.future = futures.Future()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.main, name=name, daemon=True)
+
+    def main(self):
+        self.future.set_running_or_notify_cancel()  # cannot be cancelled once running
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        if self.bridge is not None:
+            self.bridge.bind()
+        self.ready.set()
+
+        result, error = None, None
+        try:
+            result = self.loop.run_until_complete(self.htask.run())
+        except BaseException as ex:
+            error = ex
+        finally:
+            self.loop.close()
+            logger.info('Agent thread stopped')
+
+        # resolved once the loop is closed, close_agent_task then joins the thread for its last few lines
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+    def start(self):
+        """Starts the agent thread. Returns an asyncio future, awaitable from the calling loop, for its completion."""
+        self.thread.start()
+        self.ready.wait()
+        logger.info(f'Agent running on thread {self.thread.name}')
+        return asyncio.wrap_future(self.future)
+
+    def set(self):
+        """Signals the HioTask to shut down, same interface as the asyncio.Event used in SHARED mode"""
+        if self.loop is not None and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self.htask.event.set)
+            except RuntimeError:  # loop closed in between
+                return
+            self.htask.waker.wake()
+
+    def is_set(self):
+        return self.htask.event.is_set()
+
+
 async def close_agent_task(agent_task, event, timeout=5.0):
-    """Send shutdown signal to event to close agent task with an optional timeout"""
+    """
+    Send shutdown signal to event to close agent task with an optional timeout. When event is an
+    AgentThread its thread is joined too, so the agent has stopped once this returns.
+    """
     if asyncio.isfuture(agent_task):
         event.set()
         try:
@@ -481,5 +1136,9 @@ async def close_agent_task(agent_task, event, timeout=5.0):
             pass
         except Exception as ex:
             logger.error(f'Exception on agent close: {ex}', exc_info=True)
+        if isinstance(event, AgentThread):
+            await asyncio.to_thread(event.thread.join, timeout)
+            if event.thread.is_alive():
+                logger.warning(f'Agent thread {event.thread.name} still running after {timeout} seconds.')
         return True
     return False
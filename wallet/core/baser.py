@@ -1,13 +1,92 @@
 import logging
+from dataclasses import dataclass, field
 
-from keri.db import dbing
-from keri.db.basing import HabitatRecord, KeyStateRecord
+import keri
+from keri.core import coring
+from keri.db import dbing, subing
+from keri.db.basing import MIGRATIONS, HabitatRecord, KeyStateRecord
+from keri.help import helping
 
 from wallet import walleting
 from wallet.core import koming
 
 logger = logging.getLogger('wallet')
 
+STAMP = 'schema'  # key of the SchemaStampRecord in the wmeta. sub database
+CHECKPOINT = 'migration'  # key of the MigrationCheckpointRecord in the wmeta. sub database
+
+
+@dataclass
+class SchemaStampRecord:
+    """
+    Schema stamp of a keystore, keyed by STAMP in the wmeta. sub database.
+
+    Written once a Habery opened the keystore, or a migration completed, with the keri library
+    version in use, so the next unlock with the same version reads one record instead of probing.
+
+    Attributes:
+        keri (str): keri library version the keystore schema was verified or migrated with
+        migrations (list): names of the keri migrations completed when stamped
+        dts (str): ISO-8601 datetime of the stamp
+    """
+
+    keri: str
+    migrations: list = field(default_factory=list)
+    dts: str = ''
+
+
+@dataclass
+class MigrationCheckpointRecord:
+    """
+    Progress of a keystore migration, keyed by CHECKPOINT in the wmeta. sub database.
+
+    Written before the first step, after every chunk of records migrated and removed once the
+    keystore is migrated, so an interrupted migration resumes after the last record of its last chunk.
+
+    Attributes:
+        migration (str): name of the keri migration in progress
+        step (str): name of the step of the migration in progress
+        after (str): key of the last record migrated by the step, empty at the start of the step
+        done (int): number of records migrated so far
+        total (int): number of records to migrate, counted when the keystore migration started
+        started (str): ISO-8601 datetime the keystore migration started
+    """
+
+    migration: str = ''
+    step: str = ''
+    after: str = ''
+    done: int = 0
+    total: int = 0
+    started: str = ''
+
+
+def stamps(db):
+    """Returns the Komer of the wallet metadata sub database (wmeta.) holding the SchemaStampRecord of db"""
+    return koming.Komer(db=db, subkey='wmeta.', schema=SchemaStampRecord)
+
+
+def checkpoints(db):
+    """Returns the Komer of the wallet metadata sub database (wmeta.) holding the MigrationCheckpointRecord of db"""
+    return koming.Komer(db=db, subkey='wmeta.', schema=MigrationCheckpointRecord)
+
+
+def completed(db):
+    """Returns the names of the keri migrations completed in db, a Baser or PartialBaser"""
+    return [name for _, names in MIGRATIONS for name in names if db.migs.get(keys=(name,)) is not None]
+
+
+def stamped(db):
+    """True when db, any LMDBer such as a Baser or PartialBaser, was stamped with the keri library version in use"""
+    record = stamps(db).get(keys=STAMP)
+    return record is not None and record.keri == keri.__version__
+
+
+def stamp(db, migrations=()):
+    """Stamps db, any LMDBer such as a Baser or PartialBaser, as current with the keri library version in use"""
+    record = SchemaStampRecord(keri=keri.__version__, migrations=list(migrations), dts=helping.nowIso8601())
+    stamps(db).pin(keys=STAMP, val=record)
+    return record
+
 
 class PartialBaser(dbing.LMDBer):
     """
@@ -32,6 +111,13 @@ class PartialBaser(dbing.LMDBer):
             to the latest keystate for that prefix. Used by ._kevers.db for read
             through cache of key state to reload kevers in memory
 
+        .migs is named subDB instance of CesrSuber of the completed keri migrations
+            key is migration name
+            value is Dater of the completion
+
+        .stamps is named subDB instance of Komer of the wallet metadata (wmeta.)
+            key is STAMP
+            value is serialized SchemaStampRecord dataclass
 
     """
 
@@ -86,14 +172,63 @@ class PartialBaser(dbing.LMDBer):
         self.nstates = koming.Komer(db=self, subkey='stts.', schema=KeyStateRecord)
         self.states = koming.Komer(db=self, subkey='stts.', schema=dict)
 
+        # completed keri migrations, as in Baser
+        self.migs = subing.CesrSuber(db=self, subkey='migs.', klas=coring.Dater)
+
+        # wallet metadata
+        self.stamps = stamps(self)
+
         return self.env
 
-    def check_migration_state(self):
+    @property
+    def stamped(self):
+        """True when the keystore was stamped with the keri library version in use, one read of .stamps"""
+        return stamped(self)
+
+    @property
+    def current(self):
+        """
+        Mirrors Baser.current from the __version__ key and .migs without opening a Baser
+
+        True when the database version is the library version or when the last keri migration
+        has been run.
+        """
+        if self.getVer() == keri.__version__:
+            return True
+        return self.migs.get(keys=(MIGRATIONS[-1][1][-1],)) is not None
+
+    def needs_migration(self, samples=8):
+        """
+        Returns True when the keystore must be migrated before a Habery can open it
+
+        A stamped keystore is answered from the stamp alone. An unstamped one, or one stamped
+        by another keri library version, is probed from the database version, the completed
+        migrations and a sample of key states. The sample only tells this unlock that no
+        migration is needed, it is not stamped since habs outside it may still be old. It is
+        stamped once a Habery opened it, see stamp.
+
+        Parameters:
+            samples (int): maximum number of habs whose key state is probed
+        """
+        if self.stamped:
+            return False
+        if not self.current:
+            return True
+        try:
+            self.check_migration_state(samples=samples)
+        except walleting.OldKeystoreError:
+            return True
+        return False
+
+    def check_migration_state(self, samples=None):
         """
         Reload stored prefixes and Kevers from .habs
 
+        Parameters:
+            samples (int): maximum number of habs probed, all when None
+
         """
-        for keys, data in self.habs.getItemIter():
+        for keys, data in self.habs.getItemIter(limit=samples):
             # will raise an OldKeystoreError if the keystore is old, as in has a
             # "dict" type instead of a KeyStateRecord type for the stts sub DB.
             try:
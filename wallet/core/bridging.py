@@ -0,0 +1,114 @@
+"""
+Bridging module for the Wallet application
+
+Thread-safe command/response bridge between UI code on the Flet event loop and the Agent, which
+may run its Doist on a dedicated thread. UI code submits commands, callables run against the
+Agent's Habery and Decks, and receives their results as awaitable futures.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from concurrent import futures
+
+from hio.base import doing
+
+logger = logging.getLogger('wallet')
+
+
+class AgentStoppedError(RuntimeError):
+    """Raised for bridge commands still pending when the Agent shuts down"""
+
+
+class AgentBridge(doing.Doer):
+    """
+    Runs commands submitted from any thread on the Agent's thread between Doist cycles.
+
+    Until bound to an agent thread with .bind() the Agent shares the UI loop and commands run
+    immediately in the calling thread, so the bridge is transparent in the default execution mode.
+    """
+
+    def __init__(self, waker=None, **kwa):
+        """
+        Parameters:
+            waker (Waker): woken up when a command is submitted so an idle Agent runs it immediately
+        """
+        self.waker = waker
+        self.commands = queue.SimpleQueue()
+        self.ident = None  # thread identifier of the agent thread when running threaded
+        super(AgentBridge, self).__init__(**kwa)
+
+    @property
+    def threaded(self):
+        return self.ident is not None
+
+    @property
+    def idle(self):
+        return self.commands.empty()
+
+    def bind(self, ident=None):
+        """Binds the bridge to the agent thread, defaults to the calling thread"""
+        self.ident = ident if ident is not None else threading.get_ident()
+
+    def on_agent_thread(self):
+        return self.ident is None or self.ident == threading.get_ident()
+
+    def call(self, fn, *args, **kwa):
+        """
+        Runs fn(*args, **kwa) on the agent thread.
+
+        Returns:
+            futures.Future: resolved with the return value or exception of fn
+        """
+        future = futures.Future()
+        if self.on_agent_thread():
+            self.execute(future, fn, args, kwa)
+        else:
+            self.commands.put((future, fn, args, kwa))
+            if self.waker is not None:
+                self.waker.wake()
+        return future
+
+    async def run(self, fn, *args, **kwa):
+        """Runs fn(*args, **kwa) on the agent thread and awaits its result from the calling event loop"""
+        future = self.call(fn, *args, **kwa)
+        if future.done():
+            return future.result()
+        return await asyncio.wrap_future(future)
+
+    def push(self, deck, msg):
+        """Pushes msg onto an Agent deck from the agent thread, without waiting"""
+        self.call(deck.push, msg)
+
+    @staticmethod
+    def execute(future, fn, args, kwa):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwa))
+        except Exception as ex:
+            logger.exception(f'Agent bridge command {getattr(fn, "__name__", fn)} failed')
+            future.set_exception(ex)
+
+    def recur(self, tyme):
+        """Runs every command submitted since the last cycle"""
+        while True:
+            try:
+                future, fn, args, kwa = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            self.execute(future, fn, args, kwa)
+
+        return False
+
+    def exit(self):
+        """Fails any commands left unprocessed so no caller waits forever on a stopped Agent"""
+        while True:
+            try:
+                future, fn, _, _ = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(AgentStoppedError(f'Agent stopped before running {getattr(fn, "__name__", fn)}'))
+        super(AgentBridge, self).exit()
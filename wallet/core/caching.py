@@ -0,0 +1,117 @@
+"""
+Caching module for the Wallet application
+
+Bounded, thread-safe least recently used cache with hit, miss and eviction counters.
+"""
+
+import threading
+from collections import OrderedDict
+
+_missing = object()
+
+
+class LRUCache:
+    """
+    Least recently used cache bounded by the number of entries and, when a sizer is given, by the
+    total size of its values. Safe to use from the agent thread and the UI thread.
+
+    Attributes:
+        maxsize (int): maximum number of entries
+        maxbytes (int): maximum total size of the values as measured by sizer, None for no limit
+        nbytes (int): current total size of the values
+        hits (int): number of lookups that found their key
+        misses (int): number of lookups that did not
+        evictions (int): number of entries evicted to stay within the bounds
+    """
+
+    def __init__(self, maxsize=256, maxbytes=None, sizer=None):
+        """
+        Parameters:
+            maxsize (int): maximum number of entries
+            maxbytes (int): maximum total size of the values, requires sizer
+            sizer (Callable): returns the size of a value, such as its serialized length
+        """
+        if maxbytes is not None and sizer is None:
+            raise ValueError('maxbytes requires a sizer')
+
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizer = sizer
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key to (value, size), least recently used first
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Membership does not count as a lookup or refresh recency"""
+        return key in self._entries
+
+    def __getitem__(self, key):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, size=None):
+        """
+        Adds or replaces the value for key, evicting least recently used entries to stay within bounds.
+        The size of the value is measured with the sizer unless given, such as when already known.
+        """
+        if size is None:
+            size = self.sizer(value) if self.sizer is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while len(self._entries) > self.maxsize or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes and len(self._entries) > 1
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self.nbytes -= size
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Returns the cache counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(
+                entries=len(self._entries),
+                nbytes=self.nbytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                ratio=self.hits / lookups if lookups else 0.0,
+            )
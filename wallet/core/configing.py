@@ -18,6 +18,20 @@ class Environments(Enum):
     DEVELOPMENT = 'development'
 
 
+class ExecutionModes(Enum):
+    # Run the agent Doist on the same asyncio loop as the Flet UI.
+    SHARED = 'shared'
+    # Run the agent Doist on a dedicated thread with its own asyncio loop.
+    THREAD = 'thread'
+
+
+class SchedulerModes(Enum):
+    # Run the agent Doist every tock regardless of whether there is work to do.
+    FIXED = 'fixed'
+    # Back off exponentially while the agent is idle and wake up when work arrives.
+    ADAPTIVE = 'adaptive'
+
+
 @dataclass
 class WalletConfig:
     app_name = 'Sparán'
@@ -33,6 +47,12 @@ class WalletConfig:
     witness_pool_path: str = DEFAULT_WITNESS_POOL_PATH
     # The environment the app is being run in.
     environment: Environments = Environments.PRODUCTION
+    # Where the agent Doist runs, on the UI loop or its own thread.
+    execution: ExecutionModes = ExecutionModes.SHARED
+    # How the agent Doist is scheduled on the asyncio loop.
+    scheduler: SchedulerModes = SchedulerModes.FIXED
+    # File to write the agent doer recur profile to on shutdown, profiling is disabled when not set.
+    profile_path: str | None = None
 
 
 def read_config():
@@ -48,6 +68,26 @@ def read_config():
             environment = Environments.PRODUCTION
     logger.info(f'Running in the {environment} environment')
 
+    execution = os.environ.get('WALLET_AGENT_EXECUTION')
+    match execution:
+        case ExecutionModes.THREAD.value:
+            execution = ExecutionModes.THREAD
+        case _:
+            execution = ExecutionModes.SHARED
+    logger.info(f'Using the {execution} agent execution mode')
+
+    scheduler = os.environ.get('WALLET_SCHEDULER')
+    match scheduler:
+        case SchedulerModes.ADAPTIVE.value:
+            scheduler = SchedulerModes.ADAPTIVE
+        case _:
+            scheduler = SchedulerModes.FIXED
+    logger.info(f'Using the {scheduler} agent scheduler')
+
+    profile_path = os.environ.get('WALLET_PROFILE')
+    if profile_path is not None:
+        logger.info(f'Profiling agent doers to {profile_path}')
+
     wit_pool_path_var = os.environ.get('WITNESS_POOL_PATH')
     config_dir_var = os.environ.get('KERI_CONFIG_DIR')
     config_file_var = os.environ.get('KERI_AGENT_CONFIG_FILE')
@@ -84,4 +124,7 @@ def read_config():
     config.config_file = config_file
     config.witness_pool_path = wit_pool_path
     config.environment = environment
+    config.execution = execution
+    config.scheduler = scheduler
+    config.profile_path = profile_path
     return config
@@ -1,10 +1,8 @@
-import asyncio
 import logging
 from dataclasses import dataclass
 from typing import List
 
 from hio.base import doing
-from hio.help import decking
 from keri import kering
 from keri.app import grouping
 from keri.app.habbing import Hab
@@ -17,18 +15,51 @@ from wallet.logs import log_errors
 logger = logging.getLogger('wallet')
 
 
+class MultisigCounselor(grouping.Counselor):
+    """
+    Counselor completing the operations awaiting multisig events as soon as its escrow processing
+    marks them complete in .cgms, instead of the awaiting code polling Counselor.complete.
+    """
+
+    def __init__(self, hby, operations, **kwa):
+        self.operations = operations
+        self.expected = dict()  # (pre, sn) of the expected events to their Saider
+        super(MultisigCounselor, self).__init__(hby=hby, **kwa)
+
+    def expect(self, prefixer, seqner, saider, name=None):
+        """
+        Returns an Operation completed once the multisig protocol completes for the event. Create
+        it on the agent thread before starting the protocol.
+        """
+        key = ('multisig', prefixer.qb64, seqner.sn)
+        op = self.operations.expect(key, name=name)
+        self.expected[(prefixer.qb64, seqner.sn)] = saider
+        return op
+
+    def processEscrows(self):
+        super(MultisigCounselor, self).processEscrows()
+        for (pre, sn), saider in list(self.expected.items()):
+            prefixer, seqner = coring.Prefixer(qb64=pre), coring.Seqner(sn=sn)
+            try:
+                if not self.complete(prefixer=prefixer, seqner=seqner, saider=saider):
+                    continue
+            except kering.ValidationError as ex:
+                self.operations.fail(('multisig', pre, sn), ex)
+            else:
+                self.operations.complete(('multisig', pre, sn))
+            del self.expected[(pre, sn)]
+
+
 class GroupRequester(doing.Doer):
     """Processes operations on multisig groups including inception, rotation, and interaction."""
 
-    def __init__(self, app, hby, counselor, groups, postman):
+    def __init__(self, app, hby, counselor, groups, postman, operations):
         self.app = app
         self.hby = hby
         self.counselor = counselor
         self.groups = groups
         self.postman = postman
-        self.cues = decking.Deck()
-
-        asyncio.create_task(self.processCues())
+        self.operations = operations
 
         super().__init__()
 
@@ -56,8 +87,9 @@ class GroupRequester(doing.Doer):
         prefixer = coring.Prefixer(qb64=serder.pre)
         seqner = coring.Seqner(sn=serder.sn)
         saider = coring.Saider(qb64=serder.said)
+        op = self.counselor.expect(prefixer, seqner, saider, name=f'multisig inception {serder.pre}')
         self.counselor.start(ghab=ghab, prefixer=prefixer, seqner=seqner, saider=saider)
-        self.cues.push(dict(serder=serder))
+        self.app.page.run_task(self.complete_multisig_incept, op, serder)
 
     def multisig_rotate(self, ghab, rot, smids, rmids):
         serder = serdering.SerderKERI(raw=rot)
@@ -82,11 +114,11 @@ class GroupRequester(doing.Doer):
         prefixer = coring.Prefixer(qb64=ghab.pre)
         seqner = coring.Seqner(sn=ghab.kever.sn + 1)
         saider = coring.Saider(qb64=serder.said)
+        op = self.counselor.expect(prefixer, seqner, saider, name=f'multisig rotation {serder.pre} {serder.sn}')
         self.counselor.start(ghab=ghab, prefixer=prefixer, seqner=seqner, saider=saider)
         logger.info('Started the group counselor rotate')
 
-        self.cues.push(dict(serder=serder))
-        logger.info('Pushed a cue for rotate')
+        self.app.page.run_task(self.complete_multisig_rotation, op, serder)
 
     def recur(self, tyme):
         """Checks cue for group processing requests and processes any with Counselor"""
@@ -107,58 +139,40 @@ class GroupRequester(doing.Doer):
 
         # return False
 
-    async def process_multisig_incept_cue(self, cue, serder):
-        prefixer = coring.Prefixer(qb64=serder.pre)
-        seqner = coring.Seqner(sn=serder.sn)
-        saider = coring.Saider(qb64=serder.said)
-
-        if self.counselor.complete(prefixer=prefixer, seqner=seqner, saider=saider):
-            self.app.snack(f'Multisig AID complete for {serder.pre}.')
-            self.app.page.route = f'/identifiers/{serder.pre}/view'
-            self.app.page.update()
-            self.app.agent.notifier.rem(self.app.agent.joining[serder.pre])
-            self.app.agent.noter.update()
-        else:
-            self.cues.push(cue)
+    def clear_joining(self, pre):
+        """Removes the join notification for the group, only applies to joiners, not leaders"""
+        if (note := self.app.agent.joining.pop(pre, None)) is not None:
+            self.app.agent.noter.rem(note)
 
-    async def process_multisig_rotation_cue(self, cue, serder):
-        prefixer = coring.Prefixer(qb64=serder.pre)
-        seqner = coring.Seqner(sn=serder.sn)
-        saider = coring.Saider(qb64=serder.said)
-
-        if self.counselor.complete(prefixer=prefixer, seqner=seqner, saider=saider):
-            self.app.snack(f'Multisig AID rotation complete for {serder.pre}.')
-            if self.app.controls[0] and hasattr(self.app.controls[0].active_view, 'rotate_progress_ring'):
-                # TODO have a better signaling mechanism to hide the progress ring
-                #   This really breaks encapsulation
-                await self.app.controls[0].active_view.hide_progress_ring()
-            self.app.page.route = f'/identifiers/{serder.pre}/view'
-            self.app.page.update()
-            try:  # clear out notification if joining - only applies to joiners, not leaders
-                note = self.app.agent.joining[serder.pre]
-                self.app.agent.notifier.rem(note)
-                self.app.agent.noter.update()
-            except KeyError:
-                pass
-
-        else:
-            self.cues.push(cue)
+    @log_errors
+    async def complete_multisig_incept(self, op, serder):
+        try:
+            await op
+        except Exception as ex:
+            logger.error(f'Multisig inception for {serder.pre} failed: {ex}')
+            return
+
+        self.app.snack(f'Multisig AID complete for {serder.pre}.')
+        self.app.page.route = f'/identifiers/{serder.pre}/view'
+        self.app.page.update()
+        await self.app.agent.bridge.run(self.clear_joining, serder.pre)
 
     @log_errors
-    async def processCues(self):
-        while True:
-            if self.cues:
-                cue = self.cues.popleft()
-                serder = cue['serder']
-                match serder.ked['t']:
-                    case coring.Ilks.icp | coring.Ilks.dip:
-                        await self.process_multisig_incept_cue(cue, serder)
-                    case coring.Ilks.rot | coring.Ilks.drt:
-                        await self.process_multisig_rotation_cue(cue, serder)
-                    case _:
-                        raise ValueError(f'Unsupported or invalid event type {serder.ked["t"]}')
-
-            await asyncio.sleep(1)
+    async def complete_multisig_rotation(self, op, serder):
+        try:
+            await op
+        except Exception as ex:
+            logger.error(f'Multisig rotation for {serder.pre} failed: {ex}')
+            return
+
+        self.app.snack(f'Multisig AID rotation complete for {serder.pre}.')
+        if self.app.controls[0] and hasattr(self.app.controls[0].active_view, 'rotate_progress_ring'):
+            # TODO have a better signaling mechanism to hide the progress ring
+            #   This really breaks encapsulation
+            await self.app.controls[0].active_view.hide_progress_ring()
+        self.app.page.route = f'/identifiers/{serder.pre}/view'
+        self.app.page.update()
+        await self.app.agent.bridge.run(self.clear_joining, serder.pre)
 
 
 def get_evt_rmids(hby, rmids):
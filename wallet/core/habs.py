@@ -6,6 +6,7 @@ from keri.core import coring, signing
 from keri.vdr import credentialing
 
 from wallet.core.agenting import runController
+from wallet.core.baser import completed, stamp, stamped
 
 logger = logging.getLogger('wallet')
 
@@ -57,8 +58,17 @@ def open_hby(name, base, bran, config_file, config_dir, app):
     except ValueError:
         logger.error(f'Open Habery failed on ValueError for {name}')
         raise
+    if not stamped(hby.db):  # every hab and key state loaded, so the schema is current
+        stamp(hby.db, migrations=completed(hby.db))
     rgy = credentialing.Regery(hby=hby, name=hby.name, base=base, temp=False)
-    return runController(app=app, hby=hby, rgy=rgy)
+    return runController(
+        app=app,
+        hby=hby,
+        rgy=rgy,
+        execution=app.config.execution,
+        scheduler=app.config.scheduler,
+        profile_path=app.config.profile_path,
+    )
 
 
 def keystore_exists(name, base):
@@ -1,15 +1,145 @@
+import dataclasses
+import functools
 import json
+import logging
+import threading
 from dataclasses import dataclass
 from typing import Iterable, Type, Union
 
 import cbor2
+import lmdb
 import msgpack
 from keri.core import coring
 from keri.db import dbing
 from keri.help import helping
 
+from wallet.core.caching import LRUCache
 from wallet.walleting import OldKeystoreError
 
+logger = logging.getLogger('wallet')
+
+_missing = object()
+_scalars = (str, int, float, bool, type(None))
+
+
+def _isdataclass(cls):
+    return isinstance(cls, type) and dataclasses.is_dataclass(cls)
+
+
+@functools.cache
+def decoder(cls):
+    """
+    Returns a function converting a plain dict to an instance of dataclass cls,
+    equivalent to helping.datify(cls, d) but with the field types of cls and of
+    its nested dataclasses looked up once per class instead of on every record.
+    Like datify, the dict itself is returned when it does not fit cls.
+    """
+    der = getattr(cls, '_der', None)
+    if callable(der):
+
+        def derive(d):
+            try:
+                return der(d)
+            except Exception:
+                return d
+
+        return derive
+
+    if not _isdataclass(cls):
+        return lambda d: d
+
+    nested = {
+        f.name: f.type for f in dataclasses.fields(cls) if _isdataclass(f.type) or callable(getattr(f.type, '_der', None))
+    }
+
+    def decode(d):
+        try:
+            if nested:
+                d = {name: decoder(nested[name])(v) if name in nested else v for name, v in d.items()}
+            return cls(**d)
+        except Exception:
+            return d
+
+    return decode
+
+
+@functools.cache
+def _fieldEncoder(cls):
+    names = tuple(f.name for f in dataclasses.fields(cls))
+
+    def encode(val):
+        return {name: v if type(v := getattr(val, name)) in _scalars else _plain(v) for name in names}
+
+    return encode
+
+
+def _plain(v):
+    """Returns v with nested dataclass instances converted to dicts, as dataclasses.asdict does"""
+    if dataclasses.is_dataclass(v) and not isinstance(v, type):
+        return _fieldEncoder(type(v))(v)
+    if isinstance(v, list):
+        return [x if type(x) in _scalars else _plain(x) for x in v]
+    if isinstance(v, tuple):
+        return tuple(_plain(x) for x in v)
+    if isinstance(v, dict):
+        return {_plain(k): _plain(x) for k, x in v.items()}
+    return v
+
+
+@functools.cache
+def encoder(cls):
+    """
+    Returns a function converting an instance of dataclass cls to a plain dict,
+    equivalent to helping.dictify(val) but with the fields of cls looked up once
+    per class and without the deep copies made by dataclasses.asdict.
+    """
+    ser = getattr(cls, '_ser', None)
+    if callable(ser):
+        return lambda val: val._ser()
+    if not _isdataclass(cls):
+        return helping.dictify
+    return _fieldEncoder(cls)
+
+
+def entries(komer):
+    """
+    Returns the number of entries in the sub database of komer, a wallet or keri
+    Komer, from the LMDB statistics without iterating the entries. Counts each
+    duplicate of a dupsort sub database.
+    """
+    with komer.db.env.begin(write=False) as txn:
+        return txn.stat(komer.sdb)['entries']
+
+
+class LazyRecord:
+    """
+    Value of a lazy range scan item, a zero copy view of the serialized value
+    that is only deserialized when accessed. The view is only valid while the
+    scan is being iterated.
+
+    Attributes:
+        buf (memoryview): serialized value in the LMDB memory map
+    """
+
+    __slots__ = ('buf', '_komer', '_val')
+
+    def __init__(self, komer, buf):
+        self.buf = buf
+        self._komer = komer
+        self._val = _missing
+
+    @property
+    def val(self):
+        """Value deserialized to an instance of the Komer .schema on first access"""
+        if self._val is _missing:
+            self._val = self._komer.deserializer(self.buf)
+        return self._val
+
+    @property
+    def raw(self):
+        """Value decoded to a dict, without the .schema instance"""
+        return self._komer.loader(self.buf)
+
 
 class KomerBase:
     """
@@ -25,12 +155,23 @@ class KomerBase:
         sdb (lmdb._Database): instance of named sub db lmdb for this Komer
         schema (Type[dataclass]): class reference of dataclass subclass
         kind (str): serialization/deserialization type from coring.Kinds
+        encode (Callable): converts a schema instance to a plain dict, compiled once per schema
+        decode (Callable): converts a plain dict to a schema instance, compiled once per schema
         serializer (types.MethodType): serializer method
         deserializer (types.MethodType): deserializer method
+        loader (types.MethodType): deserializer to the plain dict, without the schema instance
         sep (str): separator for combining keys tuple of strs into key bytes
+        cache (LRUCache): read through cache of deserialized values by key bytes, None when disabled
+        version (int): schema version of the records written, 0 for unversioned records
+        upgraders (dict): upgrader of the decoded records of each older version to the next version
+
+    Records of a version above 0 carry it in the serialized dict at .VersionKey, records
+    without it are version 0. Records of an older version are upgraded to .version by the
+    registered upgraders when read and stay as written until rewritten, see Komer.compact.
     """
 
     Sep = '.'  # separator for combining key iterables
+    VersionKey = '_v'  # key of the schema version in the serialized dict of a versioned record
 
     def __init__(
         self,
@@ -41,6 +182,10 @@ class KomerBase:
         kind: str = coring.Kinds.json,
         dupsort: bool = False,
         sep: str = None,
+        cache_size: int = 0,
+        cache_bytes: int = None,
+        version: int = 0,
+        upgraders: dict = None,
         **kwa,
     ):
         """
@@ -54,15 +199,41 @@ class KomerBase:
                                each key
             sep (str): separator to convert keys iterator to key bytes for db key
                        default is self.Sep == '.'
+            cache_size (int): maximum number of values kept in the read through cache,
+                       0 (default) disables the cache
+            cache_bytes (int): maximum total serialized size of the cached values,
+                       None (default) for no limit
+            version (int): schema version of the records written, 0 (default)
+                       writes unversioned records
+            upgraders (dict): maps each older version to a function upgrading a
+                       decoded record dict of that version to the next version
         """
         super(KomerBase, self).__init__()
         self.db = db
         self.sdb = self.db.env.open_db(key=subkey.encode('utf-8'), dupsort=dupsort)
         self.schema = schema
         self.kind = kind
+        self.encode = encoder(schema)
+        self.decode = decoder(schema)
         self.serializer = self._serializer(kind)
         self.deserializer = self._deserializer(kind)
+        self.loader = self._loader(kind)
         self.sep = sep if sep is not None else self.Sep
+        self.version = version
+        self.upgraders = dict(upgraders) if upgraders else dict()
+        if self.version:
+            encode, load = self.encode, self.loader
+            self.encode = lambda val: {**encode(val), self.VersionKey: self.version}
+            self.loader = lambda val: self.upgrade(load(val))
+            self.deserializer = self.__deserializeVersioned
+        self.cache = (
+            LRUCache(maxsize=cache_size, maxbytes=cache_bytes, sizer=lambda val: len(self.serializer(val)))
+            if cache_size
+            else None
+        )
+        # held by a cache miss from its read to its fill and by invalidations, so a read of the value
+        # before a commit cannot be cached after the writer dropped it
+        self.cacheLock = threading.RLock()
 
     def _tokey(self, keys: Union[str, bytes, memoryview, Iterable]):
         """
@@ -98,7 +269,9 @@ class KomerBase:
             key = bytes(key)
         return tuple(key.decode('utf-8').split(self.sep))
 
-    def getItemIter(self, keys: Union[str, Iterable] = b''):
+    def getItemIter(
+        self, keys: Union[str, Iterable] = b'', raw: bool = False, after: Union[str, Iterable] = None, limit: int = None
+    ):
         """
         Returns:
             items (Iterator): of (key, val) tuples  over the all the items in
@@ -111,10 +284,157 @@ class KomerBase:
                 a full keys tuple in  in order to get all the items from
                 multiple branches of the key space. If keys is empty then gets
                 all items in database.
+            raw (bool): True means each val is the decoded dict instead of an
+                instance of .schema, for scans that only read a few fields
+            after (Iterator): keys of the item to start after, such as the last
+                item of the previous page, None to start at the top of the branch
+            limit (int): maximum number of items, None for no limit
+
+        """
+        deserializer = self.loader if raw else self.deserializer
+        for key, val in self.getRangeIter(keys=keys, after=after, limit=limit):
+            yield (self._tokeys(key), deserializer(val))
+
+    def getRangeIter(
+        self, keys: Union[str, Iterable] = b'', after: Union[str, Iterable] = None, limit: int = None, values: bool = True
+    ):
+        """
+        Range scan over the branch of the key space given by keys in key order.
+
+        Returns:
+            items (Iterator): of (key bytes, memoryview) tuples, or of key bytes
+                when values is False. Both are only valid while iterating since
+                the scan holds its read transaction open until it ends.
+
+        Parameters:
+            keys (Iterator): key space prefix of the branch, empty for all items
+            after (Iterator): keys of the item to start after, such as the last
+                item of the previous page, None to start at the top of the branch
+            limit (int): maximum number of items, None for no limit
+            values (bool): False means iterate the keys only, without reading values
+        """
+        top = self._tokey(keys)
+        start = self._tokey(after) if after is not None else top
+        if limit is not None and limit <= 0:
+            return
+        with self.db.env.begin(db=self.sdb, write=False, buffers=True) as txn:
+            cursor = txn.cursor()
+            if not cursor.set_range(max(start, top)):
+                return
+            count = 0
+            for item in cursor.iternext(keys=True, values=values):
+                key = bytes(item[0] if values else item)
+                if not key.startswith(top):
+                    break
+                if after is not None and key == start:
+                    continue
+                yield (key, item[1]) if values else key
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+
+    def getKeyIter(self, keys: Union[str, Iterable] = b'', after: Union[str, Iterable] = None, limit: int = None):
+        """
+        Returns:
+            keyses (Iterator): of keys tuples of the items in the branch given by
+                keys, starting after keys after, without reading their values
+
+        Parameters:
+            keys (Iterator): key space prefix of the branch, empty for all items
+            after (Iterator): keys of the item to start after, None for the top
+            limit (int): maximum number of keys, None for no limit
+        """
+        for key in self.getRangeIter(keys=keys, after=after, limit=limit, values=False):
+            yield self._tokeys(key)
+
+    def getValIter(
+        self, keys: Union[str, Iterable] = b'', after: Union[str, Iterable] = None, limit: int = None, raw: bool = False
+    ):
+        """
+        Returns:
+            vals (Iterator): of the values of the items in the branch given by
+                keys, starting after keys after, see getItemIter
+        """
+        deserializer = self.loader if raw else self.deserializer
+        for _, val in self.getRangeIter(keys=keys, after=after, limit=limit):
+            yield deserializer(val)
+
+    def getLazyItemIter(self, keys: Union[str, Iterable] = b'', after: Union[str, Iterable] = None, limit: int = None):
+        """
+        Returns:
+            items (Iterator): of (keys, LazyRecord) tuples of the items in the
+                branch given by keys, starting after keys after. Values are only
+                deserialized when accessed, and only while iterating.
+        """
+        for key, val in self.getRangeIter(keys=keys, after=after, limit=limit):
+            yield (self._tokeys(key), LazyRecord(self, val))
+
+    def getPage(
+        self, keys: Union[str, Iterable] = b'', after: Union[str, Iterable] = None, limit: int = 50, raw: bool = False
+    ):
+        """
+        Returns:
+            page (tuple): (items, after) where items is a list of at most limit
+                (keys, val) tuples starting after keys after and after is the keys
+                of the last item to pass to get the next page, None on the last page
+
+        Parameters:
+            keys (Iterator): key space prefix of the branch, empty for all items
+            after (Iterator): keys of the last item of the previous page, None for the first page
+            limit (int): page size
+            raw (bool): True means each val is the decoded dict, see getItemIter
+        """
+        items = list(self.getItemIter(keys=keys, raw=raw, after=after, limit=limit + 1))
+        if len(items) > limit:
+            return items[:limit], items[limit - 1][0]
+        return items, None
+
+    def cacheStats(self):
+        """
+        Returns:
+            stats (dict): hit, miss and eviction counts and size of the read through
+                cache, None when the cache is disabled
+        """
+        return self.cache.stats() if self.cache is not None else None
 
+    def _uncache(self, keys: Iterable[bytes]):
         """
-        for key, val in self.db.getTopItemIter(db=self.sdb, key=self._tokey(keys)):
-            yield (self._tokeys(key), self.deserializer(val))
+        Drops the cached values at keys, key bytes written through this instance. Called once
+        the write transaction committed, as a read before the commit may cache the old value.
+        """
+        if self.cache is not None:
+            with self.cacheLock:
+                for key in keys:
+                    self.cache.pop(key)
+
+    def upgrader(self, version: int):
+        """Decorator registering a function upgrading decoded records of version to version + 1"""
+
+        def register(fn):
+            self.upgraders[version] = fn
+            return fn
+
+        return register
+
+    def versionOf(self, d):
+        """Returns the schema version of d, a decoded record dict"""
+        return d.get(self.VersionKey, 0) if isinstance(d, dict) else 0
+
+    def upgrade(self, d):
+        """Returns d, a decoded record dict, upgraded to .version with the registered upgraders"""
+        if d is None:
+            return None
+        version = self.versionOf(d)
+        if version > self.version:
+            raise ValueError(f'{self.schema.__name__} record of version {version} is newer than version {self.version}')
+        if isinstance(d, dict) and self.VersionKey in d:
+            d = {k: v for k, v in d.items() if k != self.VersionKey}
+        while version < self.version:
+            if (fn := self.upgraders.get(version)) is None:
+                raise ValueError(f'No upgrader of {self.schema.__name__} records from version {version}')
+            d = fn(d)
+            version += 1
+        return d
 
     def _serializer(self, kind):
         """
@@ -140,54 +460,87 @@ class KomerBase:
         else:
             return self.__deserializeJSON
 
+    def _loader(self, kind):
+        """
+        Parameters:
+            kind (str): deserialization
+        """
+        if kind == coring.Kinds.mgpk:
+            return self.__loadMGPK
+        elif kind == coring.Kinds.cbor:
+            return self.__loadCBOR
+        else:
+            return self.__loadJSON
+
+    @staticmethod
+    def __loadJSON(val):
+        return json.loads(bytes(val)) if val is not None else None
+
+    @staticmethod
+    def __loadMGPK(val):
+        return msgpack.loads(bytes(val)) if val is not None else None
+
+    @staticmethod
+    def __loadCBOR(val):
+        return cbor2.loads(bytes(val)) if val is not None else None
+
+    def _checked(self, val):
+        if not isinstance(val, self.schema):
+            raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
+        return val
+
+    def __deserializeVersioned(self, val):
+        if val is not None:
+            val = self._checked(self.decode(self.loader(val)))
+        return val
+
     def __deserializeJSON(self, val):
         if val is not None:
-            val = helping.datify(self.schema, json.loads(bytes(val).decode('utf-8')))
-            if not isinstance(val, self.schema):
-                raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
+            val = self._checked(self.decode(json.loads(bytes(val))))
         return val
 
     def __deserializeMGPK(self, val):
         if val is not None:
-            val = helping.datify(self.schema, msgpack.loads(bytes(val)))
-            if not isinstance(val, self.schema):
-                raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
+            val = self._checked(self.decode(msgpack.loads(bytes(val))))
         return val
 
     def __deserializeCBOR(self, val):
         if val is not None:
-            val = helping.datify(self.schema, cbor2.loads(bytes(val)))
-            if not isinstance(val, self.schema):
-                raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
+            val = self._checked(self.decode(cbor2.loads(bytes(val))))
         return val
 
     def __serializeJSON(self, val):
         if val is not None:
-            if not isinstance(val, self.schema):
-                raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
-            val = json.dumps(helping.dictify(val), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            val = json.dumps(self.encode(self._checked(val)), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
         return val
 
     def __serializeMGPK(self, val):
         if val is not None:
-            if not isinstance(val, self.schema):
-                raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
-            val = msgpack.dumps(helping.dictify(val))
+            val = msgpack.dumps(self.encode(self._checked(val)))
         return val
 
     def __serializeCBOR(self, val):
         if val is not None:
-            if not isinstance(val, self.schema):
-                raise ValueError('Invalid schema type={} of value={}, expected {}.'.format(type(val), val, self.schema))
-            val = cbor2.dumps(helping.dictify(val))
+            val = cbor2.dumps(self.encode(self._checked(val)))
         return val
 
 
 class Komer(KomerBase):
     """
     Keyspace Object Mapper factory class.
+
+    The *_many methods run a batch of records in one LMDB transaction per chunk
+    of .Chunk records instead of one transaction per record.
+
+    Fields named in indexes are indexed in a companion dupsort sub db each, keyed
+    by field value with the keys of the records as values, and updated in the same
+    transaction as the records written through this instance. Records are found
+    by field value with find. A field holding a list is indexed by each element.
+    Values longer than the LMDB key size limit are not indexed.
     """
 
+    Chunk = 1000  # default number of records per transaction of the *_many methods
+
     def __init__(
         self,
         db: dbing.LMDBer,
@@ -195,6 +548,7 @@ class Komer(KomerBase):
         subkey: str = 'docs.',
         schema: Type[dataclass],  # class not instance
         kind: str = coring.Kinds.json,
+        indexes: Iterable[str] = (),
         **kwa,
     ):
         """
@@ -203,8 +557,59 @@ class Komer(KomerBase):
             schema (Type[dataclass]):  reference to Class definition for dataclass sub class
             subkey (str):  LMDB sub database key
             kind (str): serialization/deserialization type
+            indexes (Iterable): names of the fields to index, each in sub db {subkey}{field}.idx.
+            cache_size (int): see KomerBase, enables the read through cache of get
+            cache_bytes (int): see KomerBase
+            version (int): see KomerBase, schema version of the records written
+            upgraders (dict): see KomerBase, upgraders of the records of older versions
         """
         super(Komer, self).__init__(db=db, subkey=subkey, schema=schema, kind=kind, dupsort=False, **kwa)
+        self.indexes = {
+            field: self.db.env.open_db(key=f'{subkey}{field}.idx.'.encode('utf-8'), dupsort=True) for field in indexes
+        }
+        self.maxkey = self.db.env.max_key_size()
+
+    def _terms(self, val, field):
+        """Returns the index keys of the value of field in val, a schema instance or dict"""
+        value = val.get(field) if isinstance(val, dict) else getattr(val, field, None)
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        terms = [str(v).encode('utf-8') for v in values if v is not None]
+        return [term for term in terms if 0 < len(term) <= self.maxkey]
+
+    def _write(self, txn, key: bytes, val, raw: bytes, overwrite: bool):
+        """Writes raw, the serialization of val, at key and updates the indexes in txn"""
+        old = txn.get(key, db=self.sdb) if self.indexes else None
+        if old is not None and not overwrite:
+            return False
+        if old is not None:
+            old = self.deserializer(old)  # before put, a buffers=True view of old shows the value written over it
+        try:
+            result = txn.put(key, raw, db=self.sdb, overwrite=overwrite)
+        except lmdb.BadValsizeError:
+            raise KeyError(f'Key: `{key}` is either empty or too big (for lmdb).')
+        if result and self.indexes:
+            if old is not None:
+                self._unindex(txn, key, old)
+            self._index(txn, key, val)
+        return result
+
+    def _delete(self, txn, key: bytes):
+        """Deletes the entry at key and its index entries in txn"""
+        if self.indexes:
+            if (old := txn.get(key, db=self.sdb)) is None:
+                return False
+            self._unindex(txn, key, self.deserializer(old))
+        return txn.delete(key, db=self.sdb)
+
+    def _index(self, txn, key: bytes, val):
+        for field, idb in self.indexes.items():
+            for term in self._terms(val, field):
+                txn.put(term, key, db=idb)
+
+    def _unindex(self, txn, key: bytes, val):
+        for field, idb in self.indexes.items():
+            for term in self._terms(val, field):
+                txn.delete(term, key, db=idb)
 
     def put(self, keys: Union[str, Iterable], val: dataclass):
         """
@@ -218,7 +623,11 @@ class Komer(KomerBase):
             result (bool): True If successful, False otherwise, such as key
                               already in database.
         """
-        return self.db.putVal(db=self.sdb, key=self._tokey(keys), val=self.serializer(val))
+        key, raw = self._tokey(keys), self.serializer(val)
+        with self.db.env.begin(write=True, buffers=True) as txn:
+            result = self._write(txn, key, val, raw, overwrite=False)
+        self._uncache([key])
+        return result
 
     def pin(self, keys: Union[str, Iterable], val: dataclass):
         """
@@ -231,14 +640,20 @@ class Komer(KomerBase):
         Returns:
             result (bool): True If successful. False otherwise.
         """
-        return self.db.setVal(db=self.sdb, key=self._tokey(keys), val=self.serializer(val))
+        key, raw = self._tokey(keys), self.serializer(val)
+        with self.db.env.begin(write=True, buffers=True) as txn:
+            result = self._write(txn, key, val, raw, overwrite=True)
+        self._uncache([key])
+        return result
 
-    def get(self, keys: Union[str, Iterable]):
+    def get(self, keys: Union[str, Iterable], raw: bool = False):
         """
         Gets val at keys
 
         Parameters:
             keys (tuple): of key strs to be combined in order to form key
+            raw (bool): True means return the decoded dict instead of an instance
+                of .schema, bypassing the read through cache
 
         Returns:
             val (dataclass):
@@ -249,8 +664,25 @@ class Komer(KomerBase):
             if (val := mydb.get(keys)) is None:
                 raise ExceptionHere
             use val here
+
+        When the read through cache is enabled the cached instance is returned, so
+        changes to it must be written back with pin.
         """
-        return self.deserializer(self.db.getVal(db=self.sdb, key=self._tokey(keys)))
+        key = self._tokey(keys)
+        if raw:
+            return self.loader(self.db.getVal(db=self.sdb, key=key))
+        if self.cache is None:
+            return self.deserializer(self.db.getVal(db=self.sdb, key=key))
+
+        if (val := self.cache.get(key, _missing)) is not _missing:
+            return val
+
+        with self.cacheLock:
+            raw = self.db.getVal(db=self.sdb, key=key)
+            val = self.deserializer(raw)
+            if val is not None:
+                self.cache.put(key, val, size=len(raw))
+        return val
 
     def get_expect_type(self, keys: Union[str, Iterable], klas: Type):
         """
@@ -271,7 +703,7 @@ class Komer(KomerBase):
         """
         val = self.db.getVal(db=self.sdb, key=self._tokey(keys))
         if val is not None:
-            val = helping.datify(self.schema, json.loads(bytes(val).decode('utf-8')))
+            val = self.decode(json.loads(bytes(val)))
             if not isinstance(val, klas):
                 raise OldKeystoreError(f'Invalid data type={type(val)}, expected {klas} for value={val}.')
         return val
@@ -286,7 +718,11 @@ class Komer(KomerBase):
         Returns:
            result (bool): True if key exists so delete successful. False otherwise
         """
-        return self.db.delVal(db=self.sdb, key=self._tokey(keys))
+        key = self._tokey(keys)
+        with self.db.env.begin(write=True, buffers=True) as txn:
+            result = self._delete(txn, key)
+        self._uncache([key])
+        return result
 
     def trim(self, keys: Union[str, Iterable] = b''):
         """
@@ -301,19 +737,245 @@ class Komer(KomerBase):
         Returns:
            result (bool): True if key exists so delete successful. False otherwise
         """
-        return self.db.delTopVal(db=self.sdb, key=self._tokey(keys))
+        try:
+            if not self.indexes:
+                return self.db.delTopVal(db=self.sdb, top=self._tokey(keys))
+
+            branch = list(self.getRangeIter(keys=keys, values=False))
+            with self.db.env.begin(write=True, buffers=True) as txn:
+                return any([self._delete(txn, key) for key in branch])
+        finally:
+            if self.cache is not None:
+                with self.cacheLock:
+                    self.cache.clear()
+
+    def _chunks(self, items: Iterable, chunk: int = None):
+        """Yields lists of at most chunk, default .Chunk, items of items"""
+        chunk = chunk if chunk is not None else self.Chunk
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= chunk:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _write_many(self, items: Iterable, overwrite: bool, chunk: int = None):
+        results = []
+        for batch in self._chunks(items, chunk):
+            # serialize first so an invalid value fails before the transaction opens
+            rows = [(self._tokey(keys), val, self.serializer(val)) for keys, val in batch]
+            with self.db.env.begin(write=True, buffers=True) as txn:
+                for key, val, raw in rows:
+                    results.append(self._write(txn, key, val, raw, overwrite=overwrite))
+            self._uncache([key for key, _, _ in rows])
+        return results
+
+    def put_many(self, items: Iterable, chunk: int = None):
+        """
+        Puts each val at the key made from its keys in one transaction per chunk
+        of items. Does not overwrite. Chunks are committed in turn, so an error
+        leaves the chunks before the failed one written.
 
-    def cntAll(self):
+        Parameters:
+            items (Iterable): of (keys, val) tuples as given to put
+            chunk (int): number of items per transaction, default .Chunk
+
+        Returns:
+            results (list): of bool per item in order, True if written, False if
+                the key was already in the database
+        """
+        return self._write_many(items, overwrite=False, chunk=chunk)
+
+    def pin_many(self, items: Iterable, chunk: int = None):
+        """
+        Pins (sets) each val at the key made from its keys in one transaction per
+        chunk of items. Overwrites.
+
+        Parameters:
+            items (Iterable): of (keys, val) tuples as given to pin
+            chunk (int): number of items per transaction, default .Chunk
+
+        Returns:
+            results (list): of bool per item in order, True if written
+        """
+        return self._write_many(items, overwrite=True, chunk=chunk)
+
+    def get_many(self, keyses: Iterable, chunk: int = None):
+        """
+        Gets the val at each keys in one read transaction per chunk of keyses.
+
+        Parameters:
+            keyses (Iterable): of keys as given to get
+            chunk (int): number of keys per transaction, default .Chunk
+
+        Returns:
+            vals (list): of dataclass per keys in order, None where no entry at keys
+        """
+        vals = []
+        for batch in self._chunks(keyses, chunk):
+            keys = [self._tokey(keys) for keys in batch]
+            with self.cacheLock:  # read and fill at once, see .cacheLock
+                cached = dict()
+                raws = dict()
+                with self.db.env.begin(db=self.sdb, write=False, buffers=True) as txn:
+                    for key in keys:
+                        if self.cache is not None and (val := self.cache.get(key, _missing)) is not _missing:
+                            cached[key] = val
+                        else:
+                            raw = txn.get(key)
+                            raws[key] = bytes(raw) if raw is not None else None  # buffers are only valid in the txn
+
+                for key in keys:
+                    if key in cached:
+                        vals.append(cached[key])
+                        continue
+                    raw = raws[key]
+                    val = self.deserializer(raw)
+                    if val is not None and self.cache is not None:
+                        self.cache.put(key, val, size=len(raw))
+                    vals.append(val)
+        return vals
+
+    def rem_many(self, keyses: Iterable, chunk: int = None):
+        """
+        Removes the entry at each keys in one transaction per chunk of keyses.
+
+        Parameters:
+            keyses (Iterable): of keys as given to rem
+            chunk (int): number of keys per transaction, default .Chunk
+
+        Returns:
+            results (list): of bool per keys in order, True if the key existed and
+                was deleted, False otherwise
+        """
+        results = []
+        for batch in self._chunks(keyses, chunk):
+            keys = [self._tokey(keys) for keys in batch]
+            with self.db.env.begin(write=True, buffers=True) as txn:
+                for key in keys:
+                    results.append(self._delete(txn, key))
+            self._uncache(keys)
+        return results
+
+    def findKeys(self, field: str, value):
+        """
+        Returns:
+            keyses (list): of keys tuples of the records whose field equals value,
+                or holds value when a list, in key order
+
+        Parameters:
+            field (str): indexed field
+            value: field value, compared as str
+        """
+        if field not in self.indexes:
+            raise ValueError(f'field {field} of {self.schema.__name__} is not indexed')
+        term = str(value).encode('utf-8')
+        if not 0 < len(term) <= self.maxkey:
+            return []
+        with self.db.env.begin(db=self.indexes[field], write=False) as txn:
+            cursor = txn.cursor()
+            if not cursor.set_key(term):
+                return []
+            return [self._tokeys(key) for key in cursor.iternext_dup()]
+
+    def find(self, field: str, value):
+        """
+        Returns:
+            items (list): of (keys, val) tuples of the records whose field equals
+                value, or holds value when a list, looked up in the index of field
+
+        Parameters:
+            field (str): indexed field
+            value: field value, compared as str
+        """
+        keyses = self.findKeys(field, value)
+        return list(zip(keyses, self.get_many(keyses)))
+
+    def reindex(self, fields: Iterable[str] = None, chunk: int = None):
+        """
+        Rebuilds the indexes of fields, default all, from the records, such as after
+        adding an index to a Komer with existing records or after records were
+        written without this instance. Records are read in chunks and indexed in one
+        write transaction per chunk.
+
+        Returns:
+            count (int): number of records indexed
+        """
+        fields = list(fields) if fields is not None else list(self.indexes)
+        indexes, self.indexes = self.indexes, {field: self.indexes[field] for field in fields}
+        try:
+            with self.db.env.begin(write=True) as txn:
+                for idb in self.indexes.values():
+                    txn.drop(idb, delete=False)
+
+            count, after = 0, None
+            while True:
+                rows = [
+                    (key, self.deserializer(raw))
+                    for key, raw in self.getRangeIter(after=after, limit=chunk if chunk is not None else self.Chunk)
+                ]
+                if not rows:
+                    return count
+                with self.db.env.begin(write=True) as txn:
+                    for key, val in rows:
+                        self._index(txn, key, val)
+                count += len(rows)
+                after = rows[-1][0]
+        finally:
+            self.indexes = indexes
+
+    def compact(self, after: Union[str, Iterable] = None, limit: int = None):
         """
-        Return iterator over the all the items in subdb
+        Rewrites the records of an older version than .version, upgraded, among the
+        next limit records, default .Chunk, in one write transaction, so old records
+        are migrated a chunk at a time instead of all at once. A record failing to
+        upgrade is logged and left as written, the others of the chunk are rewritten.
+
+        Parameters:
+            after (Iterator): keys of the record to continue after, such as returned
+                by the previous call, None to start at the first record
+            limit (int): maximum number of records read
 
         Returns:
-            iterator: of tuples of keys tuple and val dataclass instance for
-            each entry in db. Raises StopIteration when done
+            (count, after) (tuple): number of records rewritten and the keys to
+                continue after, None when the last record was read
+        """
+        if not self.version:
+            return 0, None
+        limit = limit if limit is not None else self.Chunk
+        start = self._tokey(after) if after is not None else b''
+        load = self._loader(self.kind)
+        rows, last, seen = [], None, 0
+        with self.db.env.begin(db=self.sdb, write=True) as txn:
+            cursor = txn.cursor()
+            found = cursor.set_range(start) if start else cursor.first()
+            while found and seen < limit:
+                key, raw = bytes(cursor.key()), bytes(cursor.value())
+                if key != start:
+                    seen += 1
+                    last = key
+                    if self.versionOf(load(raw)) < self.version:
+                        rows.append((key, raw))
+                found = cursor.next()
+
+            written = []
+            for key, raw in rows:
+                try:
+                    val = self.deserializer(raw)
+                except Exception as ex:
+                    logger.exception(f'Skipped compacting {self.schema.__name__} record {key}: {ex}')
+                    continue
+                self._write(txn, key, val, self.serializer(val), overwrite=True)
+                written.append(key)
+        self._uncache(written)
+        return len(written), (self._tokeys(last) if seen == limit else None)
 
-        Example:
-            if key in database is "a.b" and val is serialization of dataclass
-               with attributes x and y then returns
-               (("a","b"), dataclass(x=1,y=2))
+    def cntAll(self):
+        """
+        Returns:
+            count (int): number of items in subdb, read from the LMDB statistics
+                without iterating the items
         """
-        return self.db.cnt(db=self.sdb)
+        return entries(self)
@@ -0,0 +1,182 @@
+"""
+Operating module for the Wallet application
+
+Awaitable Agent operations. UI code awaits an Operation for the completion of work it handed to
+the Agent, such as witness receipting, a multisig protocol, or an OOBI resolution, instead of
+polling the Habery on a timer. Operations are completed on the agent thread, either when a doer
+reports the completion of a keyed operation or when the completion check of a watched operation
+passes, and the awaiting coroutine is resumed on its own event loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent import futures
+
+from hio.base import doing
+
+from wallet.core.bridging import AgentStoppedError
+
+logger = logging.getLogger('wallet')
+
+
+class OperationTimeoutError(TimeoutError):
+    """Raised when an operation does not complete before its timeout"""
+
+
+class Operation:
+    """
+    A pending Agent operation, awaitable from any event loop.
+
+    Attributes:
+        name (str): human readable name used in log and error messages
+        key (tuple): key of the operation when completed by a doer, None for watched operations
+        check (Callable): completion check of a watched operation, a truthy result completes it
+        deadline (float): monotonic time after which the operation times out, None for no timeout
+        interval (float): minimum seconds between completion checks
+        future (futures.Future): resolved with the result of the operation
+    """
+
+    def __init__(self, name, key=None, check=None, timeout=None, interval=0.0):
+        self.name = name
+        self.key = key
+        self.check = check
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.interval = interval
+        self.checked = 0.0
+        self.future = futures.Future()
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout=timeout)
+
+    def resolve(self, result):
+        try:
+            self.future.set_result(result)
+        except futures.InvalidStateError:  # already resolved or cancelled by the awaiting coroutine
+            pass
+
+    def fail(self, ex):
+        try:
+            self.future.set_exception(ex)
+        except futures.InvalidStateError:
+            pass
+
+
+class Operations(doing.Doer):
+    """
+    Tracks pending Agent operations and resolves them as they complete.
+
+    Operations may be created from any thread. Completion checks run on the agent thread.
+    """
+
+    def __init__(self, **kwa):
+        self.lock = threading.Lock()
+        self.keyed = dict()  # operation key to list of Operations waiting on it
+        self.watched = []  # Operations with a completion check
+        self.listeners = []  # (deck, keyer) pairs of cue decks that complete keyed operations
+        super(Operations, self).__init__(**kwa)
+
+    @property
+    def idle(self):
+        return not any(deck for deck, _ in self.listeners)
+
+    @property
+    def pending(self):
+        with self.lock:
+            return sum(len(ops) for ops in self.keyed.values()) + len(self.watched)
+
+    def expect(self, key, timeout=None, name=None):
+        """
+        Returns an Operation completed when a doer calls .complete(key). Create it before
+        submitting the work it waits on so a fast completion is not missed.
+        """
+        op = Operation(name=name if name is not None else str(key), key=key, timeout=timeout)
+        with self.lock:
+            self.keyed.setdefault(key, []).append(op)
+        return op
+
+    def watch(self, check, timeout=None, interval=0.25, name=None):
+        """
+        Returns an Operation completed with the result of check() once it is truthy. The check runs
+        on the agent thread at most every interval seconds.
+        """
+        name = name if name is not None else getattr(check, '__name__', 'watch')
+        op = Operation(name=name, check=check, timeout=timeout, interval=interval)
+        with self.lock:
+            self.watched.append(op)
+        return op
+
+    def listen(self, deck, keyer):
+        """Completes keyed operations from a cue deck, keyer(cue) returns the operation key for a cue or None"""
+        self.listeners.append((deck, keyer))
+
+    def complete(self, key, result=True):
+        """Completes all operations waiting on key with result. Returns the number completed."""
+        with self.lock:
+            ops = self.keyed.pop(key, [])
+        for op in ops:
+            op.resolve(result)
+        return len(ops)
+
+    def fail(self, key, ex):
+        """Fails all operations waiting on key with the exception ex"""
+        with self.lock:
+            ops = self.keyed.pop(key, [])
+        for op in ops:
+            op.fail(ex)
+        return len(ops)
+
+    def recur(self, tyme):
+        for deck, keyer in self.listeners:
+            while deck:
+                cue = deck.popleft()
+                if (key := keyer(cue)) is not None:
+                    self.complete(key, cue)
+
+        now = time.monotonic()
+        with self.lock:
+            watched = list(self.watched)
+            keyed = [op for ops in self.keyed.values() for op in ops]
+
+        for op in watched:
+            if op.future.cancelled():
+                continue
+            if now - op.checked >= op.interval:
+                op.checked = now
+                try:
+                    if result := op.check():
+                        op.resolve(result)
+                except Exception as ex:
+                    logger.exception(f'Operation {op.name} check failed')
+                    op.fail(ex)
+
+        for op in watched + keyed:
+            if not op.done() and op.deadline is not None and now > op.deadline:
+                logger.info(f'Operation {op.name} timed out')
+                op.fail(OperationTimeoutError(f'Operation {op.name} timed out'))
+
+        self.prune()
+        return False
+
+    def prune(self):
+        with self.lock:
+            self.watched = [op for op in self.watched if not op.done()]
+            for key in [key for key, ops in self.keyed.items() if all(op.done() for op in ops)]:
+                del self.keyed[key]
+
+    def exit(self):
+        """Fails operations still pending so no awaiting coroutine waits forever on a stopped Agent"""
+        with self.lock:
+            ops = self.watched + [op for ops in self.keyed.values() for op in ops]
+            self.watched = []
+            self.keyed = dict()
+        for op in ops:
+            op.fail(AgentStoppedError(f'Agent stopped before {op.name} completed'))
+        super(Operations, self).exit()
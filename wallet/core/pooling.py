@@ -0,0 +1,316 @@
+"""
+Pooling module for the Wallet application
+
+Wallet-wide pool of keep-alive HTTP connections to witnesses and other KERI endpoints. Requests
+from the messengers keri creates for each witness interaction are queued per endpoint and sent over
+pooled connections, so KSN queries, event submissions and forwarded exchanges reuse an open TCP (and
+TLS) connection instead of connecting again for every interaction.
+"""
+
+import logging
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from hio.base import doing
+from hio.core import http
+from hio.help import Hict
+from keri import kering
+from keri.app import agenting
+
+logger = logging.getLogger('wallet')
+
+
+def endpoint(url):
+    """Returns the (scheme, hostname, port) key of the connections that can serve url"""
+    up = urlparse(url)
+    return up.scheme, up.hostname, up.port
+
+
+class Connection:
+    """
+    A pooled keep-alive connection to one endpoint, sending one request at a time.
+
+    Attributes:
+        key (tuple): (scheme, hostname, port) endpoint of the connection
+        client (Client): hio http client owning the socket
+        patron (PooledClient): client whose request is in flight, None while idle
+        sent (float): monotonic time the request in flight was handed to the connection
+        used (float): monotonic time the connection last finished a request
+        served (int): number of requests answered over the connection
+    """
+
+    def __init__(self, key, client):
+        self.key = key
+        self.client = client
+        self.patron = None
+        self.sent = None
+        self.used = time.monotonic()
+        self.served = 0
+
+    @property
+    def broken(self):
+        """True when the far side closed the connection or asked for it not to be kept alive"""
+        respondent = self.client.respondent
+        return self.client.connector.cutoff or (respondent is not None and respondent.persisted is False)
+
+
+class PooledClient:
+    """
+    Stands in for the hio http Client of one messenger. Requests are queued on the pool and the
+    responses to them are appended to .responses in order, as with a dedicated Client.
+    """
+
+    def __init__(self, pool, key, path='/', eid=None):
+        self.pool = pool
+        self.key = key
+        self.path = path
+        self.eid = eid  # prefix of the witness or other endpoint provider, for health tracking
+        self.requests = deque()  # requests not yet answered, the first one may be in flight
+        self.responses = deque()
+        self.events = deque()  # no server sent events over pooled connections
+
+    @property
+    def requester(self):
+        """keri reads the base path of its requests from client.requester.path"""
+        return self
+
+    def request(self, method='GET', path=None, qargs=None, fragment='', headers=None, body=b'', **kwa):
+        headers = Hict(headers if headers is not None else [])
+        if 'connection' not in headers:
+            headers['Connection'] = 'keep-alive'
+        self.requests.append(
+            dict(
+                method=method.upper(),
+                path=path if path is not None else self.path,
+                qargs=qargs if qargs is not None else dict(),
+                fragment=fragment,
+                headers=headers,
+                body=body if body is not None else b'',
+            )
+        )
+        self.pool.queue(self)
+
+    def respond(self):
+        """Pops and returns the next response, if any, as a Response namedtuple"""
+        if self.responses:
+            return http.clienting.Client.attrify(self.responses.popleft())
+        return None
+
+
+class PooledHTTPMessenger(agenting.HTTPMessenger):
+    """HTTPMessenger sending its messages over the connection pool instead of a connection of its own"""
+
+    def __init__(self, hab, wit, url, pool, msgs=None, sent=None, auth=None, **kwa):
+        super(PooledHTTPMessenger, self).__init__(hab=hab, wit=wit, url=url, msgs=msgs, sent=sent, auth=auth, **kwa)
+        # the pool connects, so the client of the parent is replaced and its ClientDoer dropped before ever running
+        self.client = pool.client(url, eid=wit)
+        self.doers = [doer for doer in self.doers if not isinstance(doer, http.clienting.ClientDoer)]
+
+
+class ConnectionPool(doing.Doer):
+    """
+    Keep-alive HTTP connections shared by all messengers, keyed by endpoint.
+
+    At most per_host connections are open to any one endpoint and requests beyond them wait for a
+    connection to finish its current request. A request not answered within timeout seconds gets an
+    errored response and its connection is closed. Connections idle for longer than keepalive
+    seconds, and connections the far side closed, are evicted. While installed, keri messengers for HTTP
+    endpoints are created as PooledHTTPMessengers.
+    """
+
+    active = None  # the installed pool, only one at a time since the patch is process wide
+
+    def __init__(self, per_host=4, keepalive=30.0, timeout=30.0, tracker=None, install=False, **kwa):
+        """
+        Parameters:
+            per_host (int): maximum number of open connections to one endpoint
+            keepalive (float): seconds an idle connection is kept open for reuse
+            timeout (float): seconds a request may wait for its response
+            tracker (WitnessTracker): records the round trip time or error of each request by endpoint provider
+            install (bool): installs the pool while the doer runs
+        """
+        self.per_host = per_host
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.tracker = tracker
+        self.autoinstall = install
+        self.connections = dict()  # endpoint key to list of open Connections
+        self.waiting = dict()  # endpoint key to deque of PooledClients with unsent requests
+        self.stats = dict(requests=0, opened=0, reused=0, timeouts=0, evicted=0, closed=0)
+        self._messengerFrom = None
+        super(ConnectionPool, self).__init__(**kwa)
+
+    @property
+    def idle(self):
+        return not any(self.waiting.values()) and not any(
+            conn.patron is not None for conns in self.connections.values() for conn in conns
+        )
+
+    @property
+    def installed(self):
+        return ConnectionPool.active is self
+
+    def install(self):
+        """Patches keri to create messengers for HTTP endpoints on this pool. Returns self."""
+        if ConnectionPool.active is not None:
+            raise RuntimeError('A ConnectionPool is already installed')
+
+        pool = self
+        messengerFrom = agenting.messengerFrom
+
+        def pooledMessengerFrom(hab, pre, urls, auth=None):
+            if kering.Schemes.http in urls or kering.Schemes.https in urls:
+                url = urls[kering.Schemes.http] if kering.Schemes.http in urls else urls[kering.Schemes.https]
+                return PooledHTTPMessenger(hab=hab, wit=pre, url=url, pool=pool, auth=auth)
+            return messengerFrom(hab, pre, urls, auth)
+
+        self._messengerFrom = messengerFrom
+        agenting.messengerFrom = pooledMessengerFrom
+        ConnectionPool.active = self
+        logger.info('Connection pool installed')
+        return self
+
+    def uninstall(self):
+        """Restores keri's own messengers"""
+        if not self.installed:
+            return
+        agenting.messengerFrom = self._messengerFrom
+        ConnectionPool.active = None
+        logger.info('Connection pool uninstalled')
+
+    def client(self, url, eid=None):
+        """Returns a PooledClient for the endpoint of url, served by the endpoint provider eid when known"""
+        up = urlparse(url)
+        if up.scheme not in (kering.Schemes.http, kering.Schemes.https):
+            raise ValueError(f'invalid scheme {up.scheme} for a pooled connection')
+        return PooledClient(pool=self, key=endpoint(url), path=up.path or '/', eid=eid)
+
+    def queue(self, patron):
+        self.stats['requests'] += 1
+        waiting = self.waiting.setdefault(patron.key, deque())
+        if patron not in waiting:
+            waiting.append(patron)
+
+    def wind(self, tymth):
+        super(ConnectionPool, self).wind(tymth)
+        for conns in self.connections.values():
+            for conn in conns:
+                conn.client.wind(tymth)
+
+    def enter(self):
+        if self.autoinstall:
+            if ConnectionPool.active is None:
+                self.install()
+            else:
+                logger.warning('Another ConnectionPool is installed, messengers will not use this one')
+
+    def recur(self, tyme):
+        self.dispatch()
+        for conns in self.connections.values():
+            for conn in conns:
+                conn.client.service()
+        self.reap()
+        self.evict()
+
+    def exit(self):
+        self.uninstall()
+        for conns in self.connections.values():
+            for conn in conns:
+                conn.client.close()
+        self.connections.clear()
+
+    def dispatch(self):
+        """Sends the next request of each waiting client over an idle or new connection to its endpoint"""
+        for key, waiting in self.waiting.items():
+            while waiting:
+                conn = self.acquire(key)
+                if conn is None:
+                    break
+                patron = waiting.popleft()
+                conn.patron = patron
+                conn.sent = time.monotonic()
+                conn.client.requests.append(dict(patron.requests[0]))
+
+    def acquire(self, key):
+        """Returns an idle connection to key, opening one when below per_host, or None"""
+        conns = self.connections.setdefault(key, [])
+        for conn in conns:
+            if conn.patron is None:
+                self.stats['reused'] += 1
+                return conn
+
+        if len(conns) >= self.per_host:
+            return None
+
+        scheme, hostname, port = key
+        client = http.clienting.Client(scheme=scheme, hostname=hostname, port=port)
+        if self.tymth:
+            client.wind(self.tymth)
+        client.reopen()
+        conn = Connection(key=key, client=client)
+        conns.append(conn)
+        self.stats['opened'] += 1
+        return conn
+
+    def reap(self):
+        """Hands responses to the clients that requested them and times out unanswered requests"""
+        now = time.monotonic()
+        for conns in self.connections.values():
+            for conn in list(conns):
+                if conn.patron is None:
+                    continue
+
+                if conn.client.responses:
+                    self.answer(conn, conn.client.responses.popleft())
+                    if conn.broken:
+                        self.retire(conn)
+                elif now - conn.sent > self.timeout:
+                    logger.info(f'Request to {conn.key[1]}:{conn.key[2]} timed out after {self.timeout}s')
+                    self.stats['timeouts'] += 1
+                    self.answer(conn, self.timedout(conn.patron.requests[0]))
+                    self.retire(conn)
+
+    def answer(self, conn, response):
+        patron = conn.patron
+        if self.tracker is not None and patron.eid is not None:
+            if response['errored'] or response['status'] is None or response['status'] >= 500:
+                self.tracker.failure(patron.eid, response['error'] or f'HTTP {response["status"]} {response["reason"]}')
+            else:
+                self.tracker.success(patron.eid, time.monotonic() - conn.sent)
+        patron.requests.popleft()
+        patron.responses.append(response)
+        conn.patron = None
+        conn.served += 1
+        conn.used = time.monotonic()
+        if patron.requests:
+            self.waiting.setdefault(conn.key, deque()).append(patron)
+
+    @staticmethod
+    def timedout(request):
+        """Returns the errored response given to a request not answered in time"""
+        return dict(
+            version=None,
+            status=None,
+            reason='Timeout',
+            headers=Hict(),
+            body=bytearray(),
+            data=None,
+            request=request,
+            errored=True,
+            error='request timed out',
+        )
+
+    def evict(self):
+        """Closes connections idle for longer than keepalive"""
+        now = time.monotonic()
+        for conns in self.connections.values():
+            for conn in list(conns):
+                if conn.patron is None and (now - conn.used > self.keepalive or conn.client.connector.cutoff):
+                    self.retire(conn)
+                    self.stats['evicted'] += 1
+
+    def retire(self, conn):
+        conn.client.close()
+        self.connections[conn.key].remove(conn)
+        self.stats['closed'] += 1
@@ -0,0 +1,218 @@
+"""
+Profiling module for the Wallet application
+
+Opt-in instrumentation of the hio Doist and DoDoer recur cycles recording wall time, call count,
+and p50/p99 latency for each doer in the Agent's doer tree, including doers extended dynamically
+at runtime such as witness messengers, QueryDoer, and SeqNoQuerier.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from hio.base import doing
+
+logger = logging.getLogger('wallet')
+
+ROOT = 'Doist'
+
+
+class DoerStats:
+    """Timing statistics for all runs of the doers found at one path in the doer tree"""
+
+    def __init__(self, path, samples=2048):
+        self.path = path
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=samples)  # most recent run times for percentiles
+        self.lock = threading.Lock()  # recorded on the agent thread, summarized from any thread
+
+    def record(self, elapsed):
+        with self.lock:
+            self.count += 1
+            self.total += elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+            self.samples.append(elapsed)
+
+    @staticmethod
+    def percentile(ordered, pct):
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def summary(self):
+        """Returns a dict of the statistics for this path with times in milliseconds"""
+        with self.lock:
+            samples, count, total, top = list(self.samples), self.count, self.total, self.max
+        ordered = sorted(samples)
+        return dict(
+            path=self.path,
+            count=count,
+            total_ms=total * 1000,
+            mean_ms=(total / count) * 1000 if count else 0.0,
+            p50_ms=self.percentile(ordered, 0.50) * 1000,
+            p99_ms=self.percentile(ordered, 0.99) * 1000,
+            max_ms=top * 1000,
+        )
+
+
+class TimedDog:
+    """
+    Proxy for a doer's generator (dog) that times each .send() into the dog.
+
+    Times are inclusive, a DoDoer's time includes the time of the doers it runs.
+    """
+
+    __slots__ = ('dog', 'path', 'profiler')
+
+    def __init__(self, dog, path, profiler):
+        self.dog = dog
+        self.path = path
+        self.profiler = profiler
+
+    def send(self, tyme):
+        stack = self.profiler.stack
+        stack.append(self.path)
+        start = time.perf_counter()
+        try:
+            return self.dog.send(tyme)
+        finally:
+            self.profiler.record(self.path, time.perf_counter() - start)
+            stack.pop()
+
+    def close(self):
+        return self.dog.close()
+
+    def throw(self, *args):
+        return self.dog.throw(*args)
+
+
+def doer_name(doer):
+    """Name of a doer for its profile path, the class name for Doers or the function name for doified generators"""
+    if isinstance(doer, doing.Doer):
+        return type(doer).__name__
+    return getattr(doer, '__name__', type(doer).__name__)
+
+
+class DoerProfiler:
+    """
+    Records recur timing for every doer run by a Doist and its nested DoDoers.
+
+    Installing the profiler patches doing.Doist.recur and doing.DoDoer.recur so that, before each
+    cycle, any deed not yet instrumented has its dog wrapped in a TimedDog. Doers are keyed by
+    their path in the doer tree, for example Doist/Agent/Querier/QueryDoer, so all dynamically
+    extended instances of a doer under the same parent aggregate together.
+    """
+
+    active = None  # the installed profiler, only one at a time since the patch is process wide
+
+    def __init__(self, path=None, samples=2048):
+        """
+        Parameters:
+            path (str): file to dump the profile to on shutdown, if any
+            samples (int): number of most recent run times kept per doer for percentiles
+        """
+        self.path = path
+        self.samples = samples
+        self.stats = dict()
+        self.stack = []
+        self.started = None
+        self.lock = threading.Lock()
+        self._doist_recur = None
+        self._dodoer_recur = None
+
+    @property
+    def installed(self):
+        return DoerProfiler.active is self
+
+    def install(self):
+        """Patches the Doist and DoDoer recur methods to instrument doers. Returns self."""
+        if DoerProfiler.active is not None:
+            raise RuntimeError('A DoerProfiler is already installed')
+
+        profiler = self
+        doist_recur = doing.Doist.recur
+        dodoer_recur = doing.DoDoer.recur
+
+        def recur_doist(doist, deeds=None):
+            profiler.instrument(doist.deeds if deeds is None else deeds)
+            start = time.perf_counter()
+            try:
+                return doist_recur(doist, deeds)
+            finally:
+                profiler.record(ROOT, time.perf_counter() - start)
+
+        def recur_dodoer(dodoer, tyme, deeds=None):
+            profiler.instrument(dodoer.deeds if deeds is None else deeds)
+            return dodoer_recur(dodoer, tyme, deeds)
+
+        self._doist_recur = doist_recur
+        self._dodoer_recur = dodoer_recur
+        doing.Doist.recur = recur_doist
+        doing.DoDoer.recur = recur_dodoer
+        DoerProfiler.active = self
+        self.started = time.monotonic()
+        logger.info('Doer profiler installed')
+        return self
+
+    def uninstall(self):
+        """Restores the original Doist and DoDoer recur methods"""
+        if not self.installed:
+            return
+        doing.Doist.recur = self._doist_recur
+        doing.DoDoer.recur = self._dodoer_recur
+        DoerProfiler.active = None
+        logger.info('Doer profiler uninstalled')
+
+    def instrument(self, deeds):
+        """Wraps the dog of each deed not yet instrumented with a TimedDog"""
+        parent = self.stack[-1] if self.stack else ROOT
+        for idx, (dog, retyme, doer) in enumerate(deeds):
+            if dog is not None and not isinstance(dog, TimedDog):
+                deeds[idx] = (TimedDog(dog, f'{parent}/{doer_name(doer)}', self), retyme, doer)
+
+    def record(self, path, elapsed):
+        stats = self.stats.get(path)
+        if stats is None:
+            with self.lock:
+                stats = self.stats.setdefault(path, DoerStats(path, samples=self.samples))
+        stats.record(elapsed)
+
+    def snapshot(self):
+        """
+        Returns a live snapshot of the profile, safe to call from any thread.
+
+        Returns:
+            list: dicts of path, count, total_ms, mean_ms, p50_ms, p99_ms and max_ms sorted by total time
+        """
+        with self.lock:
+            stats = list(self.stats.values())
+        return sorted((stat.summary() for stat in stats), key=lambda s: s['total_ms'], reverse=True)
+
+    def reset(self):
+        with self.lock:
+            self.stats = dict()
+        self.started = time.monotonic()
+
+    def dump(self, path=None):
+        """Writes the profile snapshot as JSON to path, defaulting to .path. Returns the path written."""
+        path = path if path is not None else self.path
+        if path is None:
+            return None
+
+        elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+        with open(path, 'w') as f:
+            json.dump(dict(elapsed=elapsed, doers=self.snapshot()), f, indent=2)
+        logger.info(f'Doer profile written to {path}')
+        return path
+
+    def log(self, top=10):
+        for stat in self.snapshot()[:top]:
+            logger.info(
+                f'{stat["path"]}: count={stat["count"]} total={stat["total_ms"]:.1f}ms '
+                f'p50={stat["p50_ms"]:.3f}ms p99={stat["p99_ms"]:.3f}ms max={stat["max_ms"]:.3f}ms'
+            )
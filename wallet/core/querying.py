@@ -0,0 +1,197 @@
+"""
+Querying module for the Wallet application
+
+Key state query engine. Query requests pushed onto the Agent's queries deck are coalesced by
+(kind, src, pre, sn or anchor) so duplicate requests share a single query doer, the number of
+queries in flight to any one witness is capped, and each query completes the
+('query', kind, src, pre, ...) operation when it finishes.
+"""
+
+import logging
+import time
+from collections import deque
+
+from hio.base import doing
+from keri.app import querying
+
+from wallet.core.operating import OperationTimeoutError
+
+logger = logging.getLogger('wallet')
+
+
+def query_key(msg):
+    """
+    Returns the coalescing key of a query request, requests with equal keys share one query.
+
+    Parameters:
+        msg (dict): query request with 'src' and 'pre' and optionally 'sn' or 'anchor'
+    """
+    if 'sn' in msg:
+        return 'sn', msg['src'], msg['pre'], int(msg['sn'])
+    if 'anchor' in msg:
+        return 'anchor', msg['src'], msg['pre'], tuple(sorted(msg['anchor'].items()))
+    return 'ksn', msg['src'], msg['pre']
+
+
+class Query:
+    """
+    A coalesced key state query.
+
+    Attributes:
+        key (tuple): coalescing key from query_key
+        msg (dict): first query request received for the key
+        requests (int): number of requests coalesced into this query
+        wit (str): witness the query was sent to, None when routed by endpoint role
+        doer (Doer): running keri query doer, None while queued
+        queued (float): monotonic time the first request was received
+        deadline (float): monotonic time after which the running query times out
+    """
+
+    def __init__(self, key, msg):
+        self.key = key
+        self.msg = msg
+        self.requests = 1
+        self.wit = None
+        self.doer = None
+        self.queued = time.monotonic()
+        self.deadline = None
+
+
+class Querier(doing.DoDoer):
+    """
+    Processes key state query requests from the queries deck.
+
+    All queued requests are drained every cycle, duplicates of a queued or running query are
+    coalesced into it, and at most max_per_witness queries run against any one witness at a time.
+    Requests for a prefix without a known KEL are routed by endpoint role and share one lane.
+    """
+
+    def __init__(self, hby, queries, kvy, operations=None, max_per_witness=2, timeout=60.0):
+        """
+        Parameters:
+            hby (Habery): Habery with the KELs being queried
+            queries (Deck): query requests, see make_query
+            kvy (Kevery): Kevery whose cues report saved key state notices
+            operations (Operations): completes the ('query', *key) operation of each query
+            max_per_witness (int): maximum number of queries running against one witness
+            timeout (float): seconds a running query may take before it is abandoned
+        """
+        self.hby = hby
+        self.queries = queries
+        self.kvy = kvy
+        self.operations = operations
+        self.max_per_witness = max_per_witness
+        self.timeout = timeout
+        self.pending = dict()  # query key to Query, queued or running
+        self.waiting = deque()  # keys of queued Queries in arrival order
+        self.running = []  # running Queries
+        self.load = dict()  # witness prefix, None for endpoint routing, to number of running queries
+        self.stats = dict(requests=0, coalesced=0, started=0, completed=0, timeouts=0)
+
+        super(Querier, self).__init__(always=True)
+
+    @property
+    def idle(self):
+        return not self.queries and not self.pending
+
+    def recur(self, tyme, deeds=None):
+        """Coalesces all queued query requests, starts those with a free witness and reaps finished queries"""
+        while self.queries:
+            self.enqueue(self.queries.popleft())
+
+        self.dispatch()
+        done = super(Querier, self).recur(tyme, deeds)
+        self.reap()
+
+        return done
+
+    def enqueue(self, msg):
+        self.stats['requests'] += 1
+        key = query_key(msg)
+        if (query := self.pending.get(key)) is not None:
+            query.requests += 1
+            self.stats['coalesced'] += 1
+            return
+
+        self.pending[key] = Query(key=key, msg=msg)
+        self.waiting.append(key)
+
+    def dispatch(self):
+        """Starts queued queries in arrival order while their witnesses are below the concurrency cap"""
+        for _ in range(len(self.waiting)):
+            query = self.pending[self.waiting.popleft()]
+            wits = self.witnesses(query.msg['pre'])
+            lanes = [wit for wit in (wits or [None]) if self.load.get(wit, 0) < self.max_per_witness]
+            if not lanes:
+                self.waiting.append(query.key)
+                continue
+
+            query.wit = min(lanes, key=lambda wit: self.load.get(wit, 0))
+            try:
+                query.doer = self.spawn(query.msg, wits=[query.wit] if query.wit is not None else None)
+            except Exception as ex:
+                logger.error(f'Query {query.key} failed to start: {ex}')
+                self.finish(query, ex)
+                continue
+
+            logger.info(f'Querying from {query.msg["src"]} for key state from {query.msg["pre"]}...')
+            query.deadline = time.monotonic() + self.timeout
+            self.load[query.wit] = self.load.get(query.wit, 0) + 1
+            self.running.append(query)
+            self.stats['started'] += 1
+            self.extend([query.doer])
+
+    def reap(self):
+        """Completes queries whose doer finished and abandons those past their deadline"""
+        now = time.monotonic()
+        for query in list(self.running):
+            if query.doer.done:
+                self.finish(query)
+            elif now > query.deadline:
+                logger.info(f'Query {query.key} timed out after {self.timeout}s')
+                self.finish(query, OperationTimeoutError(f'Query {query.key} timed out'))
+
+    def finish(self, query, ex=None):
+        del self.pending[query.key]
+        if query.doer is not None:
+            self.running.remove(query)
+            self.load[query.wit] -= 1
+            self.remove([query.doer])
+
+        if ex is None:
+            self.stats['completed'] += 1
+            logger.info(f'Query {query.key} completed for {query.requests} request(s)')
+        elif isinstance(ex, OperationTimeoutError):
+            self.stats['timeouts'] += 1
+
+        if self.operations is not None:
+            if ex is None:
+                self.operations.complete(('query', *query.key), query.msg)
+            else:
+                self.operations.fail(('query', *query.key), ex)
+
+    def witnesses(self, pre):
+        """Returns the current witnesses of pre, empty when the KEL of pre is unknown"""
+        kever = self.hby.kevers.get(pre)
+        return list(kever.wits) if kever is not None else []
+
+    def spawn(self, msg, wits=None):
+        """
+        Returns the keri query doer for a query request, its queries pinned to wits when given
+
+        Raises:
+            ValueError: when msg names an unknown local identifier as its source
+        """
+        if (hab := self.hby.habByName(msg['src'])) is None:
+            raise ValueError(f'unknown local identifier {msg["src"]}')
+
+        if 'sn' in msg:
+            doer = querying.SeqNoQuerier(hby=self.hby, hab=hab, pre=msg['pre'], sn=int(msg['sn']), wits=wits)
+        elif 'anchor' in msg:
+            doer = querying.AnchorQuerier(hby=self.hby, hab=hab, pre=msg['pre'], anchor=msg['anchor'])
+        else:
+            doer = querying.KeyStateNoticer(hby=self.hby, hab=hab, pre=msg['pre'], cues=self.kvy.cues)
+
+        for qry in doer.witq.msgs:
+            qry['wits'] = wits
+        return doer
@@ -0,0 +1,159 @@
+"""
+Scheduling module for the Wallet application
+
+Supports the adaptive HioTask scheduling mode where the Doist loop backs off while the Agent is
+idle and is woken up immediately when work is pushed onto any of the Agent's Decks.
+"""
+
+import asyncio
+import logging
+import time
+
+from hio.help import decking
+
+logger = logging.getLogger('wallet')
+
+
+class Waker:
+    """
+    Thread-safe wake-up signal for an asyncio loop running a HioTask.
+
+    Any thread may call .wake(). The waiting HioTask coroutine is resumed on its own loop.
+    Wake-ups sent before a loop is bound are remembered and delivered on the first .wait().
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.event = None
+        self.pending = False
+        self.wakes = 0
+
+    def bind(self, loop=None):
+        """Binds this Waker to the loop of the HioTask waiting on it, defaults to the running loop"""
+        self.loop = loop if loop is not None else asyncio.get_running_loop()
+        self.event = asyncio.Event()
+        if self.pending:
+            self.event.set()
+
+    def wake(self):
+        """Wakes up the waiting HioTask. Safe to call from any thread."""
+        self.wakes += 1
+        if self.loop is None or self.loop.is_closed():
+            self.pending = True
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+    async def wait(self, timeout):
+        """
+        Waits up to timeout seconds for a wake-up.
+
+        Returns:
+            bool: True if woken up before the timeout expired, False otherwise
+        """
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.event.clear()
+            self.pending = False
+
+
+class WakeDeck(decking.Deck):
+    """
+    Deck that wakes up its Waker whenever an element is added to it so an idle Agent resumes
+    processing immediately rather than on its next backoff interval.
+    """
+
+    def __init__(self, iterable=(), maxlen=None, waker=None):
+        super(WakeDeck, self).__init__(iterable, maxlen)
+        self.waker = waker
+
+    def _wake(self):
+        if self.waker is not None:
+            self.waker.wake()
+
+    def append(self, elem):
+        super(WakeDeck, self).append(elem)
+        self._wake()
+
+    def appendleft(self, elem):
+        super(WakeDeck, self).appendleft(elem)
+        self._wake()
+
+    def extend(self, iterable):
+        super(WakeDeck, self).extend(iterable)
+        self._wake()
+
+    def extendleft(self, iterable):
+        super(WakeDeck, self).extendleft(iterable)
+        self._wake()
+
+
+class IdleBackoff:
+    """
+    Exponential backoff for idle Doist cycles.
+
+    Each consecutive idle cycle doubles the sleep interval starting from tock up to a maximum
+    of max_tock. Any non-idle cycle or wake-up resets the interval.
+    """
+
+    def __init__(self, tock=0.03125, max_tock=1.0, factor=2.0):
+        self.tock = tock
+        self.max_tock = max(tock, max_tock)
+        self.factor = factor
+        self.idles = 0
+
+    def next(self):
+        """Returns the next sleep interval in seconds and advances the backoff"""
+        interval = min(self.tock * (self.factor**self.idles), self.max_tock)
+        if interval < self.max_tock:
+            self.idles += 1
+        return interval
+
+    def reset(self):
+        self.idles = 0
+
+
+def inflight(doer):
+    """
+    Returns True when a doer, or any doer it is running as a DoDoer, reports work in progress.
+
+    Doers report work in progress with a boolean .idle attribute or property, such as the
+    messengers keri creates for each witness or mailbox connection.
+    """
+    if getattr(doer, 'idle', None) is False:
+        return True
+
+    for _, _, sub in getattr(doer, 'deeds', ()):
+        if inflight(sub):
+            return True
+
+    return False
+
+
+class IdleStats:
+    """Counters for time spent sleeping while idle, used for logging and benchmarks"""
+
+    def __init__(self):
+        self.cycles = 0
+        self.idle_cycles = 0
+        self.wakes = 0
+        self.slept = 0.0
+        self.started = time.monotonic()
+
+    def __repr__(self):
+        return (
+            f'IdleStats(cycles={self.cycles}, idle_cycles={self.idle_cycles}, wakes={self.wakes}, '
+            f'slept={self.slept:.3f}s, elapsed={time.monotonic() - self.started:.3f}s)'
+        )
@@ -1,15 +1,19 @@
 import logging
-import sys
+import random
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 
 from hio.base import doing
 from keri.app import agenting as keriAgenting
 from keri.app import connecting, habbing
 from keri.app.cli.commands.local.watch import States, WatchDoer
 from keri.app.habbing import GroupHab, Hab
+from keri.core import coring, eventing
+from keri.db.basing import KeyStateRecord
 
-from wallet.core.agent_events import AgentEventTypes
+from wallet.core.operating import OperationTimeoutError
 
 logger = logging.getLogger('wallet')
 
@@ -54,13 +58,339 @@ class WitnessUpdate:
     wit_pre: str
 
 
+class UpdateRegistry:
+    """
+    Collection of AidKelUpdate or WitnessUpdate objects keyed by (aid, wit_pre, sn) with an index
+    by AID, for O(1) insert, lookup and removal. Putting an update replaces the one with the same
+    key. Subscribers are called with the AID whenever the updates of that AID change.
+
+    Written on the agent thread and safe to read from the UI thread.
+    """
+
+    def __init__(self):
+        self.updates = dict()  # (aid, wit_pre, sn) to update
+        self.aids = dict()  # AID to dict of its update keys, in insertion order
+        self.subscribers = []
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def key(update):
+        return update.aid, update.wit_pre, update.sn
+
+    def __len__(self):
+        return len(self.updates)
+
+    def __bool__(self):
+        return bool(self.updates)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.updates.values()))
+
+    def __contains__(self, aid):
+        return aid in self.aids
+
+    def get(self, aid, wit_pre, sn):
+        return self.updates.get((aid, wit_pre, sn))
+
+    def first(self, aid):
+        """Returns the earliest update for aid still registered, None if there is none"""
+        with self.lock:
+            keys = self.aids.get(aid)
+            return self.updates[next(iter(keys))] if keys else None
+
+    def forAid(self, aid):
+        with self.lock:
+            return [self.updates[key] for key in self.aids.get(aid, ())]
+
+    def put(self, update):
+        """Adds or replaces update, returns True if the updates changed"""
+        key = self.key(update)
+        with self.lock:
+            if self.updates.get(key) == update:
+                return False
+            self.updates[key] = update
+            self.aids.setdefault(update.aid, dict())[key] = None
+        self.notify(update.aid)
+        return True
+
+    def replace(self, aid, updates):
+        """Makes updates the only updates for aid, returns True if the updates changed"""
+        keys = {self.key(update): update for update in updates}
+        with self.lock:
+            current = {key: self.updates[key] for key in self.aids.get(aid, ())}
+            if current == keys:
+                return False
+            for key in current:
+                del self.updates[key]
+            self.updates.update(keys)
+            if keys:
+                self.aids[aid] = dict.fromkeys(keys)
+            else:
+                self.aids.pop(aid, None)
+        self.notify(aid)
+        return True
+
+    def discard(self, aid):
+        """Removes all updates for aid, returns True if there were any"""
+        with self.lock:
+            keys = self.aids.pop(aid, None)
+            for key in keys or ():
+                del self.updates[key]
+        if keys:
+            self.notify(aid)
+        return bool(keys)
+
+    def subscribe(self, fn):
+        """Calls fn(aid) on the agent thread whenever the updates of aid change"""
+        self.subscribers.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self.subscribers:
+            self.subscribers.remove(fn)
+
+    def notify(self, aid):
+        for fn in list(self.subscribers):
+            try:
+                fn(aid)
+            except Exception:
+                logger.exception(f'Update subscriber failed for {aid}')
+
+
+@dataclass
+class WitnessKeyState:
+    """
+    Latest key state notice received from a witness for an AID.
+
+    Attributes:
+        ksr (KeyStateRecord): key state reported by the witness
+        saider (Saider): SAID of the reported latest event
+        generation (int): WitnessStates generation the notice was received in
+    """
+
+    ksr: object
+    saider: object
+    generation: int
+
+
+class WitnessStates:
+    """
+    In memory side table of the latest key state notice received from each witness of each AID.
+
+    Every notice received bumps the generation counter, so a reader records .generation before
+    sending a ksn query and recognizes the answer by a newer generation, without removing the
+    stored knas and ksns records first.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.states = dict()  # (pre, wit) to WitnessKeyState
+
+    def put(self, pre, wit, ksr, saider):
+        self.generation += 1
+        self.states[(pre, wit)] = WitnessKeyState(ksr=ksr, saider=saider, generation=self.generation)
+        return self.states[(pre, wit)]
+
+    def get(self, pre, wit):
+        return self.states.get((pre, wit))
+
+    def fresh(self, pre, wit, since):
+        """Returns the WitnessKeyState for (pre, wit) if received after generation since, otherwise None"""
+        state = self.states.get((pre, wit))
+        return state if state is not None and state.generation > since else None
+
+
+class WitnessKevery(eventing.Kevery):
+    """
+    Kevery recording each key state notice in a WitnessStates side table. The knas, ksns and kdts
+    records are only written when the key state reported by the source changed.
+
+    A notice older than the local KEL is recorded too, since keri skips it as stale before
+    updateKeyState. It still answers the ksn query of a witness that is behind, one to catch up,
+    once it passes the same source and reply signature checks keri applies to a current notice.
+    """
+
+    def __init__(self, witstates, **kwa):
+        self.witstates = witstates
+        super(WitnessKevery, self).__init__(**kwa)
+
+    def processReplyKeyStateNotice(self, *, serder, saider, route, cigars=None, tsgs=None, **kwargs):
+        try:
+            ksr = KeyStateRecord._fromdict(d=serder.ked['a'])
+        except Exception:
+            ksr = None  # malformed, rejected by keri
+        if ksr is not None and ksr.i in self.kevers and int(ksr.s, 16) < self.kevers[ksr.i].sner.num:
+            self.recordStaleNotice(
+                serder=serder, saider=saider, route=route, aid=kwargs['aid'], ksr=ksr, cigars=cigars, tsgs=tsgs
+            )
+        return super(WitnessKevery, self).processReplyKeyStateNotice(
+            serder=serder, saider=saider, route=route, cigars=cigars, tsgs=tsgs, **kwargs
+        )
+
+    def recordStaleNotice(self, serder, saider, route, aid, ksr, cigars=None, tsgs=None):
+        """Records a stale key state notice from aid when its source is trusted and its reply verifies"""
+        if self.rvy is None:
+            return  # no reply signatures to verify against
+        if not self.lax:
+            wats = set()
+            for _, habr in self.db.habs.getItemIter():
+                wats |= set(habr.watchers)
+            if aid != ksr.i and aid not in ksr.b and aid not in wats:
+                return  # untrusted source, rejected by keri
+
+        osaider = self.db.knas.get(keys=(ksr.i, aid))
+        if self.rvy.acceptReply(
+            serder=serder,
+            saider=saider,
+            route=route,
+            aid=aid,
+            osaider=osaider,
+            cigars=cigars if cigars is not None else [],
+            tsgs=tsgs if tsgs is not None else [],
+        ):
+            self.witstates.put(pre=ksr.i, wit=aid, ksr=ksr, saider=coring.Saider(qb64=ksr.d))
+
+    def updateKeyState(self, aid, ksr, saider, dater):
+        self.witstates.put(pre=ksr.i, wit=aid, ksr=ksr, saider=saider)
+
+        osaider = self.db.knas.get(keys=(ksr.i, aid))
+        if osaider is not None and osaider.qb64 == saider.qb64 and self.db.ksns.get(keys=(saider.qb64,)) is not None:
+            return  # same state as already stored
+
+        super(WitnessKevery, self).updateKeyState(aid=aid, ksr=ksr, saider=saider, dater=dater)
+
+
+class WitnessProbe:
+    """
+    A ksn query of one witness for the key state of a hab.
+
+    Attributes:
+        hab (Hab): hab whose key state is queried
+        wit (str): witness prefix
+        witer (Doer): messenger sending the query, None once sent or timed out
+        sent (float): monotonic time the query was sent
+        generation (int): WitnessStates generation when the query was sent
+        deadline (float): monotonic time by which the witness must answer
+        state (WitnessState): difference between the local and witness key state once answered
+    """
+
+    def __init__(self, hab, wit):
+        self.hab = hab
+        self.wit = wit
+        self.witer = None
+        self.sent = None
+        self.generation = 0
+        self.deadline = None
+        self.state = None
+
+
+@dataclass
+class HabStates:
+    """
+    Witness states of a hab collected during a sync pass.
+
+    Attributes:
+        hab (Hab): the hab
+        remaining (int): number of witnesses yet to answer or time out
+        states (list): WitnessStates of the witnesses that answered
+    """
+
+    hab: Hab
+    remaining: int
+    states: list = field(default_factory=list)
+
+
+class WatchSchedule:
+    """
+    Per AID schedule of KEL watch checks.
+
+    Each AID has its own interval starting at .tock. An AID that stays in sync with its witnesses
+    backs off exponentially up to .max_tock, an AID that is out of sync or did not get an answer
+    goes back to .tock. Every next check time is jittered to spread witness load. A trigger makes an
+    AID due immediately.
+    """
+
+    def __init__(self, tock=7.5, max_tock=300.0, factor=2.0, jitter=0.1):
+        self.tock = tock
+        self.max_tock = max_tock
+        self.factor = factor
+        self.jitter = jitter
+        self.entries = dict()  # AID to WatchEntry
+
+    def track(self, aids, tyme):
+        """Tracks exactly aids, new AIDs are due immediately"""
+        for aid in set(self.entries) - set(aids):
+            del self.entries[aid]
+        for aid in aids:
+            if aid not in self.entries:
+                self.entries[aid] = WatchEntry(interval=self.tock, due=tyme)
+
+    def due(self, tyme):
+        """Returns the AIDs due for a check, marks them as checking"""
+        aids = []
+        for aid, entry in self.entries.items():
+            # a check that never reported back is retried after the longest interval
+            if entry.checking is not None and tyme - entry.checking < self.max_tock:
+                continue
+            if entry.due <= tyme:
+                entry.checking = tyme
+                aids.append(aid)
+        return aids
+
+    def trigger(self, tyme, aid=None):
+        """Makes aid, or every AID when None, due immediately at the shortest interval"""
+        for key in [aid] if aid is not None else list(self.entries):
+            if (entry := self.entries.get(key)) is not None:
+                entry.interval = self.tock
+                entry.due = tyme
+                entry.checking = None
+
+    def checked(self, aid, in_sync, tyme):
+        """Schedules the next check of aid after a check completed"""
+        if (entry := self.entries.get(aid)) is None:
+            return
+        entry.interval = min(entry.interval * self.factor, self.max_tock) if in_sync else self.tock
+        entry.due = tyme + entry.interval * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        entry.checking = None
+
+
+@dataclass
+class WatchEntry:
+    """
+    Schedule of one AID in a WatchSchedule.
+
+    Attributes:
+        interval (float): seconds between checks
+        due (float): tyme of the next check
+        checking (float): tyme the running check started, None when not checking
+    """
+
+    interval: float
+    due: float
+    checking: float = None
+
+
 class KELStateReader(doing.DoDoer):
     """
     Observes and synchronizes key state for AIDs based on their witnesses.
     This performs the equivalent of the `kli local watch` and `kli multisig update` commands.
     """
 
-    def __init__(self, app, hby, watch_reqs, aid_updates, wit_updates, dup_evts, **kwa):
+    def __init__(
+        self,
+        app,
+        hby,
+        watch_reqs,
+        aid_updates,
+        wit_updates,
+        dup_evts,
+        witstates,
+        watched=None,
+        tracker=None,
+        limit=8,
+        timeout=20.0,
+        **kwa,
+    ):
         """
         Creates a SyncerDoer that monitors witnesses with MailboxDirector and sends KEL updates using
         a Poster based on reading all witnesses for all AIDs for the local Agency's Habery.
@@ -68,10 +398,15 @@ class KELStateReader(doing.DoDoer):
         Parameters:
             app (WalletApp): Wallet application instance
             hby (habbing.Habery): Instance of Habery containing all AIDs to watch
-            watch_reqs (decking.Deck): List of AIDKelUpdate requests
-            aid_updates (decking.Deck): List of AidKelUpdate objects
-            wit_updates (decking.Deck): List of WitnessUpdate objects
-            dup_evts (decking.Deck): List of AidKelUpdate objects for duplicitous events
+            watch_reqs (decking.Deck): watch requests, dict(aids=[...]) for some AIDs or dict() for all
+            aid_updates (UpdateRegistry): AidKelUpdate objects
+            wit_updates (UpdateRegistry): WitnessUpdate objects
+            dup_evts (UpdateRegistry): AidKelUpdate objects for duplicitous events
+            witstates (WitnessStates): key state notices received from witnesses
+            watched (decking.Deck): receives dict(aid=, in_sync=) for each AID checked
+            tracker (WitnessTracker): witness health, orders the queries and skips witnesses that are down
+            limit (int): maximum number of witness queries in flight at once
+            timeout (float): seconds each witness has to answer its ksn query
         """
         doers = []
         self.app = app
@@ -81,156 +416,151 @@ class KELStateReader(doing.DoDoer):
         self.aid_updates = aid_updates
         self.wit_updates = wit_updates
         self.dup_evts = dup_evts
+        self.witstates = witstates
+        self.watched = watched
+        self.tracker = tracker
+        self.limit = limit
+        self.timeout = timeout
+        self.syncing = False  # True while a sync pass is running
+        self.everything = False  # True when all AIDs are requested for the next sync pass
+        self.requested = set()  # AIDs requested for the next sync pass
 
         super(KELStateReader, self).__init__(doers=doers, always=True)
 
-    def add_if_not_exists(self, existing_items, new_items):
-        """Adds an item to a collection based on the .aid prop if it doesn't already exist.
-        should probably replace with a map.
-        Parameters:
-            existing_items (Deck): The collection to add to
-            new_items (Deck): The collection to add from
-        """
-        for new_item in new_items:
-            exists = False
-            for existing_item in existing_items:
-                if existing_item.aid == new_item.aid:
-                    exists = True
-            if not exists:
-                existing_items.append(new_item)
-
-    def syncDo(self, tymth, tock=0.0, **opts):
+    @property
+    def resync(self):
+        return self.everything or bool(self.requested)
+
+    def syncDo(self, tymth, tock=0.0, aids=None, **opts):
         """
         Reads KEL state from each witness for local Hab AIDs using the Habery from the Agent and
         posts an update to a queue for showing to the user and later processing.
+
+        Reads all watched habs, or only those in aids when given. The ksn queries for all habs and
+        witnesses are sent at once, at most .limit at a time, and the states of each hab are processed
+        as soon as all of its witnesses answered or timed out.
         """
         # DoDoer context setup
         self.wind(tymth)
         self.tock = tock
         _ = yield self.tock
 
-        # Read witness state for multisig AIDs only, should not have to catch up single sig AIDs
+        self.syncing = True
+        running = []
         try:
-            for hab in self.hby.habs.values():
-                logger.debug(f'Reading AID state for {hab.name} prefix {hab.pre}')
-                if len(hab.kever.wits) == 0:
-                    logger.debug(f'Hab {hab.name} has no witnesses, skipping...')
-                    continue
-                elif isinstance(hab, Hab):
-                    logger.debug(f'Hab {hab.name} is not multisig, skipping')
+            # Read witness state for multisig AIDs only, should not have to catch up single sig AIDs
+            habs = dict()
+            probes = deque()
+            for hab in self.watched_habs(aids):
+                wits = self.probed(hab.kever.wits)
+                if not wits:  # all witnesses down, nothing to compare with
+                    if self.watched is not None:
+                        self.watched.append(dict(aid=hab.pre, in_sync=False))
                     continue
-
-                states = yield from self.read_witness_states(hab)
-
-                aid_upd, wit_upd, dup_evts = self.process_states(states, hab)
-                self.add_if_not_exists(self.aid_updates, aid_upd)
-                self.add_if_not_exists(self.wit_updates, wit_upd)
-                self.add_if_not_exists(self.dup_evts, dup_evts)
+                habs[hab.pre] = HabStates(hab=hab, remaining=len(wits))
+                probes.extend(WitnessProbe(hab=hab, wit=wit) for wit in wits)
+
+            while probes or running:
+                while probes and len(running) < self.limit:
+                    probe = probes.popleft()
+                    probe.sent = time.monotonic()
+                    self.send_probe(probe, deadline=probe.sent + self.timeout)
+                    running.append(probe)
+
+                yield self.tock
+
+                now = time.monotonic()
+                for probe in [probe for probe in running if self.poll_probe(probe, now)]:
+                    running.remove(probe)  # the pool records the round trip or error with the tracker
+                    pending = habs[probe.hab.pre]
+                    pending.remaining -= 1
+                    if probe.state is not None:
+                        pending.states.append(probe.state)
+                    if pending.remaining == 0:
+                        aid_upd, wit_upd, dup_evts = self.process_states(pending.states, pending.hab)
+                        if pending.states:  # what the witnesses report now replaces what they reported before
+                            self.aid_updates.replace(pending.hab.pre, aid_upd)
+                            self.wit_updates.replace(pending.hab.pre, wit_upd)
+                            self.dup_evts.replace(pending.hab.pre, dup_evts)
+                        if self.watched is not None:
+                            in_sync = bool(pending.states) and not (aid_upd or wit_upd or dup_evts)
+                            self.watched.append(dict(aid=pending.hab.pre, in_sync=in_sync))
         except Exception as ex:
             logger.exception(f'Error reading KEL state: {ex}')
-            yield self.tock
             return
+        finally:
+            self.remove([probe.witer for probe in running if probe.witer is not None])
+            self.syncing = False
+
+    def probed(self, wits):
+        """Returns the witnesses to query, fastest and healthiest first, without those known to be down"""
+        if self.tracker is None:
+            return list(wits)
+        ranked = self.tracker.rank(wits)
+        skipped = [wit for wit in ranked if self.tracker.dead(wit)]
+        if skipped:
+            logger.info(f'Skipping witnesses known to be down: {", ".join(skipped)}')
+        return [wit for wit in ranked if wit not in skipped]
+
+    def watched_habs(self, aids=None):
+        """Returns the habs to read witness state for, multisig habs with witnesses, limited to aids when given"""
+        habs = []
+        for hab in self.hby.habs.values():
+            if aids is not None and hab.pre not in aids:
+                continue
+            logger.debug(f'Reading AID state for {hab.name} prefix {hab.pre}')
+            if len(hab.kever.wits) == 0:
+                logger.debug(f'Hab {hab.name} has no witnesses, skipping...')
+                continue
+            elif isinstance(hab, Hab):
+                logger.debug(f'Hab {hab.name} is not multisig, skipping')
+                continue
+            habs.append(hab)
+        return habs
+
+    def send_probe(self, probe, deadline):
+        """Sends the ksn query of a probe to its witness"""
+        hab, wit = probe.hab, probe.wit
+        logger.debug(f'KELState Reader: Prefix {hab.pre} checking witness {wit}')
+        probe.deadline = deadline
+        probe.generation = self.witstates.generation  # any later notice from the witness answers the query
 
-        self.app.page.run_task(self.update_identifier_page)
-
-    async def update_identifier_page(self):
-        # TODO use some better way to signal refresh of identifiers
-        #   this really breaks encapsulation
-        if self.app.layout.active_view == self.app.layout.identifiers:
-            self.app.page.run_task(self.app.layout.identifiers.refresh_identifiers)
+        probe.witer = keriAgenting.messenger(hab, wit)
+        self.extend([probe.witer])
 
-    def read_witness_states(self, hab):
-        """Read KEL state for each witness of an AID"""
-        states = []
-        for wit in hab.kever.wits:
-            state = yield from self.read_witness_state(hab, wit)
-            if state:
-                states.append(state)
-        return states
+        msg = hab.query(pre=hab.pre, src=wit, route='ksn')
+        probe.witer.msgs.append(bytearray(msg))
 
-    def read_witness_state(self, hab, wit):
+    def poll_probe(self, probe, now):
         """
-        Read the state of a KEL for a single witness
+        Checks a running probe for the witness response, sets probe.state to the WitnessState of the
+        witness or None when it does not answer before the deadline.
 
         Returns:
-            WitnessState
+            bool: True when the probe finished
         """
-        keys = (hab.pre, wit)
-        org = connecting.Organizer(hby=self.app.agent.hby)
-        contact = org.get(wit)
-        if contact is None:
-            alias = 'None'
-            logger.debug(f'KELStateReader no contact for witness {wit} in organizer')
-        else:
-            alias = contact['alias']
+        hab, wit = probe.hab, probe.wit
+        if probe.witer is not None and (probe.witer.idle or now > probe.deadline):
+            self.remove([probe.witer])
+            probe.witer = None
 
-        logger.debug(f'KELState Reader: Prefix {hab.pre} checking witness {wit}')
-
-        # Clear any existing key state from this witness in order to pull the latest
-        saider = hab.db.knas.get(keys)
-        temp_witstate = None
-        if saider is not None:
-            temp_witstate = hab.db.ksns.get((saider.qb64,))
-            self._clear_witness_keystate(hab, wit, saider)
-
-        witer = keriAgenting.messenger(hab, wit)
-        self.extend([witer])
-
-        msg = hab.query(pre=hab.pre, src=wit, route='ksn')
-        witer.msgs.append(bytearray(msg))
-
-        start = time.perf_counter()
-        while not witer.idle:
-            end = time.perf_counter()
-            if end - start > 10:
-                break
-
-            yield self.tock
-
-        self.remove([witer])
+        if (witstate := self.witstates.fresh(hab.pre, wit, since=probe.generation)) is not None:
+            logger.debug(f'Response received from {self.alias(wit)} | {wit}')
+            probe.state = WatchDoer.diffState(wit, hab.kever.state(), witstate.ksr)
+            return True
 
-        start = time.perf_counter()
-        skip = False
-        while True:
-            if (saider := hab.db.knas.get(keys)) is not None:
-                logger.debug(f'Response received from {alias} | {wit}')
-                break
+        if now > probe.deadline:
+            logger.error(f'No response received from {self.alias(wit)} | {wit}')
+            return True
 
-            end = time.perf_counter()
-            if end - start > 10:
-                logger.error(f'No response received from {alias} | {wit}')
-                sys.stdout.flush()
-                skip = True
-                # If we don't get a response from the witness then replace the old keystate
-                self._restore_witness_state(hab, wit, saider, temp_witstate)
-                break
-
-            yield self.tock
-
-        if skip:
-            return None
-
-        mystate = hab.kever.state()
-        witstate = hab.db.ksns.get((saider.qb64,))
-
-        return WatchDoer.diffState(wit, mystate, witstate)
-
-    def _clear_witness_keystate(self, hab, wit, saider):
-        """
-        Clear the witness key state from the database
-        """
-        keys = (hab.pre, wit)
-        hab.db.knas.rem(keys)
-        hab.db.ksns.rem((saider.qb64,))
+        return False
 
-    def _restore_witness_state(self, hab, wit, saider, temp_witstate):
-        """
-        Restore the witness state to the previous state if the witness does not respond
-        """
-        if temp_witstate is None:
-            raise ValueError('No previous witness state to restore')
-        hab.db.knas.pin(keys=(hab.pre, wit), val=saider)
-        hab.db.ksns.pin(keys=(saider.qb64,), val=temp_witstate)
+    def alias(self, wit):
+        contact = connecting.Organizer(hby=self.hby).get(wit)
+        if contact is None:
+            logger.debug(f'KELStateReader no contact for witness {wit} in organizer')
+            return 'None'
+        return contact['alias']
 
     @staticmethod
     def create_aid_duplicity(pre, state):
@@ -314,113 +644,168 @@ class KELStateReader(doing.DoDoer):
         return aid_updates, wit_updates, duplicitous
 
     def recur(self, tyme, deeds=None):
-        if self.watch_reqs:  # A single request is enough to re-request checking all AIDs.
+        while self.watch_reqs:
+            req = self.watch_reqs.popleft()
+            if 'aids' in req:
+                self.requested.update(req['aids'])
+            else:  # a single request without aids is enough to re-request checking all AIDs
+                self.everything = True
+
+        if self.resync and not self.syncing:  # one sync pass at a time
             logger.debug('Checking for KEL state updates')
-            self.extend([doing.doify(self.syncDo)])
-            self.watch_reqs.clear()
+            aids = None if self.everything else self.requested
+            self.everything = False
+            self.requested = set()
+            self.syncing = True
+            self.extend([doing.doify(self.syncDo, aids=aids)])
 
         return super(KELStateReader, self).recur(tyme, deeds)
 
 
+class CatchUp:
+    """
+    A KEL catch-up of a local AID to an event its witnesses reported.
+
+    Attributes:
+        aid (str): local AID, usually multisig, being caught up
+        sn (int): sequence number of the event to catch up to
+        said (str): SAID of the event to catch up to
+        wits (list): witnesses that reported the event, tried in order
+        attempt (int): index in wits of the witness currently queried
+        started (float): monotonic time the catch-up started
+        deadline (float): monotonic time by which the current witness must deliver the events
+    """
+
+    def __init__(self, aid, sn, said, wits):
+        self.aid = aid
+        self.sn = sn
+        self.said = said
+        self.wits = wits
+        self.attempt = 0
+        self.started = None
+        self.deadline = None
+
+    @property
+    def wit(self):
+        return self.wits[self.attempt]
+
+
 class KELStateUpdater(doing.DoDoer):
     """
     Updates the KEL with the most recent events for a local AID, usually multisig, that does not
     have the latest KEL events as compared with a set of witnesses.
+
+    Up to .limit AIDs are caught up in parallel. Only the events after the local sequence number are
+    requested. A witness that does not deliver them within .timeout seconds is replaced by the next
+    witness that reported the same event, and the catch-up fails when no witness is left. Completes
+    the ('kel_update', aid) operation with the duration of the catch-up or fails it.
     """
 
-    def __init__(self, app, hby, update_reqs):
-        doers = []
+    def __init__(self, app, hby, update_reqs, witstates, operations=None, tracker=None, limit=4, timeout=15.0):
         self.app = app
         self.hby = hby
         self.update_reqs = update_reqs
+        self.witstates = witstates
+        self.operations = operations
+        self.tracker = tracker
+        self.limit = limit
+        self.timeout = timeout
+        self.waiting = dict()  # AID to queued CatchUp
+        self.running = dict()  # AID to running CatchUp
+        self.durations = []  # seconds taken by completed catch-ups, most recent last
+        self.stats = dict(completed=0, failed=0, retries=0)
 
         self.witq = keriAgenting.WitnessInquisitor(hby=self.hby)
-        doers.extend([self.witq])
-        super(KELStateUpdater, self).__init__(doers=doers, always=True, tock=1.0)
-
-    async def update_identifier_page(self):
-        if self.app.layout.active_view == self.app.layout.identifiers:
-            identifiers = self.app.layout.identifiers
-            await identifiers.refresh_identifiers()
-            await self.app.page.dialog.close_confirm()
-            self.app.page.dialog = None
-            self.app.page.update()
-
-    def updateDo(self, tymth, tock=0.0, **opts):
-        # enter context
-        self.wind(tymth)
-        self.tock = tock
-        _ = yield self.tock
-
-        req = self.update_reqs.popleft()
-        logger.info(f'Processing KEL State update {req.aid}')
-
-        hab = self.hby.habByPre(req.aid)
-        pre = hab.pre
-        sn = req.sn
-        said = req.said
-        wit = req.wit_pre
-
-        keys = (pre, wit)
+        super(KELStateUpdater, self).__init__(doers=[self.witq], always=True, tock=1.0)
 
-        # Check for Key State from this Witness and remove if exists
-        logger.debug(f'Querying witness {wit}')
-        saider = hab.db.knas.get(keys)
-        if saider is not None:
-            hab.db.knas.rem(keys)
-            hab.db.ksns.rem((saider.qb64,))
+    @property
+    def idle(self):
+        return not self.update_reqs and not self.waiting and not self.running
 
-        witer = keriAgenting.messenger(hab, wit)
-        self.extend([witer])
+    def recur(self, tyme, deeds=None):
+        while self.update_reqs:
+            self.enqueue(self.update_reqs.popleft())
 
-        msg = hab.query(pre=pre, src=wit, route='ksn')
-        witer.msgs.append(bytearray(msg))
+        now = time.monotonic()
+        for catchup in list(self.running.values()):
+            self.check(catchup, now)
 
-        while not witer.idle:
-            yield self.tock
+        while self.waiting and len(self.running) < self.limit:
+            catchup = self.waiting.pop(next(iter(self.waiting)))  # oldest first
+            self.start(catchup, now)
 
-        self.remove([witer])
+        return super(KELStateUpdater, self).recur(tyme, deeds)
 
-        start = time.perf_counter()
-        while True:
-            if (saider := hab.db.knas.get(keys)) is not None:
-                break
+    def enqueue(self, req):
+        """Queues a catch-up for an AidKelUpdate, a newer request for the same AID replaces a queued one"""
+        if req.aid in self.running:
+            logger.info(f'KEL update for {req.aid} already running')
+            return
 
-            end = time.perf_counter()
-            if end - start > 10:
-                logger.error('No response received from witness, exiting.')
-                return
+        fallbacks = [  # other witnesses that reported the same event
+            upd.wit_pre
+            for upd in self.app.agent.aid_updates.forAid(req.aid)
+            if upd.said == req.said and upd.wit_pre != req.wit_pre
+        ]
+        wits = [req.wit_pre] + (self.tracker.alive(fallbacks) if self.tracker is not None else fallbacks)
+        self.waiting[req.aid] = CatchUp(aid=req.aid, sn=req.sn, said=req.said, wits=wits)
+
+    def start(self, catchup, now):
+        logger.info(f'Processing KEL State update {catchup.aid}')
+        catchup.started = now
+        self.running[catchup.aid] = catchup
+        self.request(catchup, now)
+
+    def request(self, catchup, now):
+        """Requests the events after the local sequence number from the current witness"""
+        hab = self.hby.habByPre(catchup.aid)
+        if hab is None:
+            self.finish(catchup, ValueError(f'{catchup.aid} is no longer a local AID'))
+            return
 
-            yield self.tock
+        logger.debug(f'Requesting events {hab.kever.sn + 1} to {catchup.sn} of {catchup.aid} from {catchup.wit}')
+        catchup.deadline = now + self.timeout
+        self.witq.query(
+            src=hab.pre, pre=hab.pre, r='logs', fn=f'{hab.kever.sn + 1:x}', sn=f'{catchup.sn:x}', wits=[catchup.wit]
+        )
 
-        logger.debug('KEL state update received from witness')
+    def check(self, catchup, now):
+        hab = self.hby.habByPre(catchup.aid)
+        if hab is None:
+            self.finish(catchup, ValueError(f'{catchup.aid} is no longer a local AID'))
+            return
 
-        witstate = hab.db.ksns.get((saider.qb64,))
-        if int(witstate.s, 16) != sn and witstate.d != said:
-            logger.error(f'Witness state ({witstate.s}, {witstate.d}) does not match requested state.')
+        kever = hab.kever
+        if kever.sn > catchup.sn or (kever.sn == catchup.sn and kever.serder.said == catchup.said):
+            self.finish(catchup)
             return
 
-        logger.debug('Witness at requested state, updating now...')
-        self.witq.query(src=pre, pre=pre, r='logs')
-
-        while True:
-            yield self.tock
-            kever = hab.kever
-            if kever.serder.said == said:
-                break
-
-        # When the count of updates goes to zero then refresh the identifier page
-        logger.info('Finished updating KEL state')
-        for upd in self.app.agent.aid_updates:
-            if upd.aid == req.aid:
-                self.app.agent.aid_updates.remove(upd)
-                # self.app.page.run_task(self.update_identifier_page()) # TODO consider running this from here instead of for event
-                self.app.agent_events.push(dict(event_type=AgentEventTypes.KEL_UPDATE_COMPLETE.value, aid=req.aid))
-                break
-        return
+        if now <= catchup.deadline:
+            return
 
-    def recur(self, tyme, deeds=None):
-        if self.update_reqs:
-            self.extend([doing.doify(self.updateDo)])
+        if self.tracker is not None:
+            self.tracker.failure(catchup.wit, f'KEL events of {catchup.aid} not delivered before the deadline')
+        if catchup.attempt + 1 < len(catchup.wits):
+            logger.info(f'Witness {catchup.wit} stalled updating {catchup.aid}, trying the next witness')
+            catchup.attempt += 1
+            self.stats['retries'] += 1
+            self.request(catchup, now)
+        else:
+            self.finish(catchup, OperationTimeoutError(f'No witness delivered the events of {catchup.aid}'))
+
+    def finish(self, catchup, ex=None):
+        del self.running[catchup.aid]
+        duration = time.monotonic() - catchup.started
+        if ex is not None:
+            logger.error(f'KEL State update for {catchup.aid} failed after {duration:.1f}s: {ex}')
+            self.stats['failed'] += 1
+            if self.operations is not None:
+                self.operations.fail(('kel_update', catchup.aid), ex)
+            return
 
-        return super(KELStateUpdater, self).recur(tyme, deeds)
+        logger.info(f'Finished updating KEL state of {catchup.aid} in {duration:.1f}s')
+        self.stats['completed'] += 1
+        self.durations = (self.durations + [duration])[-100:]
+        self.app.agent.aid_updates.discard(catchup.aid)
+        if self.operations is not None:
+            self.operations.complete(('kel_update', catchup.aid), duration)
@@ -0,0 +1,185 @@
+"""
+Tracking module for the Wallet application
+
+Persistent per-witness health statistics, a round trip time histogram, success and failure counts
+and the last error, updated from witness receipts, KSN queries and OOBI resolutions. Used to try
+fast, healthy witnesses first and to skip witnesses known to be down.
+"""
+
+import logging
+import random
+import threading
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from hio.base import doing
+from keri.help import helping
+
+from wallet.core import koming
+
+logger = logging.getLogger('wallet')
+
+RTT_BOUNDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # upper bounds in seconds of the RTT histogram buckets
+
+
+@dataclass
+class WitnessStatsRecord:
+    """
+    Health statistics of one witness, keyed by witness prefix in the wstats. sub database.
+
+    Attributes:
+        hist (list): round trip time counts, one per RTT_BOUNDS bucket and a last one for longer times
+        successes (int): number of successful interactions
+        failures (int): number of failed interactions
+        streak (int): number of consecutive failed interactions
+        last_error (str): error of the most recent failed interaction
+        last_success (str): ISO-8601 datetime of the most recent successful interaction
+        last_failure (str): ISO-8601 datetime of the most recent failed interaction
+    """
+
+    hist: list = field(default_factory=lambda: [0] * (len(RTT_BOUNDS) + 1))
+    successes: int = 0
+    failures: int = 0
+    streak: int = 0
+    last_error: str = ''
+    last_success: str = ''
+    last_failure: str = ''
+
+    @property
+    def rate(self):
+        """Success rate, None before the first interaction"""
+        total = self.successes + self.failures
+        return self.successes / total if total else None
+
+    def percentile(self, pct):
+        """Returns the upper bound in seconds of the histogram bucket holding the pct percentile RTT, None if empty"""
+        total = sum(self.hist)
+        if total == 0:
+            return None
+        rank = pct / 100 * total
+        seen = 0
+        for bound, count in zip(RTT_BOUNDS + (float('inf'),), self.hist):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+def witness_of(oobi):
+    """Returns the witness prefix of a witness OOBI URL such as http://host/oobi/{aid}/witness/{wit}, or None"""
+    parts = urlparse(oobi).path.strip('/').split('/')
+    if len(parts) >= 4 and parts[0] == 'oobi' and parts[2] == 'witness':
+        return parts[3]
+    return None
+
+
+class WitnessTracker(doing.Doer):
+    """
+    Records the outcome of interactions with witnesses and ranks witnesses by health.
+
+    A witness whose last dead_after interactions failed is considered down for retry_after seconds
+    after its last failure, then gets one more chance. Records are kept in memory, usable from the
+    agent and UI threads, and the changed ones are written to the database in one transaction every
+    tock seconds while running as a Doer, and on exit.
+    """
+
+    def __init__(self, db, dead_after=5, retry_after=300.0, tock=5.0, **kwa):
+        """
+        Parameters:
+            db (LMDBer): database to keep the wstats. sub database in, usually the Habery database
+            dead_after (int): consecutive failures after which a witness is considered down
+            retry_after (float): seconds after its last failure a down witness is tried again
+            tock (float): seconds between writes of the changed records
+        """
+        self.stats = koming.Komer(db=db, subkey='wstats.', schema=WitnessStatsRecord)
+        self.dead_after = dead_after
+        self.retry_after = retry_after
+        self.records = dict()  # witness prefix to WitnessStatsRecord read through from .stats
+        self.dirty = set()  # witness prefixes of the records changed since the last flush
+        self.lock = threading.RLock()
+        super(WitnessTracker, self).__init__(tock=tock, **kwa)
+
+    def recur(self, tyme):
+        self.flush()
+        return False
+
+    def exit(self):
+        self.flush()
+
+    def flush(self):
+        """Writes the records changed since the last flush in one transaction, returns the number written"""
+        with self.lock:
+            items = [((wit,), self.records[wit]) for wit in self.dirty]
+            self.dirty.clear()
+            self.stats.pin_many(items)  # under the lock so a record is not written while it changes
+        return len(items)
+
+    def get(self, wit):
+        """Returns the WitnessStatsRecord of wit, an empty one when never seen"""
+        with self.lock:
+            if (record := self.records.get(wit)) is None:
+                record = self.stats.get(keys=(wit,)) or WitnessStatsRecord()
+                self.records[wit] = record
+            return record
+
+    def success(self, wit, rtt):
+        """Records a successful interaction with wit that took rtt seconds"""
+        with self.lock:
+            record = self.get(wit)
+            bucket = next((idx for idx, bound in enumerate(RTT_BOUNDS) if rtt <= bound), len(RTT_BOUNDS))
+            record.hist[bucket] += 1
+            record.successes += 1
+            record.streak = 0
+            record.last_success = helping.nowIso8601()
+            self.dirty.add(wit)
+
+    def failure(self, wit, error):
+        """Records a failed interaction with wit"""
+        with self.lock:
+            record = self.get(wit)
+            record.failures += 1
+            record.streak += 1
+            record.last_error = str(error)
+            record.last_failure = helping.nowIso8601()
+            if record.streak == self.dead_after:
+                logger.info(f'Witness {wit} failed {record.streak} times in a row, skipping it for {self.retry_after}s')
+            self.dirty.add(wit)
+
+    def dead(self, wit, now=None):
+        """True when wit failed dead_after times in a row and was last tried less than retry_after seconds ago"""
+        with self.lock:
+            record = self.get(wit)
+            if record.streak < self.dead_after:
+                return False
+            now = now if now is not None else helping.nowUTC()
+            return (now - helping.fromIso8601(record.last_failure)).total_seconds() < self.retry_after
+
+    def rank(self, wits):
+        """
+        Returns wits ordered from most to least preferred, witnesses that are down last. Healthy
+        witnesses are ordered by median RTT weighed by success rate, unknown ones rank as average
+        and ties are broken randomly to spread load.
+        """
+        now = helping.nowUTC()
+
+        def score(wit):
+            record = self.get(wit)
+            rate = record.rate if record.rate is not None else 0.9
+            median = record.percentile(50)
+            median = median if median is not None else 1.0
+            return self.dead(wit, now), median / max(rate, 0.01), random.random()
+
+        with self.lock:
+            return sorted(wits, key=score)
+
+    def alive(self, wits):
+        """Returns the witnesses of wits that are not down, ranked, or all of them ranked if all are down"""
+        ranked = self.rank(wits)
+        alive = [wit for wit in ranked if not self.dead(wit)]
+        return alive if alive else ranked
+
+    def choose(self, oobis):
+        """Returns the witness OOBI of the most preferred witness, a random one when none is a witness OOBI"""
+        by_wit = {witness_of(oobi): oobi for oobi in oobis}
+        ranked = self.rank([wit for wit in by_wit if wit is not None])
+        return by_wit[ranked[0]] if ranked else random.choice(oobis)
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 import flet as ft
@@ -127,12 +126,7 @@ class NoticeMultisigGroupInception(NotificationsBase):
         Returns:
             None
         """
-        self.app.agent.cloner.clone(self.said)
-
-        while self.said not in self.app.agent.cloner.cloned:
-            await asyncio.sleep(1)
-
-        cloned = self.app.agent.cloner.cloned[self.said]
+        cloned = await self.app.agent.cloner.clone(self.said)
 
         self.ked = cloned.ked
         self.embeds = self.ked['e']
@@ -252,7 +246,8 @@ class NoticeMultisigGroupInception(NotificationsBase):
         inits['wits'] = oicp.ked['b']
         inits['delpre'] = oicp.ked['di'] if 'di' in self.ked else None
 
-        ghab = self.app.hby.makeGroupHab(
+        ghab = await self.app.agent.bridge.run(
+            self.app.hby.makeGroupHab,
             group=self.group_alias.value,
             mhab=self.mhab,
             smids=self.signing_members,
@@ -260,8 +255,8 @@ class NoticeMultisigGroupInception(NotificationsBase):
             **inits,
         )
 
-        self.app.agent.groups.append(dict(serder=oicp))
         self.app.agent.joining[ghab.pre] = rid
+        self.app.agent.bridge.push(self.app.agent.groups, dict(serder=oicp))
 
     async def dismiss(self, _):
         """
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import pprint
 from datetime import datetime
@@ -237,10 +236,7 @@ class NoticeMultisigGroupRotation(NotificationsBase):
 
     async def get_exchange_message(self):
         """Retrieves a message by SAID from the agent's cloner"""
-        self.cloner.clone(self.said)
-        while self.said not in self.cloner.cloned:
-            await asyncio.sleep(0.25)
-        return self.cloner.cloned[self.said]
+        return await self.cloner.clone(self.said)
 
     def get_local_group_hab(self, smids):
         """Based on signing members find the local group hab"""
@@ -358,11 +354,13 @@ class NoticeMultisigGroupRotation(NotificationsBase):
         if pre in self.app.hby.habs:
             ghab = self.app.hby.habs[pre]
         else:
-            ghab = self.app.hby.joinGroupHab(pre, group=group, mhab=mhab, smids=smids, rmids=rmids)
+            ghab = await self.app.agent.bridge.run(
+                self.app.hby.joinGroupHab, pre, group=group, mhab=mhab, smids=smids, rmids=rmids
+            )
 
         await self.show_progress_ring()
         try:
-            ghab.rotate(serder=orot, smids=smids, rmids=rmids)
+            await self.app.agent.bridge.run(ghab.rotate, serder=orot, smids=smids, rmids=rmids)
         except ValueError as e:
             logger.error(f'ValueError rotating group {group}: {e}')
             await self.hide_progress_ring()
@@ -380,7 +378,8 @@ class NoticeMultisigGroupRotation(NotificationsBase):
         others.remove(ghab.mhab.pre)
 
         for recpt in others:  # this goes to other participants only as a signaling mechanism
-            self.app.agent.postman.send(
+            self.app.agent.bridge.call(
+                self.app.agent.postman.send,
                 src=ghab.mhab.pre,
                 dest=recpt,
                 topic='multisig',
@@ -388,10 +387,11 @@ class NoticeMultisigGroupRotation(NotificationsBase):
                 attachment=ims,
             )
 
-            while not self.app.agent.postman.sent(said=exn.said):
-                await asyncio.sleep(0.25)
+            await self.app.agent.operations.watch(
+                lambda: self.app.agent.postman.sent(said=exn.said), name=f'multisig rotation exn to {recpt}'
+            )
 
-            self.app.agent.postman.cues.clear()
+            self.app.agent.bridge.call(self.app.agent.postman.cues.clear)
 
         serder = serdering.SerderKERI(raw=rot)
         prefixer = coring.Prefixer(qb64=ghab.pre)
@@ -400,12 +400,13 @@ class NoticeMultisigGroupRotation(NotificationsBase):
         # TODO This should be blocking for the participating AID. You shouldn't be able to join
         #   another multisig operation with the same local AID until the prior one completes or is
         #   cancelled.
-        self.app.agent.counselor.start(ghab, prefixer, seqner, coring.Saider(qb64=serder.said))
-        while True:
-            saider = self.app.hby.db.cgms.get(keys=(prefixer.qb64, seqner.qb64))
-            if saider is not None:
-                break
-            await asyncio.sleep(0.25)
+        saider = coring.Saider(qb64=serder.said)
+        counselor = self.app.agent.counselor
+        joined = await self.app.agent.bridge.run(
+            counselor.expect, prefixer, seqner, saider, f'multisig rotation join {ghab.pre} {serder.sn}'
+        )
+        self.app.agent.bridge.call(counselor.start, ghab, prefixer, seqner, saider)
+        await joined
         await self.hide_progress_ring()
 
         logger.info(f'Group {group} rotation {serder.sn} joined')
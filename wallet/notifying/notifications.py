@@ -48,8 +48,7 @@ class Notifications(NotificationsBase):
             None
         """
         note = e.control.data
-        self.app.agent.notifier.mar(note.rid)
-        self.app.agent.noter.update()
+        await self.app.agent.bridge.run(self.app.agent.noter.mar, note.rid)
 
         self.app.page.route = f'/notifications/{note.rid}'
         self.app.page.update()
@@ -64,7 +63,8 @@ class Notifications(NotificationsBase):
         Returns:
             None
         """
-        self.app.agent.notifier.rem(rid=e.control.data.rid)
+        await self.app.agent.bridge.run(self.app.agent.noter.rem, e.control.data.rid)
+        self.did_mount()
         self.app.page.update()
 
     async def dismiss(self, _):
@@ -84,7 +84,7 @@ class Notifications(NotificationsBase):
         """
         Builds the notifications and returns the user interface elements.
 
-        This method retrieves the notifications from the notifier agent and creates
+        This method takes the notifications from the feed kept by the agent Noter and creates
         user interface elements (tiles) for each notification. The tiles are then
         appended to a list control. Finally, a column layout is created with a row
         containing an icon and a title, and another row containing a card.
@@ -93,7 +93,7 @@ class Notifications(NotificationsBase):
             A `Column` object representing the user interface elements for the notifications.
         """
         self.list.controls.clear()
-        self.notes = self.app.agent.notifier.getNotes(start=0, end=self.app.agent.notifier.getNoteCnt())
+        self.notes = self.app.notes  # newest first
 
         if len(self.notes) == 0:
             self.controls = [
@@ -105,8 +105,6 @@ class Notifications(NotificationsBase):
                 )
             ]
 
-        self.notes.sort(key=lambda note: datetime.fromisoformat(note.datetime), reverse=True)
-
         for note in self.notes:
             attrs = note.attrs
             route = attrs['r']
@@ -0,0 +1,44 @@
+import logging
+
+from hio.base import doing
+
+logger = logging.getLogger('wallet')
+
+
+class Compactor(doing.Doer):
+    """
+    Rewrites the records of an older schema version of versioned Komers in the background,
+    one Komer.compact chunk per run, Komer after Komer. Old records are readable all along
+    through the upgraders of their Komer, so this only saves upgrading them on every read.
+    Records failing to upgrade are skipped by Komer.compact, so they do not stop the rest of
+    their Komer from being compacted. Done once every record was read.
+    """
+
+    def __init__(self, komers, chunk=200, tock=1.0, **kwa):
+        """
+        Parameters:
+            komers (Iterable): Komers to compact, those without a schema version are skipped
+            chunk (int): maximum number of records read per run
+            tock (float): seconds between runs
+        """
+        self.komers = [komer for komer in komers if komer.version]
+        self.chunk = chunk
+        self.after = None  # keys to continue the compaction of the first Komer after
+        self.counts = {komer: 0 for komer in self.komers}  # records rewritten per Komer
+        super(Compactor, self).__init__(tock=tock, **kwa)
+
+    def recur(self, tyme):
+        if not self.komers:
+            return True
+
+        komer = self.komers[0]
+        try:
+            count, self.after = komer.compact(after=self.after, limit=self.chunk)
+        except Exception as ex:
+            logger.exception(f'Compaction of {komer.schema.__name__} records failed: {ex}')
+            count, self.after = 0, None
+        self.counts[komer] += count
+        if self.after is None:
+            self.komers.pop(0)
+            logger.info(f'Compacted {self.counts[komer]} {komer.schema.__name__} records to version {komer.version}')
+        return not self.komers
@@ -1,37 +1,360 @@
+import asyncio
+import importlib
+import time
+from functools import partial
+
+import keri
+import semver
+from hio.base import doing
 from keri import kering
-from keri.db import basing
+from keri.core import coring, serdering
+from keri.db import basing, dbing, subing
+from keri.db.basing import MIGRATIONS, KeyStateRecord, StateEERecord
+from keri.help import helping
+from keri.vdr import viring
 
 from wallet import walleting
+from wallet.core import koming
 from wallet.core.agenting import logger
+from wallet.core.baser import CHECKPOINT, MigrationCheckpointRecord, PartialBaser, checkpoints, completed, stamp
+
+CHUNKED = 'add_key_and_reg_state_schemas'  # the keri migration run in chunks, the others are small enough to run at once
+
+
+class Migrator(doing.Doer):
+    """
+    Runs the keri migrations a keystore Baser needs a chunk at a time, one chunk of at most chunk
+    records per run, reporting progress after every chunk.
+
+    The progress is checkpointed to a MigrationCheckpointRecord before the first step and after
+    every chunk so a migration interrupted by closing the wallet resumes after the last chunk.
+    Every chunk may be run again, so a chunk written but not yet checkpointed is simply migrated
+    twice. Without the first checkpoint a keystore interrupted during its first chunk would look
+    migrated to the check of the next run, its first key state being converted already.
+
+    Keri migrations other than add_key_and_reg_state_schemas only rewrite the habs so run in one
+    step with the migration module of keri. That one converts every key state and indexes the
+    keys of every first seen event, so it is run here in steps of chunks instead.
+    """
+
+    def __init__(self, db, chunk=500, **kwa):
+        """
+        Parameters:
+            db (Baser): keystore database to migrate, opened even though it is not current
+            chunk (int): maximum number of records migrated per run
+        """
+        self.db = db
+        self.chunk = chunk
+        self.checkpoints = checkpoints(db)
+        self.checkpoint = None
+        self.states = koming.Komer(db=db, subkey='stts.', schema=dict)
+        self.nstates = koming.Komer(db=db, subkey='stts.', schema=KeyStateRecord)
+        self.steps = []  # (version, migration, step, fn) of the steps left to run, migration empty for version steps
+        self.total = 0
+        self.resumed = False
+        self.error = None
+        self.started = None
+        self.start_done = 0
+        self.subscribers = []
+        super(Migrator, self).__init__(**kwa)
+
+    @property
+    def finished(self):
+        return not self.steps or self.error is not None
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started if self.started is not None else 0.0
+
+    def enter(self):
+        self.started = time.monotonic()
+        self.checkpoint = self.checkpoints.get(keys=CHECKPOINT)
+        self.resumed = self.checkpoint is not None
+        if self.checkpoint is None:
+            self.checkpoint = MigrationCheckpointRecord(started=helping.nowIso8601())
+        self.start_done = self.checkpoint.done
+        self.steps = self.plan()
+        if not self.resumed:
+            self.checkpoint.total = sum(self.count(step) for _, _, step, _ in self.steps)
+        self.total = max(self.checkpoint.total, self.checkpoint.done)
+        if self.resumed:
+            logger.info(f'Resuming migration of {self.db.name} at {self.checkpoint.migration} {self.checkpoint.step}')
+        elif self.steps:  # pinned before the first step writes anything, see the class docstring
+            _, self.checkpoint.migration, self.checkpoint.step, _ = self.steps[0]
+            self.checkpoints.pin(keys=CHECKPOINT, val=self.checkpoint)
+
+    def plan(self):
+        """
+        Returns the steps of the keri migrations to run, those Baser.migrate would run less the
+        steps the checkpoint records as done.
+        """
+        ver = semver.Version.parse(keri.__version__)
+        library = semver.Version(ver.major, ver.minor, ver.patch)
+        steps = []
+        for version, migrations in MIGRATIONS:
+            if self.db.version is not None and (
+                semver.Version.parse(version).compare(library) > 0
+                or semver.Version.parse(version).compare(self.db.version) != 1
+            ):
+                continue
+            for migration in migrations:
+                if self.db.migs.get(keys=(migration,)) is not None:
+                    continue
+                if migration != CHUNKED:
+                    steps.append((version, migration, 'migrate', partial(self.run_module, migration)))
+                elif self.checkpoint.migration == CHUNKED or self.module(CHUNKED)._check_if_needed(self.db):
+                    steps.extend(
+                        (version, migration, step, fn)
+                        for step, fn in (
+                            ('states', self.convert_states),
+                            ('registries', self.convert_registries),
+                            ('keys', self.index_keys),
+                            ('escrows', self.clear_escrows),
+                        )
+                    )
+                else:
+                    steps.append((version, migration, 'skip', lambda after: (None, 0)))
+            steps.append((version, '', 'version', partial(self.set_version, version)))
+
+        if self.checkpoint.migration:  # skip the steps done before the interruption
+            names = [(migration, step) for _, migration, step, _ in steps]
+            if (self.checkpoint.migration, self.checkpoint.step) in names:
+                steps = steps[names.index((self.checkpoint.migration, self.checkpoint.step)) :]
+        return steps
+
+    def count(self, step):
+        """Returns the number of records step migrates"""
+        if step == 'states':
+            return koming.entries(self.states)
+        if step == 'keys':
+            with self.db.env.begin(write=False) as txn:
+                return txn.stat(self.db.fels)['entries']
+        return 1 if step in ('migrate', 'registries', 'escrows') else 0
+
+    def recur(self, tyme):
+        if self.finished:
+            return True
+
+        version, migration, step, fn = self.steps[0]
+        after = self.checkpoint.after if (migration, step) == (self.checkpoint.migration, self.checkpoint.step) else ''
+        try:
+            after, count = fn(after)
+            if after is None:
+                self.steps.pop(0)
+                if migration and (not self.steps or self.steps[0][1] != migration):
+                    self.db.migs.pin(keys=(migration,), val=coring.Dater())
+                    logger.info(f'Finished migration {migration} of {self.db.name}')
+            _, migration, step, _ = self.steps[0] if self.steps else (None, '', '', None)
+            self.checkpoint.migration, self.checkpoint.step = migration, step
+            self.checkpoint.after = after or ''
+            self.checkpoint.done += count
+
+            if self.steps:
+                self.checkpoints.pin(keys=CHECKPOINT, val=self.checkpoint)
+            else:
+                self.db.version = keri.__version__
+                stamp(self.db, migrations=completed(self.db))
+                self.checkpoints.rem(keys=CHECKPOINT)
+        except Exception as ex:
+            logger.exception(f'Migration {migration} of {self.db.name} failed at {step}')
+            self.error = f'{migration} {step}: {ex}'
+
+        self.notify()
+        return self.finished
+
+    def module(self, migration):
+        return importlib.import_module(f'keri.db.migrations.{migration}')
+
+    def run_module(self, migration, after):
+        """Runs the keri migration module of migration at once"""
+        self.module(migration).migrate(self.db)
+        return None, 1
+
+    def set_version(self, version, after):
+        """Sets the database version once the migrations of version are done, as Baser.migrate does"""
+        self.db.version = version
+        return None, 0
 
+    def convert_states(self, after):
+        """Converts a chunk of key states from dicts to KeyStateRecords in one write transaction"""
+        items = []
+        for keys, sad in self.states.getItemIter(after=after or None, limit=self.chunk):
+            ksr = KeyStateRecord(
+                vn=kering.Version,
+                i=sad['i'],
+                s=sad['s'],
+                p=sad['p'],
+                d=sad['d'],
+                f=sad['f'],
+                dt=sad['dt'],
+                et=sad['et'],
+                kt=sad['kt'],
+                k=sad['k'],
+                nt=sad['nt'],
+                n=sad['n'],
+                bt=sad['bt'],
+                b=sad['b'],
+                c=sad['c'],
+                ee=StateEERecord._fromdict(sad['ee']),
+                di=sad['di'] if sad['di'] else None,
+            )
+            items.append((keys, ksr))
+        self.nstates.pin_many(items, chunk=self.chunk)
+        return self.next_after(items, lambda keys: self.states.sep.join(keys)), len(items)
 
-async def migrate_keystore(name, base, bran):
-    """Migrates a keystore from pre v1.1.19 to v1.1.19."""
-    migrate(name, base, False)
+    def convert_registries(self, after):
+        """Converts the registry states and resets the credential registry anchors, few enough to do at once"""
+        rgy = viring.Reger(
+            name=self.db.name, base=self.db.base, db=self.db, temp=self.db.temp, headDirPath=self.db.headDirPath, reopen=True
+        )
+        try:
+            for _, sad in koming.Komer(db=rgy, subkey='stts.', schema=dict).getItemIter():
+                rsr = viring.RegStateRecord(
+                    vn=list(kering.Version),
+                    i=sad['i'],
+                    s=sad['s'],
+                    d=sad['d'],
+                    ii=sad['ii'],
+                    dt=sad['dt'],
+                    et=sad['et'],
+                    bt=sad['bt'],
+                    b=sad['b'],
+                    c=sad['c'],
+                )
+                rgy.states.pin(sad['i'], val=rsr)
 
+            for (said,), _ in rgy.saved.getItemIter():
+                dig = rgy.getTel(key=dbing.snKey(said, 0))
+                vals = [coring.Prefixer(qb64=said), coring.Seqner(sn=0), coring.Saider(qb64b=bytes(dig))]
+                rgy.cancs.pin(keys=said, val=vals)
+        finally:
+            rgy.close()
+        return None, 1
 
-def migrate(name, base, temp):
+    def index_keys(self, after):
+        """Indexes the signing keys and next key digests of a chunk of first seen events"""
+        pubs = subing.CatCesrIoSetSuber(db=self.db, subkey='pubs.', klas=(coring.Prefixer, coring.Seqner))
+        digs = subing.CatCesrIoSetSuber(db=self.db, subkey='digs.', klas=(coring.Prefixer, coring.Seqner))
+
+        items = []
+        with self.db.env.begin(db=self.db.fels, write=False) as txn:
+            cursor = txn.cursor()
+            found = cursor.set_range(after.encode('utf-8')) if after else cursor.first()
+            while found and len(items) < self.chunk:
+                key, dig = bytes(cursor.key()), bytes(cursor.value())
+                if key.decode('utf-8') != after:
+                    items.append((key, dig))
+                found = cursor.next()
+
+        for key, dig in items:
+            pre, _ = dbing.splitKey(key)
+            if not (raw := self.db.getEvt(key=dbing.dgKey(pre, dig))):
+                logger.info(f'Migrate keys: missing event for dig={dig}, skipped.')
+                continue
+            serder = serdering.SerderKERI(raw=bytes(raw))
+            val = (coring.Prefixer(qb64b=serder.preb), coring.Seqner(sn=serder.sn))
+            for verfer in serder.verfers or []:
+                pubs.add(keys=(verfer.qb64,), val=val)
+            for diger in serder.ndigers or []:
+                digs.add(keys=(diger.qb64,), val=val)
+        return self.next_after(items, lambda key: key.decode('utf-8')), len(items)
+
+    def clear_escrows(self, after):
+        for escrow in (self.db.gpwe, self.db.gdee, self.db.dpwe, self.db.gpse, self.db.epse, self.db.dune, self.db.qnfs):
+            escrow.trim()
+        return None, 1
+
+    def next_after(self, items, tokey):
+        """Returns the key to resume a step after, None when the chunk of items was its last"""
+        return tokey(items[-1][0]) if len(items) == self.chunk else None
+
+    def progress(self):
+        """Returns the records done of the total, per second, the estimated seconds left and any error"""
+        done = self.checkpoint.done if self.checkpoint is not None else 0
+        rate = (done - self.start_done) / self.elapsed if self.elapsed else 0.0
+        migration, step = (self.steps[0][1], self.steps[0][2]) if self.steps else ('', '')
+        return dict(
+            migration=migration,
+            step=step,
+            done=done,
+            total=self.total,
+            elapsed=self.elapsed,
+            rate=rate,
+            eta=(self.total - done) / rate if rate else None,
+            resumed=self.resumed,
+            finished=self.finished,
+            error=self.error,
+        )
+
+    def subscribe(self, fn):
+        """Calls fn(progress) after every chunk migrated"""
+        self.subscribers.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self.subscribers:
+            self.subscribers.remove(fn)
+
+    def notify(self):
+        progress = self.progress()
+        for fn in list(self.subscribers):
+            try:
+                fn(progress)
+            except Exception:
+                logger.exception('Migration subscriber failed')
+
+
+def open_baser(name, base, temp):
+    """Opens the Baser of a keystore that may need to be migrated"""
     hab_db = basing.Baser(name=name, base=base, temp=temp, reopen=False)
     try:
         hab_db.reopen()
-    except kering.DatabaseError:
+    except kering.DatabaseError:  # reload refuses a database needing migration, its sub databases are open
         pass
+    return hab_db
+
 
+async def migrate_keystore(name, base, bran, chunk=500, subscriber=None):
+    """
+    Migrates a keystore from pre v1.1.19 to v1.1.19 a chunk at a time on a worker thread, keeping
+    the event loop free for the UI, resuming an interrupted migration. Returns the final progress
+    of the Migrator.
+
+    subscriber is called on the worker thread, so UI updates must be marshalled back to the event
+    loop, such as with page.run_task.
+    """
     logger.info(f'Migrating {name}...')
-    hab_db.migrate()
+    progress = await asyncio.to_thread(migrate, name, base, False, chunk, subscriber)
+    if progress['error'] is not None:
+        raise kering.DatabaseError(f'Migration of {name} failed at {progress["error"]}')
     logger.info(f'Finished migrating {name}')
-    hab_db.close()
+    return progress
+
+
+def migrate(name, base, temp, chunk=500, subscriber=None):
+    """Migrates a keystore to completion on the calling thread, such as from a script or a worker thread"""
+    hab_db = open_baser(name, base, temp)
+    try:
+        migrator = Migrator(db=hab_db, chunk=chunk)
+        if subscriber is not None:
+            migrator.subscribe(subscriber)
+        doist = doing.Doist(doers=[migrator], tock=0.0)
+        doist.do()
+    finally:
+        hab_db.close()
+    return migrator.progress()
 
 
 async def check_migration(name, base, bran):
     """
     Check if the keystore needs to be migrated from roughly v1.0.0 to v1.1.14.
+
+    Reads the schema stamp of the keystore instead of reopening a full Baser, falling back to
+    probing an unstamped keystore, see PartialBaser.needs_migration.
     """
-    hab_db = basing.Baser(name=name, base=base, temp=False, reopen=False)
+    db = PartialBaser(name=name, base=base, temp=False, reopen=True)
     try:
-        hab_db.reopen()
+        if db.needs_migration():
+            raise walleting.OldKeystoreError(f'Migration needed for {name}')
         logger.info('Migration not needed for %s', name)
-    except kering.DatabaseError as ex:
-        raise walleting.OldKeystoreError(f'Migration needed for {name}') from ex
     finally:
-        hab_db.close()
+        db.close()
@@ -3,6 +3,8 @@ import logging
 from hio.base import doing
 from keri.app import oobiing
 
+from wallet.core import koming
+
 logger = logging.getLogger('wallet')
 
 
@@ -16,7 +18,7 @@ class OOBILoader(doing.DoDoer):
         super(OOBILoader, self).__init__(doers=doers)
 
     def recur(self, tyme, deeds=None):
-        if self.oc > self.hby.db.roobi.cntAll():
+        if self.oc > koming.entries(self.hby.db.roobi):
             return super(OOBILoader, self).recur(tyme, deeds)
 
         for (oobi,), obr in self.hby.db.roobi.getItemIter():
@@ -33,6 +35,8 @@ class OOBIAuther(doing.DoDoer):
     def __init__(self, hby):
         self.hby = hby
         self.wc = [oobi for (oobi,), _ in self.hby.db.woobi.getItemIter()]
+        self.wkc = None  # number of wkas entries when cap was last read
+        self.cap = set()  # URLs of the authenticated well-knowns
 
         if len(self.wc) == 0:
             doers = []
@@ -44,11 +48,11 @@ class OOBIAuther(doing.DoDoer):
         super(OOBIAuther, self).__init__(doers=doers)
 
     def recur(self, tyme, deeds=None):
-        cap = []
-        for (_,), wk in self.hby.db.wkas.getItemIter(keys=b''):
-            cap.append(wk.url)
+        if (wkc := koming.entries(self.hby.db.wkas)) != self.wkc:  # only rescan when authentications were added
+            self.wkc = wkc
+            self.cap = {wk.url for (_,), wk in self.hby.db.wkas.getItemIter(keys=b'')}
 
-        if set(self.wc) & set(cap) != set(self.wc):
+        if not self.cap.issuperset(self.wc):
             return False
 
         self.remove(self.doers)
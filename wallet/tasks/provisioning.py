@@ -0,0 +1,340 @@
+"""
+Provisioning module for the Wallet application
+
+Bulk creation of identifiers from a spec file listing the alias, key type, key counts, thresholds
+and witness pool of each identifier. Identifiers are created a batch at a time and their inception
+events are receipted by the Witnesser while the next batches are created. Provisioning is resumable,
+identifiers that already exist are not created again and are only receipted when not yet fully
+receipted.
+"""
+
+import csv
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from hio.base import doing
+from hio.help import decking
+from keri.core import signing
+from keri.db import dbing
+
+from wallet.core.agenting import CaughtUpReceiptor, Witnesser, run_hio_task
+from wallet.core.operating import Operations
+
+logger = logging.getLogger('wallet')
+
+KEY_TYPES = ('salty', 'randy')
+
+
+def _sith(value):
+    """Returns a signing threshold read from a spec as an int, a weighted list or a hex string"""
+    if isinstance(value, (int, list)):
+        return value
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    if value.startswith('['):
+        return json.loads(value)
+    return value
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y')
+
+
+@dataclass
+class ProvisionSpec:
+    """
+    Specification of one identifier to provision.
+
+    Attributes:
+        alias (str): local alias of the identifier
+        algo (str): key type, salty for a key chain or randy for random keys
+        salt (str): 21 character salt of a key chain, the Habery salt when empty
+        icount (int): number of signing keys
+        isith (int | str | list): signing threshold
+        ncount (int): number of rotation keys
+        nsith (int | str | list): rotation threshold
+        wits (list): witness prefixes, the witnesses of pool when a pool is given
+        toad (int): witness threshold, keri's recommended threshold for the witnesses when None
+        estOnly (bool): establishment events only
+        DnD (bool): do not delegate
+    """
+
+    alias: str
+    algo: str = 'salty'
+    salt: str = ''
+    icount: int = 1
+    isith: int | str | list = 1
+    ncount: int = 1
+    nsith: int | str | list = 1
+    wits: list = field(default_factory=list)
+    toad: int | None = None
+    estOnly: bool = False
+    DnD: bool = False
+
+    @classmethod
+    def fromDict(cls, entry, pools=None):
+        """
+        Returns the ProvisionSpec of a spec file entry, witnesses are read from wits, a list or a
+        space separated string, or from the named witness pool of pools.
+        """
+        alias = str(entry.get('alias') or '').strip()
+        if not alias:
+            raise ValueError('alias is required')
+
+        algo = str(entry.get('algo') or entry.get('key_type') or 'salty').strip()
+        if algo not in KEY_TYPES:
+            raise ValueError(f'invalid key type {algo}, expected one of {", ".join(KEY_TYPES)}')
+
+        salt = str(entry.get('salt') or '').strip()
+        if salt and len(salt) != 21:
+            raise ValueError('salt must be 21 characters long')
+
+        wits = entry.get('wits') or []
+        if isinstance(wits, str):
+            wits = wits.split()
+        if pool := str(entry.get('pool') or '').strip():
+            if pools is None or pool not in pools:
+                raise ValueError(f'unknown witness pool {pool}')
+            wits = list(pools[pool])
+
+        toad = entry.get('toad')
+        return cls(
+            alias=alias,
+            algo=algo,
+            salt=salt,
+            icount=int(entry.get('icount') or 1),
+            isith=_sith(entry.get('isith') or 1),
+            ncount=int(entry.get('ncount') or 1),
+            nsith=_sith(entry.get('nsith') or 1),
+            wits=list(wits),
+            toad=int(toad) if toad not in (None, '') else None,
+            estOnly=_flag(entry.get('estOnly') or False),
+            DnD=_flag(entry.get('DnD') or False),
+        )
+
+    def kwargs(self):
+        """Returns the keyword arguments of Habery.makeHab for the identifier"""
+        kwargs = dict(
+            algo=self.algo,
+            salt=signing.Salter(raw=self.salt.encode('utf-8')).qb64 if self.salt else None,
+            icount=self.icount,
+            isith=self.isith,
+            ncount=self.ncount,
+            nsith=self.nsith,
+            wits=self.wits,
+            estOnly=self.estOnly,
+            DnD=self.DnD,
+        )
+        if self.toad is not None:
+            kwargs['toad'] = self.toad
+        return kwargs
+
+
+def load_specs(path, pools=None):
+    """
+    Reads the ProvisionSpecs of a JSON or CSV spec file.
+
+    A JSON spec file holds a list of entries, or an object with the list under "identifiers". A CSV
+    spec file has a header row naming the fields of the entries, such as alias,algo,icount,isith,pool.
+
+    Parameters:
+        path (str | Path): spec file, read as CSV unless its suffix is .json
+        pools (dict): witness pool name to list of witness prefixes, see WalletApp.wit_pools
+
+    Raises:
+        ValueError: naming the entry of the first invalid or duplicate spec
+    """
+    path = Path(path)
+    with open(path, 'r', newline='') as f:
+        if path.suffix.lower() == '.json':
+            entries = json.load(f)
+            entries = entries.get('identifiers', []) if isinstance(entries, dict) else entries
+        else:
+            entries = list(csv.DictReader(f))
+
+    specs = []
+    aliases = set()
+    for idx, entry in enumerate(entries, start=1):
+        try:
+            spec = ProvisionSpec.fromDict(entry, pools=pools)
+        except (ValueError, TypeError, AttributeError) as ex:
+            raise ValueError(f'{path.name} entry {idx}: {ex}') from ex
+        if spec.alias in aliases:
+            raise ValueError(f'{path.name} entry {idx}: duplicate alias {spec.alias}')
+        aliases.add(spec.alias)
+        specs.append(spec)
+
+    return specs
+
+
+class Provisioner(doing.DoDoer):
+    """
+    Creates identifiers from ProvisionSpecs, up to .batch identifiers per cycle, and pushes their
+    inception events to witners for receipting. At most .window inceptions wait for receipts at
+    once so creation does not outrun the witnesses.
+
+    Subscribers are called with the progress after every cycle that changed it. The provisioner is
+    done once every identifier is created and receipted, or failed.
+    """
+
+    def __init__(self, hby, specs, witners, operations, batch=25, window=32, doers=None):
+        """
+        Parameters:
+            hby (Habery): Habery to create the identifiers in
+            specs (list): ProvisionSpecs of the identifiers
+            witners (Deck): inception events to receipt, consumed by a Witnesser
+            operations (Operations): completes the ('receipts', pre, 0) operation of each inception
+            batch (int): maximum number of identifiers created per cycle
+            window (int): maximum number of inceptions waiting for receipts
+            doers (list): doers run along with the provisioner, such as its own Witnesser when headless
+        """
+        self.hby = hby
+        self.witners = witners
+        self.operations = operations
+        self.batch = batch
+        self.window = window
+        self.pending = deque(specs)
+        self.inflight = dict()  # prefix to (alias, Operation) of inceptions waiting for receipts
+        self.failures = []  # (alias, error) of identifiers that failed to be created or receipted
+        self.counts = dict(total=len(specs), created=0, resumed=0, skipped=0, receipted=0, failed=0)
+        self.started = None
+        self.elapsed = 0.0
+        self.subscribers = []
+
+        super(Provisioner, self).__init__(doers=doers if doers is not None else [])
+
+    @property
+    def finished(self):
+        return not self.pending and not self.inflight
+
+    def enter(self, doers=None):
+        self.started = time.monotonic()
+        return super(Provisioner, self).enter(doers)
+
+    def recur(self, tyme, deeds=None):
+        changed = self.reap()
+        created = 0
+        while self.pending and created < self.batch and len(self.inflight) < self.window:
+            self.provision(self.pending.popleft())
+            created += 1
+
+        self.elapsed = time.monotonic() - self.started
+        if changed or created:
+            self.notify()
+
+        super(Provisioner, self).recur(tyme, deeds)
+        if self.finished:
+            logger.info(
+                f'Provisioned {self.counts["total"]} identifiers in {self.elapsed:.1f}s, {self.counts["failed"]} failed'
+            )
+            return True
+        return False
+
+    def provision(self, spec):
+        """Creates the identifier of spec unless it exists and queues its inception for receipting"""
+        hab = self.hby.habByName(spec.alias)
+        if hab is not None:
+            if not hab.kever.wits or self.receipted(hab):
+                self.counts['skipped'] += 1
+                return
+            self.counts['resumed'] += 1
+        else:
+            try:
+                hab = self.hby.makeHab(name=spec.alias, **spec.kwargs())
+            except Exception as ex:
+                logger.error(f'Creating identifier {spec.alias} failed: {ex}')
+                self.failed(spec.alias, ex)
+                return
+            self.counts['created'] += 1
+
+        if not hab.kever.wits:
+            return
+
+        serder, _, _ = hab.getOwnEvent(sn=0)
+        op = self.operations.expect(('receipts', hab.pre, 0), name=f'receipts of {spec.alias}')
+        self.inflight[hab.pre] = (spec.alias, op)
+        self.witners.append(dict(serder=serder))
+
+    def receipted(self, hab):
+        """True when the inception event of hab has receipts from at least the threshold of its witnesses"""
+        serder = hab.kever.serder if hab.kever.sn == 0 else hab.getOwnEvent(sn=0)[0]
+        wigs = self.hby.db.getWigs(dbing.dgKey(serder.preb, serder.saidb))
+        return len(wigs) >= hab.kever.toader.num
+
+    def reap(self):
+        """Counts the inceptions whose receipting finished, returns True when any did"""
+        changed = False
+        for pre, (alias, op) in list(self.inflight.items()):
+            if not op.done():
+                continue
+            del self.inflight[pre]
+            changed = True
+            if (ex := op.future.exception()) is not None:
+                self.failed(alias, ex)
+            else:
+                self.counts['receipted'] += 1
+        return changed
+
+    def failed(self, alias, error):
+        self.counts['failed'] += 1
+        self.failures.append((alias, str(error)))
+
+    def progress(self):
+        """Returns the counts, identifiers in flight and per second, elapsed seconds and failures so far"""
+        finished = self.counts['total'] - len(self.pending) - len(self.inflight)
+        return dict(
+            self.counts,
+            finished=finished,
+            inflight=len(self.inflight),
+            elapsed=self.elapsed,
+            rate=finished / self.elapsed if self.elapsed else 0.0,
+            failures=list(self.failures),
+        )
+
+    def subscribe(self, fn):
+        """Calls fn(progress) on the agent thread whenever the provisioning progress changes"""
+        self.subscribers.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self.subscribers:
+            self.subscribers.remove(fn)
+
+    def notify(self):
+        progress = self.progress()
+        for fn in list(self.subscribers):
+            try:
+                fn(progress)
+            except Exception:
+                logger.exception('Provisioning subscriber failed')
+
+
+async def provision(hby, specs, batch=25, window=32, limit=8, subscriber=None):
+    """
+    Provisions the identifiers of specs without the wallet UI, receipting them with a Witnesser of
+    its own. Returns the final progress of the Provisioner.
+    """
+    operations = Operations()
+    receiptor = CaughtUpReceiptor(hby=hby)
+    witners = decking.Deck()
+    witnesser = Witnesser(app=None, receiptor=receiptor, witners=witners, operations=operations, limit=limit)
+    provisioner = Provisioner(
+        hby=hby,
+        specs=specs,
+        witners=witners,
+        operations=operations,
+        batch=batch,
+        window=window,
+        doers=[operations, receiptor, witnesser],
+    )
+    if subscriber is not None:
+        provisioner.subscribe(subscriber)
+
+    await run_hio_task([provisioner])
+    return provisioner.progress()